@@ -0,0 +1,232 @@
+import random
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from .player import AdaptiveBot, ConservativeBot, Player, RiskyBot
+from .scoring import CATEGORY_INDEX, ROLLS, SCORE_TABLE, Category
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore
+
+UPPER_BONUS = 50
+UPPER_THRESHOLD = 63
+
+
+class BatchRoller:
+    """
+    Rolls the dice of many games with one random draw.
+
+    With NumPy, dice are a (games, 5) array drawn by a numpy Generator.
+    Without it, dice are a list of five-value lists and every die takes
+    three bits of one random.getrandbits call (values 6 and 7 are redrawn),
+    instead of one random.randint call per die.
+    """
+
+    def __init__(
+        self, seed: Optional[int] = None, use_numpy: Optional[bool] = None
+    ) -> None:
+        """
+        Args:
+            seed: Seed of the generator
+            use_numpy: Use NumPy, by default if it is installed
+
+        Raises:
+            ImportError: If use_numpy is True and NumPy is not installed
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        if use_numpy and numpy is None:
+            raise ImportError("NumPy is not installed!")
+        self.use_numpy = use_numpy
+        if use_numpy:
+            self._generator = numpy.random.default_rng(seed)
+        else:
+            self._random = random.Random(seed)
+
+    def _draw(self, count: int) -> List[int]:
+        values: List[int] = []
+        while len(values) < count:
+            # A group is rejected with probability 1/4, so ask for a third more
+            groups = (count - len(values)) * 4 // 3 + 4
+            bits = self._random.getrandbits(3 * groups)
+            for _ in range(groups):
+                value = bits & 7
+                bits >>= 3
+                if value < 6:
+                    values.append(value + 1)
+        del values[count:]
+        return values
+
+    def roll(self, games: int) -> Any:
+        """
+        Returns:
+            Five fresh dice for every game
+        """
+        if self.use_numpy:
+            return self._generator.integers(1, 7, size=(games, 5), dtype=numpy.int8)
+        values = self._draw(5 * games)
+        return [values[i : i + 5] for i in range(0, len(values), 5)]
+
+    def reroll(self, dice: Any, keep: Any) -> Any:
+        """
+        Rerolls the dice not marked in keep.
+
+        Args:
+            dice: Dice of every game, as returned by roll
+            keep: Same shape as dice, True for the dice to keep
+
+        Returns:
+            New dice (dice itself is left unchanged)
+        """
+        if self.use_numpy:
+            return numpy.where(keep, dice, self.roll(len(dice)))
+        fresh = iter(self._draw(sum(row.count(False) for row in keep)))
+        return [
+            [value if kept else next(fresh) for value, kept in zip(row, keep_row)]
+            for row, keep_row in zip(dice, keep)
+        ]
+
+
+@lru_cache(maxsize=None)
+def _tables() -> Tuple[Any, Any]:
+    """Roll index by base-6 code of the sorted dice, and the score table."""
+    lookup = numpy.zeros(6**5, dtype=numpy.int16)
+    for index, roll in enumerate(ROLLS):
+        code = 0
+        for value in roll:
+            code = code * 6 + value - 1
+        lookup[code] = index
+    return lookup, numpy.array(SCORE_TABLE, dtype=numpy.int16)
+
+
+def batch_scores(dice: Any) -> Any:
+    """
+    Scores of every game's dice in all categories.
+
+    Args:
+        dice: (games, 5) array of dice
+
+    Returns:
+        (games, 15) array, categories in Category order
+
+    Raises:
+        ImportError: If NumPy is not installed
+    """
+    if numpy is None:
+        raise ImportError("NumPy is not installed!")
+    lookup, scores = _tables()
+    ordered = numpy.sort(dice, axis=1).astype(numpy.int32) - 1
+    codes = ordered @ (6 ** numpy.arange(4, -1, -1))
+    return scores[lookup[codes]]
+
+
+def _counts(dice: Any) -> Any:
+    """How many dice of the game show the value of each die."""
+    counts = (dice[:, :, None] == numpy.arange(1, 7)).sum(axis=1)
+    return numpy.take_along_axis(counts, dice.astype(numpy.intp) - 1, axis=1)
+
+
+def _best(scores: Any, filled: Any) -> Any:
+    """First free category with the highest score."""
+    return numpy.where(filled, -1, scores).argmax(axis=1)
+
+
+def _conservative_keep(dice: Any, roll: int) -> Any:
+    return (_counts(dice) >= 2) | (dice >= 5)
+
+
+def _conservative_category(scores: Any, filled: Any, points: Any) -> Any:
+    return _best(scores, filled)
+
+
+def _risky_keep(dice: Any, roll: int) -> Any:
+    return (dice >= 4) | (_counts(dice) >= 3)
+
+
+_RISKY_ORDER = [
+    CATEGORY_INDEX[category]
+    for category in (
+        Category.YATZY,
+        Category.LARGE_STRAIGHT,
+        Category.SMALL_STRAIGHT,
+        Category.FOUR_KIND,
+    )
+]
+
+
+def _risky_category(scores: Any, filled: Any, points: Any) -> Any:
+    free = ~filled[:, _RISKY_ORDER]
+    preferred = numpy.array(_RISKY_ORDER)[free.argmax(axis=1)]
+    return numpy.where(free.any(axis=1), preferred, _best(scores, filled))
+
+
+def _adaptive_keep(dice: Any, roll: int) -> Any:
+    return (_counts(dice) >= 2) | (dice >= (4 if roll == 1 else 5))
+
+
+def _adaptive_category(scores: Any, filled: Any, points: Any) -> Any:
+    upper = (~filled[:, :6]).any(axis=1) & (points[:, :6].sum(axis=1) >= 50)
+    return numpy.where(
+        upper, _best(scores[:, :6], filled[:, :6]), _best(scores, filled)
+    )
+
+
+KeepPolicy = Callable[[Any, int], Any]
+CategoryPolicy = Callable[[Any, Any, Any], Any]
+
+STRATEGIES: Dict[Type[Player], Tuple[KeepPolicy, CategoryPolicy]] = {
+    ConservativeBot: (_conservative_keep, _conservative_category),
+    RiskyBot: (_risky_keep, _risky_category),
+    AdaptiveBot: (_adaptive_keep, _adaptive_category),
+}
+"""Vectorized decision rules of the built-in bots: keep(dice, roll) returns
+keep masks, category(scores, filled, points) category indices."""
+
+
+def simulate_batch(
+    n_games: int, bot: Type[Player] = ConservativeBot, seed: Optional[int] = None
+) -> Any:
+    """
+    Plays many solitaire games of a built-in bot at once.
+
+    All games advance together in struct-of-arrays form: dice, filled
+    categories and points are arrays with one row per game, every roll is
+    one draw for all games, and keep decisions, scoring and category
+    choices are array operations. The decisions are those of the bot's
+    choose_dice_to_keep and choose_category. Needs NumPy.
+
+    Args:
+        n_games: Number of games
+        bot: Bot class with an entry in STRATEGIES
+        seed: Seed of the dice
+
+    Returns:
+        Array of the final score of every game
+
+    Raises:
+        ImportError: If NumPy is not installed
+        ValueError: If the bot has no vectorized strategy
+    """
+    if numpy is None:
+        raise ImportError("NumPy is not installed!")
+    if bot not in STRATEGIES:
+        raise ValueError(f"No batch strategy for {bot.__name__}!")
+    keep_policy, category_policy = STRATEGIES[bot]
+    roller = BatchRoller(seed, use_numpy=True)
+    games = numpy.arange(n_games)
+    filled = numpy.zeros((n_games, len(Category)), dtype=bool)
+    points = numpy.zeros((n_games, len(Category)), dtype=numpy.int32)
+
+    for _ in range(len(Category)):
+        dice = roller.roll(n_games)
+        for roll in (1, 2):
+            dice = roller.reroll(dice, keep_policy(dice, roll))
+        scores = batch_scores(dice)
+        chosen = category_policy(scores, filled, points)
+        filled[games, chosen] = True
+        points[games, chosen] = scores[games, chosen]
+
+    upper = points[:, :6].sum(axis=1)
+    return points.sum(axis=1) + UPPER_BONUS * (upper >= UPPER_THRESHOLD)
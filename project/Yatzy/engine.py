@@ -0,0 +1,362 @@
+import json
+import random
+from collections import Counter
+from math import sqrt
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple
+
+from .dice import Dice
+from .player import Player
+from .scorecard import ScoreCard
+from .scoring import Category, calculate_score
+
+ROUNDS = len(Category)
+
+
+class EventSink:
+    """
+    Receives the events of games played by an Engine.
+
+    Every method does nothing here; subclasses override the events they
+    need. Dice and masks passed to a sink must not be modified.
+    """
+
+    def game_started(self, players: Sequence[Player]) -> None:
+        pass
+
+    def rolled(self, player: Player, roll: int, dice: List[int]) -> None:
+        """Dice after roll 1, 2 or 3 (the final dice) of a turn."""
+
+    def kept(self, player: Player, roll: int, keep_mask: List[bool]) -> None:
+        """Dice kept after roll 1 or 2."""
+
+    def scored(self, player: Player, category: Category, score: int) -> None:
+        pass
+
+    def game_finished(self, players: Sequence[Player], scores: List[int]) -> None:
+        pass
+
+
+class NullSink(EventSink):
+    """Discards all events; an Engine with it does not even emit them."""
+
+
+class CounterSink(EventSink):
+    """Counts games, turns, rolls and rerolled dice, and category use."""
+
+    def __init__(self) -> None:
+        self.counts: Counter = Counter()
+        self.categories: Counter = Counter()
+        self.category_points: Counter = Counter()
+
+    def game_started(self, players: Sequence[Player]) -> None:
+        self.counts["games"] += 1
+
+    def rolled(self, player: Player, roll: int, dice: List[int]) -> None:
+        self.counts["rolls"] += 1
+
+    def kept(self, player: Player, roll: int, keep_mask: List[bool]) -> None:
+        self.counts["rerolled_dice"] += keep_mask.count(False)
+
+    def scored(self, player: Player, category: Category, score: int) -> None:
+        self.counts["turns"] += 1
+        self.categories[category] += 1
+        self.category_points[category] += score
+
+
+class LogSink(EventSink):
+    """
+    Structured log: one dict per event, kept in `records` or written to a
+    stream as JSON lines.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None) -> None:
+        """
+        Args:
+            stream: Text stream for JSON lines; records are kept in memory
+                if it is None
+        """
+        self.stream = stream
+        self.records: List[Dict[str, Any]] = []
+
+    def _log(self, record: Dict[str, Any]) -> None:
+        if self.stream is None:
+            self.records.append(record)
+        else:
+            self.stream.write(json.dumps(record) + "\n")
+
+    def game_started(self, players: Sequence[Player]) -> None:
+        self._log({"event": "game_started", "players": [p.name for p in players]})
+
+    def rolled(self, player: Player, roll: int, dice: List[int]) -> None:
+        self._log(
+            {"event": "rolled", "player": player.name, "roll": roll, "dice": dice}
+        )
+
+    def kept(self, player: Player, roll: int, keep_mask: List[bool]) -> None:
+        self._log(
+            {"event": "kept", "player": player.name, "roll": roll, "keep": keep_mask}
+        )
+
+    def scored(self, player: Player, category: Category, score: int) -> None:
+        self._log(
+            {
+                "event": "scored",
+                "player": player.name,
+                "category": category.value,
+                "score": score,
+            }
+        )
+
+    def game_finished(self, players: Sequence[Player], scores: List[int]) -> None:
+        self._log(
+            {
+                "event": "game_finished",
+                "scores": {p.name: score for p, score in zip(players, scores)},
+            }
+        )
+
+
+class Engine:
+    """
+    Plays Yatzy without any presentation.
+
+    Game rules only: rolling, asking players for decisions and scoring.
+    What happens is reported to an EventSink; with no sink (or a NullSink)
+    no events are created at all, so nothing is formatted or printed.
+    """
+
+    def __init__(
+        self,
+        sink: Optional[EventSink] = None,
+        rng: Optional[random.Random] = None,
+        dice: Optional[Dice] = None,
+    ) -> None:
+        """
+        Args:
+            sink: Receiver of game events
+            rng: Random generator for the dice; the random module by default
+            dice: Dice to roll instead of drawing values from rng; they
+                hold the current dice and roll count of every turn
+        """
+        self.sink = sink
+        self.dice = dice
+        self._emit = sink is not None and type(sink) is not NullSink
+        self._random = (rng or random).random  # type: ignore
+
+    def play_turn(self, player: Player) -> Tuple[List[int], Category, int]:
+        """
+        Plays one turn: three rolls with the player's keep decisions, then
+        scores the dice in the category the player chooses.
+
+        Args:
+            player: Player taking the turn
+
+        Returns:
+            Final dice, chosen category and score
+        """
+        rand = self._random
+        sink = self.sink if self._emit else None
+        rolled = self.dice
+        if rolled is None:
+            dice = [int(rand() * 6) + 1 for _ in range(5)]
+        else:
+            rolled.reset_roll_count()
+            rolled.roll()
+            dice = rolled.get_values()
+        for roll in (1, 2):
+            if sink is not None:
+                sink.rolled(player, roll, dice)
+            keep_mask = player.choose_dice_to_keep(dice, roll)
+            if sink is not None:
+                sink.kept(player, roll, keep_mask)
+            if rolled is None:
+                dice = [
+                    value if keep else int(rand() * 6) + 1
+                    for value, keep in zip(dice, keep_mask)
+                ]
+            else:
+                rolled.roll(keep_mask)
+                dice = rolled.get_values()
+        if sink is not None:
+            sink.rolled(player, 3, dice)
+
+        category = player.choose_category(
+            dice, player.scorecard.get_available_categories()
+        )
+        if category is None:
+            raise ValueError(f"{player.name} chose no category!")
+        score = calculate_score(dice, category)
+        player.scorecard.record_score(category, score)
+        if sink is not None:
+            sink.scored(player, category, score)
+        return dice, category, score
+
+    def play_game(self, players: Sequence[Player]) -> List[int]:
+        """
+        Plays a full game with fresh scorecards.
+
+        Args:
+            players: Players, in turn order
+
+        Returns:
+            Final total score of every player
+        """
+        for player in players:
+            player.scorecard = ScoreCard()
+        if self._emit:
+            self.sink.game_started(players)  # type: ignore
+        for _ in range(ROUNDS):
+            for player in players:
+                self.play_turn(player)
+        scores = [player.scorecard.get_total_score() for player in players]
+        if self._emit:
+            self.sink.game_finished(players, scores)  # type: ignore
+        return scores
+
+
+class PlayerStats:
+    """Results of one player over many games."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.games = 0
+        self.wins = 0.0
+        self.histogram: Counter = Counter()
+        """Number of games per final score."""
+
+    def add(self, score: int, win: float) -> None:
+        """
+        Args:
+            score: Final score of a game
+            win: 1 for a win, 1 / k for a k-way tie for first place
+        """
+        self.games += 1
+        self.wins += win
+        self.histogram[score] += 1
+
+    def merge(self, other: "PlayerStats") -> "PlayerStats":
+        """
+        Returns:
+            self
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.histogram.update(other.histogram)
+        return self
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mean(self) -> float:
+        if not self.games:
+            return 0.0
+        return sum(score * n for score, n in self.histogram.items()) / self.games
+
+    def variance(self, ddof: int = 0) -> float:
+        """
+        Raises:
+            ValueError: If there are not more than ddof games
+        """
+        if self.games <= ddof:
+            raise ValueError("Not enough games for the variance!")
+        mean = self.mean
+        return sum(n * (score - mean) ** 2 for score, n in self.histogram.items()) / (
+            self.games - ddof
+        )
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation of the final score."""
+        return sqrt(self.variance(1)) if self.games > 1 else 0.0
+
+    @property
+    def minimum(self) -> int:
+        return min(self.histogram)
+
+    @property
+    def maximum(self) -> int:
+        return max(self.histogram)
+
+
+class SimulationStats:
+    """
+    Aggregate results of simulated games, per player in seat order.
+
+    Scores are kept as histograms, so statistics of separately simulated
+    batches (e.g. in worker processes) merge exactly.
+    """
+
+    def __init__(self, names: Sequence[str]) -> None:
+        self.games = 0
+        self.players = [PlayerStats(name) for name in names]
+
+    def add_game(self, scores: Sequence[int]) -> None:
+        best = max(scores)
+        win = 1.0 / list(scores).count(best)
+        self.games += 1
+        for stats, score in zip(self.players, scores):
+            stats.add(score, win if score == best else 0.0)
+
+    def merge(self, other: "SimulationStats") -> "SimulationStats":
+        """
+        Returns:
+            self
+
+        Raises:
+            ValueError: If the players differ
+        """
+        if [p.name for p in other.players] != [p.name for p in self.players]:
+            raise ValueError("Cannot merge statistics of different players!")
+        self.games += other.games
+        for stats, other_stats in zip(self.players, other.players):
+            stats.merge(other_stats)
+        return self
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns:
+            Games, wins, win rate, mean, standard deviation, minimum and
+            maximum score per player name
+        """
+        return {
+            stats.name: {
+                "games": stats.games,
+                "wins": stats.wins,
+                "win_rate": stats.win_rate,
+                "mean": stats.mean,
+                "std": stats.std,
+                "min": stats.minimum,
+                "max": stats.maximum,
+            }
+            for stats in self.players
+            if stats.games
+        }
+
+
+def simulate(
+    n_games: int,
+    players: Sequence[Player],
+    seed: Optional[int] = None,
+    sink: Optional[EventSink] = None,
+) -> SimulationStats:
+    """
+    Plays games between the same players without printing anything.
+
+    Args:
+        n_games: Number of games
+        players: Players, in turn order; their scorecards are reset before
+            every game
+        seed: Seed of the dice; the same seed and players give the same
+            games (for bots without randomness of their own)
+        sink: Receiver of game events, none by default
+
+    Returns:
+        Aggregate statistics per player
+    """
+    engine = Engine(sink, random.Random(seed))
+    stats = SimulationStats([player.name for player in players])
+    for _ in range(n_games):
+        stats.add_game(engine.play_game(players))
+    return stats
@@ -1,13 +1,35 @@
 from typing import List, Dict, Any
 from .dice import Dice
-from .scoring import calculate_score
+from .engine import Engine, EventSink
+from .scoring import Category
+
+
+class ConsoleSink(EventSink):
+    """Prints the turns of a game as they are played."""
+
+    def rolled(self, player: Any, roll: int, dice: List[int]) -> None:
+        if roll < 3:
+            print(f"Dice: {dice} (Roll {roll})")
+        else:
+            print(f"Final dice: {dice}")
+
+    def kept(self, player: Any, roll: int, keep_mask: List[bool]) -> None:
+        if any(keep_mask):
+            kept_positions = [i + 1 for i, keep in enumerate(keep_mask) if keep]
+            print(f"Keeping dice at positions: {kept_positions}")
+
+    def scored(self, player: Any, category: Category, score: int) -> None:
+        print(f"Scored {score} points in {category.value}")
 
 
 class Game:
     """
     Manages the Yatzy game flow and coordinates players.
 
-    Responsible for game rounds, player turns, and final scoring.
+    Responsible for game rounds, player turns, and final scoring. Turns
+    are played by an Engine that rolls the game's Dice and reports to a
+    ConsoleSink; use the Engine or engine.simulate directly to play
+    without output.
     """
 
     def __init__(self, players: List[Any], max_rounds: int = 15) -> None:
@@ -22,6 +44,7 @@ class Game:
         self.max_rounds: int = max_rounds
         self.current_round: int = 0
         self.dice: Dice = Dice()
+        self.engine: Engine = Engine(ConsoleSink(), dice=self.dice)
 
     def play_round(self) -> None:
         """Play one round where each player takes a turn."""
@@ -40,32 +63,7 @@ class Game:
         Args:
             player: Player taking the turn
         """
-        self.dice.reset_roll_count()
-        self.dice.roll()
-
-        while self.dice.roll_count < 3:
-            print(f"Dice: {self.dice.get_values()} (Roll {self.dice.roll_count})")
-
-            if self.dice.roll_count < 3:
-                keep_mask = player.choose_dice_to_keep(
-                    self.dice.get_values(), self.dice.roll_count
-                )
-                if any(keep_mask):
-                    kept_positions = [i + 1 for i, keep in enumerate(keep_mask) if keep]
-                    print(f"Keeping dice at positions: {kept_positions}")
-                self.dice.roll(keep_mask)
-            else:
-                break
-
-        final_dice = self.dice.get_values()
-        print(f"Final dice: {final_dice}")
-
-        available_categories = player.scorecard.get_available_categories()
-        chosen_category = player.choose_category(final_dice, available_categories)
-
-        score = calculate_score(final_dice, chosen_category)
-        player.scorecard.record_score(chosen_category, score)
-        print(f"Scored {score} points in {chosen_category.value}")
+        self.engine.play_turn(player)
 
     def play_game(self) -> None:
         """Play complete game until max rounds or all players finished."""
@@ -0,0 +1,444 @@
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import combinations, combinations_with_replacement
+from math import factorial
+from operator import mul
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from .scorecard import ScoreCard
+from .scoring import (
+    CATEGORY_INDEX,
+    ROLL_INDEX,
+    ROLLS,
+    SCORE_TABLE,
+    Category,
+    roll_index,
+)
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore
+
+UPPER_CAP = 63
+"""Upper section sum needed for the bonus; larger sums are stored as 63."""
+
+UPPER_BONUS = 50
+
+UPPER_STATES = UPPER_CAP + 1
+
+UPPER_FACES: Dict[Category, int] = {
+    Category.ONES: 1,
+    Category.TWOS: 2,
+    Category.THREES: 3,
+    Category.FOURS: 4,
+    Category.FIVES: 5,
+    Category.SIXES: 6,
+}
+
+CATEGORIES: Tuple[Category, ...] = tuple(Category)
+
+KEEPS: List[Tuple[int, ...]] = [
+    keep
+    for size in range(6)
+    for keep in combinations_with_replacement(range(1, 7), size)
+]
+"""The 462 multisets of kept dice, by size; the last 252 are the rolls."""
+
+KEEP_INDEX: Dict[Tuple[int, ...], int] = {keep: i for i, keep in enumerate(KEEPS)}
+
+ROLL_KEEPS = len(KEEPS) - len(ROLLS)
+"""Index of the keep that keeps the whole first roll."""
+
+DEFAULT_TABLE_PATH = Path(
+    os.environ.get("YATZY_VALUE_TABLE", Path.home() / ".cache" / "yatzy" / "values.bin")
+)
+"""Where default_table stores the solved table of the full game."""
+
+_HEADER = struct.Struct("<4sB15s4x")
+_MAGIC = b"YZV1"
+
+Lookup = Callable[[int, int], float]
+
+
+def _outcomes(keep: Tuple[int, ...]) -> Tuple[List[int], List[float]]:
+    """Rolls reachable by rerolling the other dice, with their probabilities."""
+    free = 5 - len(keep)
+    rolls: List[int] = []
+    probabilities: List[float] = []
+    for rolled in combinations_with_replacement(range(1, 7), free):
+        ways = factorial(free)
+        for face in set(rolled):
+            ways //= factorial(rolled.count(face))
+        rolls.append(ROLL_INDEX[tuple(sorted(keep + rolled))])
+        probabilities.append(ways / 6**free)
+    return rolls, probabilities
+
+
+def _parents(keep: Tuple[int, ...]) -> List[int]:
+    """Keeps with one die less: the best keep from a roll is found by
+    walking this lattice instead of trying all 32 subsets of the dice."""
+    return sorted({KEEP_INDEX[keep[:i] + keep[i + 1 :]] for i in range(len(keep))})
+
+
+OUTCOMES = [_outcomes(keep) for keep in KEEPS]
+PARENTS = [_parents(keep) for keep in KEEPS]
+SCORES: Dict[Category, List[int]] = {
+    category: [scores[CATEGORY_INDEX[category]] for scores in SCORE_TABLE]
+    for category in CATEGORIES
+}
+
+
+def keep_mask(dice_values: Sequence[int], keep: Tuple[int, ...]) -> List[bool]:
+    """Keep mask for Dice.roll that keeps the multiset `keep`."""
+    remaining = list(keep)
+    mask = []
+    for value in dice_values:
+        kept = value in remaining
+        if kept:
+            remaining.remove(value)
+        mask.append(kept)
+    return mask
+
+
+def _expected(values: List[float]) -> List[float]:
+    """Expected value after the reroll, for every keep."""
+    return [
+        sum(map(mul, probabilities, map(values.__getitem__, rolls)), 0.0)
+        for rolls, probabilities in OUTCOMES
+    ]
+
+
+def _best_keeps(keep_values: List[float]) -> List[float]:
+    """Value of the best keep contained in every keep (and so every roll)."""
+    best = keep_values[:]
+    for index in range(1, len(KEEPS)):
+        best[index] = max(best[index], max(map(best.__getitem__, PARENTS[index])))
+    return best
+
+
+class TurnValues:
+    """
+    Expected final scores within one turn from a start-of-turn state.
+
+    Computed from the values of the following states in O(number of keeps
+    and rolls), which is what the bot does at every decision instead of
+    searching the game tree.
+    """
+
+    def __init__(
+        self, categories: Sequence[Category], lookup: Lookup, mask: int, upper: int
+    ) -> None:
+        """
+        Args:
+            categories: Categories of the game, bit i of mask is categories[i]
+            lookup: Value of a start-of-turn state (mask, upper sum)
+            mask: Bitmask of the filled categories
+            upper: Upper section sum, capped at UPPER_CAP
+        """
+        self.categories = categories
+        self.lookup = lookup
+        self.mask = mask
+        self.upper = upper
+
+        best = [float("-inf")] * len(ROLLS)
+        for bit in range(len(categories)):
+            if not mask >> bit & 1:
+                best[:] = map(max, best, self.category_values(bit))
+        self.final = best
+        self.second = _expected(self.final)
+        self.first = _expected(_best_keeps(self.second)[ROLL_KEEPS:])
+        start = _best_keeps(self.first)[ROLL_KEEPS:]
+        rolls, probabilities = OUTCOMES[0]
+        self.value = sum(map(mul, probabilities, map(start.__getitem__, rolls)), 0.0)
+
+    def category_values(self, bit: int) -> List[float]:
+        """Score plus future value of scoring every roll in categories[bit]."""
+        category = self.categories[bit]
+        successor = self.mask | 1 << bit
+        scores = SCORES[category]
+        face = UPPER_FACES.get(category)
+        if face is None:
+            future = self.lookup(successor, self.upper)
+            return [score + future for score in scores]
+        upper = self.upper
+        futures = [
+            self.lookup(successor, min(upper + count * face, UPPER_CAP))
+            + (UPPER_BONUS if upper < UPPER_CAP <= upper + count * face else 0)
+            for count in range(6)
+        ]
+        return [score + futures[score // face] for score in scores]
+
+    def best_keep(self, dice_values: Sequence[int], rerolls: int) -> Tuple[int, ...]:
+        """
+        Args:
+            dice_values: Current dice
+            rerolls: Rerolls left (2 after the first roll, 1 after the second)
+
+        Returns:
+            Multiset of dice to keep with the highest expected value
+        """
+        keep_values = self.first if rerolls == 2 else self.second
+        roll = roll_index(dice_values)
+        best = max(
+            {
+                KEEP_INDEX[sub]
+                for size in range(6)
+                for sub in combinations(ROLLS[roll], size)
+            },
+            key=keep_values.__getitem__,
+        )
+        return KEEPS[best]
+
+
+class ValueTable:
+    """
+    Expected final score of every start-of-turn state of a Yatzy game.
+
+    A state is the bitmask of filled categories and the upper section sum
+    capped at UPPER_CAP; the value excludes points already scored. For the
+    full game there are 2 ** 15 * 64 states, stored as 8 MB of float32.
+    Tables are written once by save() and memory-mapped by load(), so
+    starting a bot costs no solving and no parsing.
+    """
+
+    def __init__(
+        self, categories: Sequence[Category], values: Union[array, "memoryview[float]"]
+    ) -> None:
+        """
+        Args:
+            categories: Categories of the game, bit i of a mask is categories[i]
+            values: Value of state (mask, upper) at mask * UPPER_STATES + upper
+        """
+        if len(values) != UPPER_STATES << len(categories):
+            raise ValueError("Value table does not match its categories!")
+        self.categories = tuple(categories)
+        self.values = values
+        self._mmap: Optional[mmap.mmap] = None
+        self.path: Optional[Path] = None
+        """File the table was loaded from."""
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # A loaded table is pickled as its path, so worker processes map
+        # the same file instead of receiving a copy of the values
+        if self._mmap is not None:
+            return type(self).load, (self.path,)
+        return type(self), (self.categories, array("f", self.values))
+
+    def value(self, mask: int, upper: int) -> float:
+        """Expected points still to score from a state."""
+        return self.values[mask * UPPER_STATES + min(upper, UPPER_CAP)]
+
+    def state(self, scorecard: ScoreCard) -> Tuple[int, int]:
+        """
+        Returns:
+            Filled-category mask and capped upper sum of a scorecard
+        """
+        upper = min(scorecard.upper_sum, UPPER_CAP)
+        if self.categories == CATEGORIES:
+            # Bits are in Category order, as in ScoreCard.filled
+            return scorecard.filled, upper
+        mask = 0
+        for bit, category in enumerate(self.categories):
+            if scorecard.is_filled(category):
+                mask |= 1 << bit
+        return mask, upper
+
+    def turn(self, mask: int, upper: int) -> TurnValues:
+        return TurnValues(self.categories, self.value, mask, upper)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Writes the table as a header and little-endian float32 values."""
+        values = array("f", self.values)
+        if sys.byteorder != "little":
+            values.byteswap()
+        indices = bytes(CATEGORIES.index(category) for category in self.categories)
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, len(self.categories), indices))
+            values.tofile(file)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ValueTable":
+        """
+        Memory-maps a table written by save(); values are read from the
+        page cache on demand and shared between processes.
+
+        Raises:
+            ValueError: If the file is not a value table
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < _HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path} is not a Yatzy value table!")
+        magic, count, indices = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or len(mapped) != _HEADER.size + 4 * (UPPER_STATES << count):
+            mapped.close()
+            raise ValueError(f"{path} is not a Yatzy value table!")
+        categories = [CATEGORIES[index] for index in indices[:count]]
+        if sys.byteorder != "little":
+            values = array("f", mapped[_HEADER.size :])
+            values.byteswap()
+            mapped.close()
+            return cls(categories, values)
+        table = cls(categories, memoryview(mapped)[_HEADER.size :].cast("f"))
+        table._mmap = mapped
+        table.path = Path(path)
+        return table
+
+    def close(self) -> None:
+        """Unmaps a loaded table; it cannot be used afterwards."""
+        if self._mmap is not None:
+            assert isinstance(self.values, memoryview)
+            self.values.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+def _solve_python(categories: Sequence[Category]) -> array:
+    values = array("d", bytes(8 * (UPPER_STATES << len(categories))))
+
+    def lookup(mask: int, upper: int) -> float:
+        return values[mask * UPPER_STATES + upper]
+
+    upper_bits = sum(
+        1 << bit for bit, category in enumerate(categories) if category in UPPER_FACES
+    )
+    full = (1 << len(categories)) - 1
+    for mask in range(full - 1, -1, -1):
+        start = mask * UPPER_STATES
+        if upper_bits & ~mask:
+            for upper in range(UPPER_STATES):
+                values[start + upper] = TurnValues(
+                    categories, lookup, mask, upper
+                ).value
+        else:
+            # Upper section is full, so the bonus is settled already and
+            # the value does not depend on the sum
+            value = TurnValues(categories, lookup, mask, UPPER_CAP).value
+            values[start : start + UPPER_STATES] = array("d", [value]) * UPPER_STATES
+    return values
+
+
+def _solve_numpy(categories: Sequence[Category]) -> array:
+    """Same recursion, vectorized over the 64 upper sums of a mask."""
+    # Dense keep x roll transition matrix: 4368 of its 116424 entries are
+    # non-zero, but one BLAS product beats any sparse gather here
+    transitions = numpy.zeros((len(KEEPS), len(ROLLS)))
+    for keep, (rolls, probabilities) in enumerate(OUTCOMES):
+        transitions[keep, rolls] = probabilities
+
+    # Parent lattice per keep size, padded by repeating the first parent
+    levels = []
+    for size in range(1, 6):
+        first = KEEP_INDEX[(1,) * size]
+        last = KEEP_INDEX[(6,) * size] + 1
+        parents = [PARENTS[index] for index in range(first, last)]
+        width = max(map(len, parents))
+        padded = [p + p[:1] * (width - len(p)) for p in parents]
+        levels.append((first, last, numpy.array(padded)))
+
+    def best_rolls(keep_values):  # type: ignore
+        for first, last, parents in levels:
+            numpy.maximum(
+                keep_values[first:last],
+                keep_values[parents].max(axis=1),
+                out=keep_values[first:last],
+            )
+        return keep_values[ROLL_KEEPS:]
+
+    uppers = numpy.arange(UPPER_STATES)
+    columns = []
+    for bit, category in enumerate(categories):
+        scores = numpy.array(SCORES[category], dtype=float)[:, None]
+        face = UPPER_FACES.get(category)
+        if face is None:
+            columns.append((bit, scores, None))
+            continue
+        total = uppers[None, :] + scores.astype(int)
+        bonus = UPPER_BONUS * ((uppers < UPPER_CAP) & (total >= UPPER_CAP))
+        columns.append((bit, scores + bonus, numpy.minimum(total, UPPER_CAP)))
+
+    values = numpy.zeros((1 << len(categories), UPPER_STATES))
+    for mask in range(len(values) - 2, -1, -1):
+        final = numpy.full((len(ROLLS), UPPER_STATES), -numpy.inf)
+        for bit, gains, successors in columns:
+            if mask >> bit & 1:
+                continue
+            future = values[mask | 1 << bit]
+            if successors is None:
+                numpy.maximum(final, gains + future, out=final)
+            else:
+                numpy.maximum(final, gains + future[successors], out=final)
+        first = best_rolls(transitions @ best_rolls(transitions @ final))
+        values[mask] = transitions[0] @ first
+    return array("d", values.ravel().tolist())
+
+
+def solve(
+    categories: Sequence[Category] = CATEGORIES, use_numpy: Optional[bool] = None
+) -> ValueTable:
+    """
+    Solves Yatzy for the expected score of optimal play by dynamic
+    programming over start-of-turn states.
+
+    States are visited from the full scorecard backwards. The value of a
+    turn is computed over the 252 rolls and 462 kept multisets with the
+    reroll probabilities precomputed at import, so the work per state is
+    independent of the game length. The full game takes about a minute
+    with NumPy; the pure Python solver is meant for games with few
+    categories.
+
+    Args:
+        categories: Categories of the game (all by default)
+        use_numpy: Solve with NumPy, by default if it is installed
+
+    Returns:
+        Value table of the game
+
+    Raises:
+        ImportError: If use_numpy is True and NumPy is not installed
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed!")
+    categories = tuple(categories)
+    values = _solve_numpy(categories) if use_numpy else _solve_python(categories)
+    return ValueTable(categories, array("f", values))
+
+
+_default_table: Optional[ValueTable] = None
+
+
+def default_table(path: Union[str, Path, None] = None) -> ValueTable:
+    """
+    Value table of the full game, shared by all bots of the process.
+
+    Loaded from path (DEFAULT_TABLE_PATH by default); if the file does not
+    exist yet the game is solved once with NumPy and the file written. The
+    pure Python solver would take hours for the full game, so it is never
+    started implicitly; call solve(use_numpy=False) for that.
+
+    Raises:
+        ImportError: If the file does not exist and NumPy is not installed
+    """
+    global _default_table
+
+    if path is None and _default_table is not None:
+        return _default_table
+    file = Path(path) if path is not None else DEFAULT_TABLE_PATH
+    if not file.exists():
+        file.parent.mkdir(parents=True, exist_ok=True)
+        solve(use_numpy=True).save(file)
+    table = ValueTable.load(file)
+    if path is None:
+        _default_table = table
+    return table
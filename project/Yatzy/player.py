@@ -1,7 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 from .scorecard import ScoreCard
-from .scoring import Category, calculate_score
+from .scoring import (
+    Category,
+    calculate_score,
+    roll_index,
+    score_vector,
+)
+
+if TYPE_CHECKING:  # the solver is imported by OptimalBot only
+    from .optimal import TurnValues, ValueTable
 
 
 class Player(ABC):
@@ -89,11 +97,12 @@ class ConservativeBot(Player):
         Returns:
             Category with highest score
         """
+        scores = score_vector(dice_values)
         best_score = -1
         best_category = None
 
         for category in available_categories:
-            score = calculate_score(dice_values, category)
+            score = scores[category.index]
             if score > best_score:
                 best_score = score
                 best_category = category
@@ -151,11 +160,12 @@ class RiskyBot(Player):
             if category in available_categories:
                 return category
 
+        scores = score_vector(dice_values)
         best_score = -1
         best_category = None
 
         for category in available_categories:
-            score = calculate_score(dice_values, category)
+            score = scores[category.index]
             if score > best_score:
                 best_score = score
                 best_category = category
@@ -221,16 +231,15 @@ class AdaptiveBot(Player):
         ]
 
         if upper_available:
-            current_upper = sum(
-                self.scorecard.categories[cat] or 0 for cat in upper_categories
-            )
+            current_upper = self.scorecard.upper_sum
 
             if current_upper >= 50:
                 best_upper_score = -1
                 best_upper_category = None
 
+                upper_scores = score_vector(dice_values)
                 for category in upper_available:
-                    score = calculate_score(dice_values, category)
+                    score = upper_scores[category.index]
                     if score > best_upper_score:
                         best_upper_score = score
                         best_upper_category = category
@@ -238,13 +247,100 @@ class AdaptiveBot(Player):
                 if best_upper_category:
                     return best_upper_category
 
+        scores = score_vector(dice_values)
         best_score = -1
         best_category = None
 
         for category in available_categories:
-            score = calculate_score(dice_values, category)
+            score = scores[category.index]
             if score > best_score:
                 best_score = score
                 best_category = category
 
         return best_category
+
+
+class OptimalBot(Player):
+    """Bot that maximizes its expected final score using a solved value table."""
+
+    def __init__(self, name: str, table: Optional["ValueTable"] = None) -> None:
+        """
+        Initialize player with a value table.
+
+        Args:
+            name: Player name
+            table: Value table from optimal.solve or ValueTable.load; by
+                default the full-game table shared by all bots (solved with
+                NumPy and saved on first use, see optimal.default_table)
+
+        Raises:
+            ImportError: If no table is given, none is saved yet and NumPy
+                is not installed
+        """
+        super().__init__(name)
+        if table is None:
+            from .optimal import default_table
+
+            table = default_table()
+        self.table: "ValueTable" = table
+        self._turn: Optional["TurnValues"] = None
+
+    def _turn_values(self) -> "TurnValues":
+        """Turn values for the current scorecard, computed once per turn."""
+        mask, upper = self.table.state(self.scorecard)
+        turn = self._turn
+        if turn is None or (turn.mask, turn.upper) != (mask, upper):
+            turn = self._turn = self.table.turn(mask, upper)
+        return turn
+
+    def choose_dice_to_keep(
+        self, dice_values: List[int], roll_count: int
+    ) -> List[bool]:
+        """
+        Keep the dice with the highest expected final score.
+
+        Args:
+            dice_values: Current dice values
+            roll_count: Current roll number
+
+        Returns:
+            List indicating which dice to keep
+        """
+        from .optimal import keep_mask
+
+        keep = self._turn_values().best_keep(dice_values, 3 - roll_count)
+        return keep_mask(dice_values, keep)
+
+    def choose_category(
+        self, dice_values: List[int], available_categories: List[Category]
+    ) -> Optional[Category]:
+        """
+        Choose category maximizing score plus expected future score.
+
+        Args:
+            dice_values: Final dice values
+            available_categories: Available categories
+
+        Returns:
+            Best category; the highest scoring one if the table does not
+            cover any available category
+        """
+        turn = self._turn_values()
+        roll = roll_index(dice_values)
+        best_value = float("-inf")
+        best_category = None
+
+        for bit, category in enumerate(self.table.categories):
+            if category in available_categories:
+                value = turn.category_values(bit)[roll]
+                if value > best_value:
+                    best_value = value
+                    best_category = category
+
+        if best_category is None and available_categories:
+            best_category = max(
+                available_categories,
+                key=lambda category: calculate_score(dice_values, category),
+            )
+
+        return best_category
@@ -1,15 +1,102 @@
-from typing import List, Dict, Optional
-from .scoring import Category
+from typing import Dict, Iterator, List, Mapping, MutableMapping, Optional, Tuple
+from .scoring import CATEGORY_INDEX, Category
+
+CATEGORIES: Tuple[Category, ...] = tuple(Category)
+
+FULL_MASK = (1 << len(CATEGORIES)) - 1
+
+UPPER_CATEGORIES = CATEGORIES[:6]
+UPPER_THRESHOLD = 63
+UPPER_BONUS = 50
+
+_available: Dict[int, Tuple[Category, ...]] = {}
+"""Free categories per filled-category mask, filled on first use."""
+
+
+def _free_categories(filled: int) -> Tuple[Category, ...]:
+    free = _available.get(filled)
+    if free is None:
+        free = tuple(
+            category for bit, category in enumerate(CATEGORIES) if not filled >> bit & 1
+        )
+        _available[filled] = free
+    return free
+
+
+class CategoryScores(MutableMapping[Category, Optional[int]]):
+    """
+    Live view of the scores of a ScoreCard by category (None if free).
+
+    Assigning a score records it with ScoreCard.record_score, replacing an
+    earlier score of the category; assigning None frees the category.
+    Categories cannot be deleted.
+    """
+
+    __slots__ = ("_card",)
+
+    def __init__(self, card: "ScoreCard") -> None:
+        self._card = card
+
+    def __getitem__(self, category: Category) -> Optional[int]:
+        return self._card._scores[CATEGORY_INDEX[category]]
+
+    def __setitem__(self, category: Category, score: Optional[int]) -> None:
+        card = self._card
+        card._clear(category)
+        if score is not None:
+            card.record_score(category, score)
+
+    def __delitem__(self, category: Category) -> None:
+        raise TypeError("Categories cannot be removed from a scorecard!")
+
+    def __iter__(self) -> Iterator[Category]:
+        return iter(CATEGORIES)
+
+    def __len__(self) -> int:
+        return len(CATEGORIES)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 class ScoreCard:
-    """Tracks scores for all Yatzy categories."""
+    """
+    Tracks scores for all Yatzy categories.
+
+    The state is a bitmask of filled categories (bit i for the i-th
+    Category) with running upper section and total sums, so totals,
+    completeness and the free categories are O(1) and a copy costs a few
+    attribute assignments. Scorecards compare by identity; use key() to
+    memoize by state.
+    """
+
+    __slots__ = ("filled", "upper_sum", "total", "_scores")
 
     def __init__(self) -> None:
         """Initialize scorecard with all categories empty."""
-        self.categories: Dict[Category, Optional[int]] = {
-            category: None for category in Category
-        }
+        self.filled: int = 0
+        self.upper_sum: int = 0
+        self.total: int = 0
+        """Sum of all scores, without the bonus."""
+        self._scores: List[Optional[int]] = [None] * len(CATEGORIES)
+
+    @property
+    def categories(self) -> CategoryScores:
+        """Score of every category, None for free ones (assignable)."""
+        return CategoryScores(self)
+
+    @categories.setter
+    def categories(self, scores: Mapping[Category, Optional[int]]) -> None:
+        self.filled = self.upper_sum = self.total = 0
+        self._scores = [None] * len(CATEGORIES)
+        for category, score in scores.items():
+            if score is not None:
+                self.record_score(category, score)
+
+    @property
+    def has_bonus(self) -> bool:
+        """True once the upper section sum reaches UPPER_THRESHOLD."""
+        return self.upper_sum >= UPPER_THRESHOLD
 
     def record_score(self, category: Category, score: int) -> bool:
         """
@@ -22,10 +109,47 @@ class ScoreCard:
         Returns:
             True if score was recorded, False if category was already filled
         """
-        if self.categories[category] is None:
-            self.categories[category] = score
-            return True
-        return False
+        index = category.index
+        bit = 1 << index
+        if self.filled & bit:
+            return False
+        self.filled |= bit
+        self._scores[index] = score
+        self.total += score
+        if index < len(UPPER_CATEGORIES):
+            self.upper_sum += score
+        return True
+
+    def _clear(self, category: Category) -> None:
+        """Frees a category, taking its score out of the sums."""
+        index = category.index
+        score = self._scores[index]
+        if score is None:
+            return
+        self.filled &= ~(1 << index)
+        self._scores[index] = None
+        self.total -= score
+        if index < len(UPPER_CATEGORIES):
+            self.upper_sum -= score
+
+    def is_filled(self, category: Category) -> bool:
+        """
+        Args:
+            category: Category to check
+
+        Returns:
+            True if the category has a score
+        """
+        return bool(self.filled >> category.index & 1)
+
+    def available_categories(self) -> Tuple[Category, ...]:
+        """
+        Categories that haven't been scored yet, in Category order.
+
+        Returns:
+            Shared tuple for the filled mask (no list is built)
+        """
+        return _free_categories(self.filled)
 
     def get_available_categories(self) -> List[Category]:
         """
@@ -34,7 +158,7 @@ class ScoreCard:
         Returns:
             List of available categories
         """
-        return [cat for cat, score in self.categories.items() if score is None]
+        return list(_free_categories(self.filled))
 
     def get_total_score(self) -> int:
         """
@@ -43,30 +167,9 @@ class ScoreCard:
         Returns:
             Total score with bonus
         """
-        upper_categories = [
-            Category.ONES,
-            Category.TWOS,
-            Category.THREES,
-            Category.FOURS,
-            Category.FIVES,
-            Category.SIXES,
-        ]
-
-        upper_sum = sum(
-            score
-            for cat, score in self.categories.items()
-            if cat in upper_categories and score is not None
-        )
-
-        bonus = 50 if upper_sum >= 63 else 0
-
-        lower_sum = sum(
-            score
-            for cat, score in self.categories.items()
-            if cat not in upper_categories and score is not None
-        )
-
-        return upper_sum + bonus + lower_sum
+        if self.upper_sum >= UPPER_THRESHOLD:
+            return self.total + UPPER_BONUS
+        return self.total
 
     def is_complete(self) -> bool:
         """
@@ -75,4 +178,33 @@ class ScoreCard:
         Returns:
             True if all categories have scores, False otherwise
         """
-        return all(score is not None for score in self.categories.values())
+        return self.filled == FULL_MASK
+
+    def copy(self) -> "ScoreCard":
+        """
+        Returns:
+            Independent scorecard with the same scores
+        """
+        card = ScoreCard.__new__(ScoreCard)
+        card.filled = self.filled
+        card.upper_sum = self.upper_sum
+        card.total = self.total
+        card._scores = self._scores[:]
+        return card
+
+    __copy__ = copy
+
+    def key(self) -> Tuple[int, int, int]:
+        """
+        Returns:
+            Filled mask, upper sum and total: scorecards with equal keys
+            have the same rest of the game and final score, so the key can
+            memoize results by state
+        """
+        return self.filled, self.upper_sum, self.total
+
+    def __repr__(self) -> str:
+        return (
+            f"ScoreCard(filled={self.filled:#06x}, upper_sum={self.upper_sum}, "
+            f"total={self.total})"
+        )
@@ -1,5 +1,7 @@
 from enum import Enum
-from typing import List
+from functools import cached_property
+from itertools import combinations_with_replacement
+from typing import Dict, List, Sequence, Tuple
 
 
 class Category(Enum):
@@ -21,10 +23,24 @@ class Category(Enum):
     CHANCE = "chance"
     YATZY = "yatzy"
 
+    @cached_property
+    def index(self) -> int:
+        """
+        Position in Category order, the same as CATEGORY_INDEX[category].
 
-def calculate_score(dice: List[int], category: Category) -> int:
+        Hot paths read it instead of CATEGORY_INDEX: after the first access
+        it is a plain attribute, while a dictionary lookup calls
+        Enum.__hash__, which is written in Python.
+        """
+        return list(Category).index(self)
+
+
+def _calculate_score(dice: List[int], category: Category) -> int:
     """
-    Calculate score for given dice values and category.
+    Calculate score for given dice values and category from scratch.
+
+    Reference implementation the score table is built from; also used for
+    dice that are not five values from 1 to 6.
 
     Args:
         dice: List of 5 dice values
@@ -92,3 +108,73 @@ def calculate_score(dice: List[int], category: Category) -> int:
         return 0
 
     return 0
+
+
+ROLLS: List[Tuple[int, ...]] = list(combinations_with_replacement(range(1, 7), 5))
+"""The 252 distinct rolls of five dice as sorted tuples."""
+
+ROLL_INDEX: Dict[Tuple[int, ...], int] = {roll: i for i, roll in enumerate(ROLLS)}
+
+CATEGORY_INDEX: Dict[Category, int] = {
+    category: i for i, category in enumerate(Category)
+}
+SCORE_TABLE: List[Tuple[int, ...]] = [
+    tuple(_calculate_score(list(roll), category) for category in Category)
+    for roll in ROLLS
+]
+"""Scores of every roll (by ROLL_INDEX) in every category (by CATEGORY_INDEX)."""
+
+
+def roll_index(dice: Sequence[int]) -> int:
+    """
+    Canonical index of a roll: the order of the dice does not matter.
+
+    Args:
+        dice: List of 5 dice values
+
+    Returns:
+        Index into ROLLS and SCORE_TABLE
+
+    Raises:
+        ValueError: If dice are not five values from 1 to 6
+    """
+    index = ROLL_INDEX.get(tuple(sorted(dice)))
+    if index is None:
+        raise ValueError("Invalid dice: expected five values from 1 to 6!")
+    return index
+
+
+def score_vector(dice: Sequence[int]) -> Tuple[int, ...]:
+    """
+    Scores of a roll in all categories.
+
+    Args:
+        dice: List of 5 dice values
+
+    Returns:
+        Score per category, in Category order (see CATEGORY_INDEX)
+
+    Raises:
+        ValueError: If dice are not five values from 1 to 6
+    """
+    return SCORE_TABLE[roll_index(dice)]
+
+
+def calculate_score(dice: List[int], category: Category) -> int:
+    """
+    Calculate score for given dice values and category.
+
+    Looks the score up in SCORE_TABLE, so a call costs a sort of five dice
+    and two dictionary lookups instead of counting and branching.
+
+    Args:
+        dice: List of 5 dice values
+        category: Scoring category
+
+    Returns:
+        Calculated score, 0 for anything that is not a Category
+    """
+    index = ROLL_INDEX.get(tuple(sorted(dice)))
+    if index is None or not isinstance(category, Category):
+        return _calculate_score(dice, category)
+    return SCORE_TABLE[index][category.index]
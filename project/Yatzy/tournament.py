@@ -0,0 +1,226 @@
+import os
+import random
+from concurrent.futures import Future, ProcessPoolExecutor
+from math import sqrt
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .engine import SimulationStats, simulate
+from .player import Player
+
+BATCH_GAMES = 500
+"""Games per task; results are merged and checked for early stopping per batch."""
+
+CONFIDENCE_Z = 1.96
+"""Normal quantile of the confidence intervals (95 %)."""
+
+Interval = Tuple[float, float]
+
+_players: Sequence[Player] = ()
+
+
+def _init_worker(players: Sequence[Player]) -> None:
+    global _players
+    _players = players
+
+
+def batch_seed(seed: int, batch: int) -> int:
+    """
+    Seed of the dice of one batch.
+
+    Depends only on the tournament seed and the batch number, so the games
+    are the same whichever worker plays a batch and however many workers
+    there are.
+    """
+    return random.Random(f"{seed}/{batch}").getrandbits(64)
+
+
+def corrected_z(z: float, looks: int) -> float:
+    """
+    Normal quantile for checking a confidence interval up to `looks` times.
+
+    Stopping at the first of many looks at which intervals separate makes a
+    false stop far more likely than at one look. Bonferroni correction
+    splits the error rate 2 * (1 - Phi(z)) evenly over the looks, which
+    keeps the overall rate of a false stop at most that of a single look.
+
+    Args:
+        z: Quantile for a single look
+        looks: Number of looks
+
+    Returns:
+        Quantile to use at every look (z itself for one look)
+    """
+    normal = NormalDist()
+    error = 2 * (1 - normal.cdf(z))
+    return normal.inv_cdf(1 - error / (2 * max(looks, 1)))
+
+
+def _play_batch(task: Tuple[int, int, int]) -> SimulationStats:
+    seed, batch, games = task
+    return simulate(games, _players, seed=batch_seed(seed, batch))
+
+
+class TournamentResult:
+    """Merged statistics of a tournament with confidence intervals."""
+
+    def __init__(
+        self,
+        stats: SimulationStats,
+        z: float = CONFIDENCE_Z,
+        stopped_early: bool = False,
+    ) -> None:
+        self.stats = stats
+        self.z = z
+        self.stopped_early = stopped_early
+
+    @property
+    def games(self) -> int:
+        return self.stats.games
+
+    def win_interval(self, player: int, z: Optional[float] = None) -> Interval:
+        """
+        Confidence interval of a player's win rate.
+
+        Agresti-Coull interval: unlike the plain normal approximation it
+        does not collapse to a point for a win rate of 0 or 1 after a few
+        games, which would stop a tournament too early.
+
+        Args:
+            player: Seat of the player
+            z: Normal quantile, self.z by default
+        """
+        z = self.z if z is None else z
+        stats = self.stats.players[player]
+        games = stats.games + z**2
+        rate = (stats.wins + z**2 / 2) / games
+        margin = z * sqrt(rate * (1 - rate) / games)
+        return max(rate - margin, 0.0), min(rate + margin, 1.0)
+
+    def score_interval(self, player: int) -> Interval:
+        """Confidence interval of a player's mean score."""
+        stats = self.stats.players[player]
+        margin = self.z * stats.std / sqrt(max(stats.games, 1))
+        return stats.mean - margin, stats.mean + margin
+
+    def distribution(self, player: int) -> Dict[int, float]:
+        """
+        Returns:
+            Fraction of games per final score, by increasing score
+        """
+        stats = self.stats.players[player]
+        return {
+            score: count / stats.games
+            for score, count in sorted(stats.histogram.items())
+        }
+
+    def separated(self, z: Optional[float] = None) -> bool:
+        """
+        Args:
+            z: Normal quantile of the intervals, self.z by default
+
+        Returns:
+            True if the win rate intervals of all players are disjoint, i.e.
+            the ranking is significant
+        """
+        if len(self.stats.players) < 2:
+            return False
+        intervals = sorted(
+            self.win_interval(seat, z) for seat in range(len(self.stats.players))
+        )
+        return all(low > high for (_, high), (low, _) in zip(intervals, intervals[1:]))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            SimulationStats.summary of every player with the win rate and
+            mean score intervals added
+        """
+        summary: Dict[str, Dict[str, Any]] = self.stats.summary()
+        for seat, stats in enumerate(self.stats.players):
+            if stats.name in summary:
+                summary[stats.name]["win_interval"] = self.win_interval(seat)
+                summary[stats.name]["score_interval"] = self.score_interval(seat)
+        return summary
+
+
+def run_tournament(
+    players: Sequence[Player],
+    n_games: int,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    batch_games: int = BATCH_GAMES,
+    early_stop: bool = True,
+    z: float = CONFIDENCE_Z,
+) -> TournamentResult:
+    """
+    Plays many games between players in a pool of worker processes.
+
+    Games are split into batches with seeds from batch_seed. Every worker
+    receives the players once and returns only merged statistics per
+    batch, so throughput scales with the number of cores. Batches are
+    merged in order; with early_stop the tournament ends after the first
+    batch at which the win rate intervals separate. As the intervals are
+    checked after every batch, that check uses z Bonferroni-corrected for
+    the number of batches (see corrected_z); the reported intervals use z.
+    The result depends only on the seed, not on the number of workers.
+
+    Args:
+        players: Players, in turn order; they must be picklable for more
+            than one worker (OptimalBot tables are sent as their file)
+        n_games: Maximum number of games
+        workers: Number of processes (os.cpu_count() by default); with 1
+            worker the games are played in this process
+        seed: Tournament seed
+        batch_games: Games per batch
+        early_stop: Stop once the win rates are significantly different
+        z: Normal quantile of the confidence intervals of a single look
+
+    Returns:
+        Merged result
+
+    Raises:
+        ValueError: If there are no players, n_games is negative, or
+            batch_games or workers is not positive
+    """
+    if not players:
+        raise ValueError("Tournament needs at least one player!")
+    if n_games < 0:
+        raise ValueError("Number of games must not be negative!")
+    if batch_games <= 0:
+        raise ValueError("Batch size must be positive!")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError("Number of workers must be positive!")
+    tasks = [
+        (seed, batch, min(batch_games, n_games - start))
+        for batch, start in enumerate(range(0, n_games, batch_games))
+    ]
+    result = TournamentResult(SimulationStats([p.name for p in players]), z)
+    stop_z = corrected_z(z, len(tasks))
+
+    def add(stats: SimulationStats) -> bool:
+        result.stats.merge(stats)
+        result.stopped_early = (
+            early_stop and result.games < n_games and result.separated(stop_z)
+        )
+        return result.stopped_early
+
+    if workers == 1:
+        _init_worker(players)
+        for task in tasks:
+            if add(_play_batch(task)):
+                break
+        return result
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(players,)
+    ) as pool:
+        futures: List[Future] = [pool.submit(_play_batch, task) for task in tasks]
+        for future in futures:
+            if add(future.result()):
+                for pending in futures:
+                    pending.cancel()
+                break
+    return result
@@ -0,0 +1,522 @@
+from array import array
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore
+
+ROW_MAJOR = "C"
+COLUMN_MAJOR = "F"
+
+
+def _as_flat_view(buffer: Any) -> Any:
+    """
+    Makes a flat memoryview of doubles over a buffer-protocol object.
+
+    Raises:
+        ValueError: If the buffer is not contiguous or does not hold doubles
+    """
+    view: Any = memoryview(buffer)
+    if not view.contiguous:
+        raise ValueError("Buffer must be contiguous!")
+    if view.format != "d" or view.ndim != 1:
+        view = view.cast("B").cast("d")
+    return view
+
+
+class Vector:
+    """
+    Vector of floats stored in a flat buffer of doubles.
+
+    A vector may be a strided view into another vector or a matrix;
+    slicing and row/column access never copy data.
+    """
+
+    __slots__ = ("data", "_base")
+
+    def __init__(self, values: Iterable[float] = ()) -> None:
+        """
+        Create a vector owning a copy of the values.
+
+        Args:
+            values: Numbers of the vector
+        """
+        self._base: Any = array("d", values)
+        self.data: Any = memoryview(self._base)
+
+    @classmethod
+    def _wrap(cls, base: Any, data: Any) -> "Vector":
+        """Creates a vector view over data without copying it."""
+        vector = cls.__new__(cls)
+        vector._base = base
+        vector.data = data
+        return vector
+
+    @classmethod
+    def zeros(cls, length: int) -> "Vector":
+        """
+        Args:
+            length: Number of elements
+
+        Returns:
+            Vector of zeros
+        """
+        base = array("d", bytes(8 * length))
+        return cls._wrap(base, memoryview(base))
+
+    @classmethod
+    def from_buffer(cls, buffer: Any) -> "Vector":
+        """
+        Wraps a contiguous buffer of doubles (array('d'), bytearray...) without copying.
+
+        Args:
+            buffer: Object supporting the buffer protocol
+
+        Returns:
+            Vector sharing memory with the buffer
+        """
+        return cls._wrap(buffer, _as_flat_view(buffer))
+
+    @classmethod
+    def from_numpy(cls, values: Any) -> "Vector":
+        """
+        Wraps a one-dimensional float64 NumPy array, sharing memory if possible.
+
+        Args:
+            values: NumPy array
+
+        Returns:
+            Vector view of the array (or of its float64 copy)
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        values = numpy.asarray(values, dtype=float)
+        if values.ndim != 1:
+            raise ValueError("Vector needs a one-dimensional array!")
+        return cls._wrap(values, memoryview(values))
+
+    def to_numpy(self) -> Any:
+        """
+        Returns:
+            NumPy array sharing memory with the vector
+        """
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        return numpy.asarray(self.data)
+
+    def tolist(self) -> List[float]:
+        """
+        Returns:
+            Values as a list
+        """
+        return self.data.tolist()
+
+    def copy(self) -> "Vector":
+        """
+        Returns:
+            Contiguous copy of the vector
+        """
+        return Vector(self.data)
+
+    @property
+    def is_contiguous(self) -> bool:
+        """True if the elements are adjacent in memory."""
+        return self.data.contiguous
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.data)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return Vector._wrap(self._base, self.data[index])
+        return self.data[index]
+
+    def __setitem__(self, index: int, value: float) -> None:
+        self.data[index] = value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Vector):
+            return self.data == other.data
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"Vector({self.tolist()})"
+
+
+class Matrix:
+    """
+    Matrix of floats stored in a flat buffer of doubles.
+
+    Element (i, j) lives at data[offset + i * row_stride + j * col_stride],
+    so row-major and column-major layouts, submatrix slices and transposed
+    views all share one buffer without copying. Indexing with a single
+    integer returns a row view, which lets a Matrix be used wherever a
+    list of lists is expected.
+    """
+
+    __slots__ = ("data", "rows", "cols", "offset", "row_stride", "col_stride", "_base")
+
+    def __init__(
+        self,
+        values: Iterable[Iterable[float]] = (),
+        order: str = ROW_MAJOR,
+        check: bool = True,
+    ) -> None:
+        """
+        Create a matrix owning a copy of the values.
+
+        The shape is validated here once and stored, so operations on the
+        matrix never scan it again.
+
+        Args:
+            values: Rows of the matrix
+            order: Memory layout, "C" (row-major) or "F" (column-major)
+            check: Verify that all rows have the same length; pass False
+                only for values known to be rectangular
+
+        Raises:
+            ValueError: If rows have different lengths or order is unknown
+        """
+        rows = [list(row) for row in values]
+        cols = len(rows[0]) if rows else 0
+        if check and len(set(map(len, rows))) > 1:
+            raise ValueError("All rows must have the same length!")
+
+        base = array("d")
+        if order == ROW_MAJOR:
+            for row in rows:
+                base.extend(row)
+            strides = (cols, 1)
+        elif order == COLUMN_MAJOR:
+            for column in zip(*rows):
+                base.extend(column)
+            strides = (1, len(rows))
+        else:
+            raise ValueError(f"Unknown order: {order}!")
+        self._init_view(base, memoryview(base), len(rows), cols, 0, strides)
+
+    def _init_view(
+        self,
+        base: Any,
+        data: Any,
+        rows: int,
+        cols: int,
+        offset: int,
+        strides: Tuple[int, int],
+    ) -> None:
+        self._base: Any = base
+        self.data: Any = data
+        self.rows: int = rows
+        self.cols: int = cols
+        self.offset: int = offset
+        self.row_stride: int = strides[0]
+        self.col_stride: int = strides[1]
+
+    @classmethod
+    def _wrap(
+        cls,
+        base: Any,
+        data: Any,
+        rows: int,
+        cols: int,
+        offset: int = 0,
+        strides: Optional[Tuple[int, int]] = None,
+    ) -> "Matrix":
+        """Creates a matrix view over a flat buffer without copying it."""
+        matrix = cls.__new__(cls)
+        matrix._init_view(
+            base, data, rows, cols, offset, strides if strides else (cols, 1)
+        )
+        return matrix
+
+    @classmethod
+    def zeros(cls, rows: int, cols: int, order: str = ROW_MAJOR) -> "Matrix":
+        """
+        Args:
+            rows: Number of rows
+            cols: Number of columns
+            order: Memory layout, "C" or "F"
+
+        Returns:
+            Matrix of zeros
+        """
+        base = array("d", bytes(8 * rows * cols))
+        return cls.from_buffer(base, rows, cols, order)
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: Any, rows: int, cols: int, order: str = ROW_MAJOR
+    ) -> "Matrix":
+        """
+        Wraps a contiguous buffer of rows * cols doubles without copying.
+
+        Args:
+            buffer: Object supporting the buffer protocol
+            rows: Number of rows
+            cols: Number of columns
+            order: Layout of the buffer, "C" or "F"
+
+        Returns:
+            Matrix sharing memory with the buffer
+
+        Raises:
+            ValueError: If the buffer size does not match the shape
+        """
+        data = _as_flat_view(buffer)
+        if len(data) != rows * cols:
+            raise ValueError("Buffer size does not match the matrix shape!")
+        if order not in (ROW_MAJOR, COLUMN_MAJOR):
+            raise ValueError(f"Unknown order: {order}!")
+        strides = (cols, 1) if order == ROW_MAJOR else (1, rows)
+        return cls._wrap(buffer, data, rows, cols, 0, strides)
+
+    @classmethod
+    def from_numpy(cls, values: Any) -> "Matrix":
+        """
+        Wraps a two-dimensional NumPy array.
+
+        C- and Fortran-contiguous float64 arrays are shared without copying,
+        other arrays are copied first.
+
+        Args:
+            values: NumPy array
+
+        Returns:
+            Matrix view of the array
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        values = numpy.asarray(values, dtype=float)
+        if values.ndim != 2:
+            raise ValueError("Matrix needs a two-dimensional array!")
+        rows, cols = values.shape
+        if values.flags.c_contiguous:
+            order = ROW_MAJOR
+        elif values.flags.f_contiguous:
+            order = COLUMN_MAJOR
+        else:
+            values = numpy.ascontiguousarray(values)
+            order = ROW_MAJOR
+        flat = values.ravel(order="K")
+        return cls.from_buffer(flat, rows, cols, order)
+
+    def to_numpy(self) -> Any:
+        """
+        Returns:
+            NumPy array sharing memory with the matrix (strides included)
+        """
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        flat = numpy.frombuffer(self.data, dtype=float)
+        item = flat.itemsize
+        return numpy.lib.stride_tricks.as_strided(
+            flat[self.offset :],
+            shape=(self.rows, self.cols),
+            strides=(self.row_stride * item, self.col_stride * item),
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Number of rows and columns."""
+        return self.rows, self.cols
+
+    @property
+    def order(self) -> Optional[str]:
+        """
+        "C" for contiguous row-major, "F" for contiguous column-major,
+        None for other views.
+        """
+        if self.col_stride == 1 and self.row_stride == self.cols:
+            return ROW_MAJOR
+        if self.row_stride == 1 and self.col_stride == self.rows:
+            return COLUMN_MAJOR
+        return None
+
+    def flat_data(self) -> memoryview:
+        """
+        Returns the elements of a contiguous matrix in memory order.
+
+        Raises:
+            ValueError: If the matrix is a non-contiguous view
+        """
+        if self.order is None:
+            raise ValueError("Matrix is not contiguous!")
+        return self.data[self.offset : self.offset + self.rows * self.cols]
+
+    def row_data(self, i: int) -> memoryview:
+        """
+        Args:
+            i: Row index
+
+        Returns:
+            memoryview over the row (strided if needed, never copied)
+        """
+        start = self.offset + i * self.row_stride
+        if self.cols == 0:
+            return self.data[start:start]
+        return self.data[
+            start : start + (self.cols - 1) * self.col_stride + 1 : self.col_stride
+        ]
+
+    def column_data(self, j: int) -> memoryview:
+        """
+        Args:
+            j: Column index
+
+        Returns:
+            memoryview over the column (strided if needed, never copied)
+        """
+        start = self.offset + j * self.col_stride
+        if self.rows == 0:
+            return self.data[start:start]
+        return self.data[
+            start : start + (self.rows - 1) * self.row_stride + 1 : self.row_stride
+        ]
+
+    def row(self, i: int) -> Vector:
+        """
+        Args:
+            i: Row index
+
+        Returns:
+            Vector view of the row
+        """
+        return Vector._wrap(self._base, self.row_data(self._check_index(i, self.rows)))
+
+    def column(self, j: int) -> Vector:
+        """
+        Args:
+            j: Column index
+
+        Returns:
+            Vector view of the column
+        """
+        return Vector._wrap(
+            self._base, self.column_data(self._check_index(j, self.cols))
+        )
+
+    def transpose(self) -> "Matrix":
+        """
+        Returns:
+            Transposed view sharing memory with this matrix
+        """
+        return Matrix._wrap(
+            self._base,
+            self.data,
+            self.cols,
+            self.rows,
+            self.offset,
+            (self.col_stride, self.row_stride),
+        )
+
+    @property
+    def T(self) -> "Matrix":
+        """Transposed view, see transpose."""
+        return self.transpose()
+
+    def copy(self, order: str = ROW_MAJOR) -> "Matrix":
+        """
+        Args:
+            order: Layout of the copy, "C" or "F"
+
+        Returns:
+            Contiguous copy of the matrix
+        """
+        if order == ROW_MAJOR:
+            source = self
+        elif order == COLUMN_MAJOR:
+            source = self.transpose()
+        else:
+            raise ValueError(f"Unknown order: {order}!")
+        base = array("d")
+        for i in range(source.rows):
+            base.extend(source.row_data(i))
+        return Matrix.from_buffer(base, self.rows, self.cols, order)
+
+    def tolist(self) -> List[List[float]]:
+        """
+        Returns:
+            Matrix as a list of row lists
+        """
+        return [list(self.row_data(i)) for i in range(self.rows)]
+
+    @staticmethod
+    def _check_index(index: int, size: int) -> int:
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("Matrix index out of range!")
+        return index
+
+    @staticmethod
+    def _slice_range(index: slice, size: int) -> range:
+        positions = range(*index.indices(size))
+        if positions.step < 0:
+            raise ValueError("Negative slice steps are not supported!")
+        return positions
+
+    def _view(self, rows: range, cols: range) -> "Matrix":
+        return Matrix._wrap(
+            self._base,
+            self.data,
+            len(rows),
+            len(cols),
+            self.offset + rows.start * self.row_stride + cols.start * self.col_stride,
+            (self.row_stride * rows.step, self.col_stride * cols.step),
+        )
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __iter__(self) -> Iterator[Vector]:
+        for i in range(self.rows):
+            yield Vector._wrap(self._base, self.row_data(i))
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, tuple):
+            i, j = index
+            if isinstance(i, slice) and isinstance(j, slice):
+                return self._view(
+                    self._slice_range(i, self.rows), self._slice_range(j, self.cols)
+                )
+            if isinstance(i, slice):
+                return self.column(j)[i]
+            if isinstance(j, slice):
+                return self.row(i)[j]
+            i = self._check_index(i, self.rows)
+            j = self._check_index(j, self.cols)
+            return self.data[self.offset + i * self.row_stride + j * self.col_stride]
+        if isinstance(index, slice):
+            return self._view(self._slice_range(index, self.rows), range(self.cols))
+        return self.row(index)
+
+    def __setitem__(self, index: Tuple[int, int], value: float) -> None:
+        i = self._check_index(index[0], self.rows)
+        j = self._check_index(index[1], self.cols)
+        self.data[self.offset + i * self.row_stride + j * self.col_stride] = value
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Matrix):
+            return self.shape == other.shape and self.tolist() == other.tolist()
+        if isinstance(other, (list, tuple)):
+            return self.tolist() == [list(row) for row in other]
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.tolist()})"
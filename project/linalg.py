@@ -0,0 +1,383 @@
+from collections import OrderedDict
+from itertools import repeat
+from math import prod
+from operator import mul, sub
+from typing import Any, Hashable, List, Optional, Sequence, Tuple, Union
+
+from project.dense import Matrix, Vector
+from project.matrices import DenseLike, MatrixLike, _rows, _shape, matrix_multiply
+from project.sparse import COOMatrix, CSCMatrix, CSRMatrix, SparseMatrix
+
+LU_CACHE_SIZE = 16
+"""Number of factorizations kept by lu_factor."""
+
+_lu_cache: "OrderedDict[Hashable, LUFactorization]" = OrderedDict()
+
+ChainOrder = Union[int, Tuple[Any, Any]]
+"""Parenthesization: an operand index or a pair of parenthesizations."""
+
+
+def _dims(matrix: MatrixLike) -> Tuple[int, int]:
+    if isinstance(matrix, SparseMatrix):
+        return matrix.shape
+    return _shape(matrix)
+
+
+def _dense_rows(matrix: DenseLike) -> List[List[float]]:
+    """Copy of the rows of a dense matrix as a list of lists of floats."""
+    if isinstance(matrix, Matrix):
+        return matrix.tolist()
+    return [[float(value) for value in row] for row in _rows(matrix)]
+
+
+def _identity(size: int, like: MatrixLike) -> MatrixLike:
+    """Identity matrix of the type of like: sparse, Matrix or list of lists."""
+    if isinstance(like, (CSRMatrix, CSCMatrix, COOMatrix)):
+        return type(like).from_triplets(
+            (size, size), ((i, i, 1.0) for i in range(size))
+        )
+    rows = [[float(i == j) for j in range(size)] for i in range(size)]
+    return Matrix(rows) if isinstance(like, Matrix) else rows
+
+
+def _check_square(matrix: MatrixLike) -> int:
+    rows, cols = _dims(matrix)
+    if rows != cols:
+        raise ValueError("Matrix must be square!")
+    return rows
+
+
+def matrix_power(
+    matrix: MatrixLike, power: int, use_numpy: Optional[bool] = None
+) -> MatrixLike:
+    """
+    Raises a square matrix to an integer power by repeated squaring.
+
+    Takes O(log power) products instead of power - 1.
+
+    Args:
+        matrix: Square matrix (list of lists, TransposedView, Matrix or sparse)
+        power: Exponent; a negative power uses the inverse of the matrix
+        use_numpy: Passed to matrix_multiply
+
+    Returns:
+        matrix ** power (the identity for power 0, the matrix itself for
+        power 1), of the type matrix_multiply returns for the operand; the
+        identity has the type of the matrix, sparse ones included
+
+    Raises:
+        ValueError: If the matrix is not square, or is singular and
+            power is negative
+    """
+    size = _check_square(matrix)
+    if power < 0:
+        if isinstance(matrix, SparseMatrix):
+            matrix = matrix.to_dense()
+        matrix, power = inverse(matrix), -power
+    if power == 0:
+        return _identity(size, matrix)
+
+    square = matrix
+    while not power & 1:
+        square = matrix_multiply(square, square, use_numpy=use_numpy)
+        power >>= 1
+    result = square
+    power >>= 1
+    while power:
+        square = matrix_multiply(square, square, use_numpy=use_numpy)
+        if power & 1:
+            result = matrix_multiply(result, square, use_numpy=use_numpy)
+        power >>= 1
+    return result
+
+
+def matrix_chain_order(shapes: Sequence[Tuple[int, int]]) -> Tuple[int, ChainOrder]:
+    """
+    Finds the cheapest parenthesization of a matrix chain product.
+
+    Classic O(n^3) dynamic programming over sub-chains; the cost of a
+    product of (p x q) and (q x r) matrices is p * q * r multiplications.
+
+    Args:
+        shapes: Shapes of the matrices of the chain
+
+    Returns:
+        Number of scalar multiplications and the parenthesization, e.g.
+        (0, (1, 2)) for A0 (A1 A2)
+
+    Raises:
+        ValueError: If the chain is empty or adjacent shapes do not match
+    """
+    if not shapes:
+        raise ValueError("Matrix chain must not be empty!")
+    for (_, cols), (rows, _) in zip(shapes, shapes[1:]):
+        if cols != rows:
+            raise ValueError(
+                "Number of columns of the first matrix must equal number of rows of the second matrix!"
+            )
+    dims = [shapes[0][0]] + [cols for _, cols in shapes]
+    count = len(shapes)
+
+    cost = [[0] * count for _ in range(count)]
+    split = [[0] * count for _ in range(count)]
+    for length in range(1, count):
+        for first in range(count - length):
+            last = first + length
+            cost[first][last], split[first][last] = min(
+                (
+                    cost[first][k]
+                    + cost[k + 1][last]
+                    + dims[first] * dims[k + 1] * dims[last + 1],
+                    k,
+                )
+                for k in range(first, last)
+            )
+
+    def order(first: int, last: int) -> ChainOrder:
+        if first == last:
+            return first
+        k = split[first][last]
+        return order(first, k), order(k + 1, last)
+
+    return cost[0][count - 1], order(0, count - 1)
+
+
+def matrix_chain_multiply(
+    matrices: Sequence[MatrixLike], use_numpy: Optional[bool] = None
+) -> MatrixLike:
+    """
+    Multiplies a chain of matrices in the order with the fewest operations.
+
+    Args:
+        matrices: Matrices to multiply, left to right
+        use_numpy: Passed to matrix_multiply
+
+    Returns:
+        Product of the chain
+
+    Raises:
+        ValueError: If the chain is empty or matrices cannot be multiplied
+    """
+    _, order = matrix_chain_order([_dims(matrix) for matrix in matrices])
+
+    def multiply(node: ChainOrder) -> MatrixLike:
+        if isinstance(node, int):
+            return matrices[node]
+        left, right = node
+        return matrix_multiply(multiply(left), multiply(right), use_numpy=use_numpy)
+
+    return multiply(order)
+
+
+class LUFactorization:
+    """
+    LU decomposition with partial pivoting: P A = L U.
+
+    L (unit lower triangular) and U are stored together in one list of
+    lists. Factorizing costs O(n^3); every solve afterwards is O(n^2) per
+    right-hand side, so keep the factorization (or use lu_factor, which
+    caches it) when solving repeatedly with the same matrix.
+    """
+
+    def __init__(self, matrix: DenseLike) -> None:
+        """
+        Args:
+            matrix: Square matrix (list of lists, TransposedView or Matrix)
+
+        Raises:
+            ValueError: If the matrix is not square
+        """
+        self.size = _check_square(matrix)
+        self.lu = _dense_rows(matrix)
+        self.permutation = list(range(self.size))
+        self.sign = 1.0
+        self.singular = False
+
+        lu = self.lu
+        for k in range(self.size):
+            pivot = max(range(k, self.size), key=lambda i: abs(lu[i][k]))
+            if lu[pivot][k] == 0.0:
+                self.singular = True
+                continue
+            if pivot != k:
+                lu[k], lu[pivot] = lu[pivot], lu[k]
+                self.permutation[k], self.permutation[pivot] = (
+                    self.permutation[pivot],
+                    self.permutation[k],
+                )
+                self.sign = -self.sign
+            pivot_row = lu[k]
+            tail = pivot_row[k + 1 :]
+            for row in lu[k + 1 :]:
+                factor = row[k] / pivot_row[k]
+                row[k] = factor
+                if factor:
+                    row[k + 1 :] = map(
+                        sub, row[k + 1 :], map(mul, tail, repeat(factor))
+                    )
+
+    def determinant(self) -> float:
+        """
+        Returns:
+            Determinant of the matrix (0.0 if it is singular)
+        """
+        if self.singular:
+            return 0.0
+        return self.sign * prod(self.lu[i][i] for i in range(self.size))
+
+    def _solve_vector(self, values: Sequence[float]) -> List[float]:
+        lu = self.lu
+        solution: List[float] = []
+        for i in range(self.size):
+            solution.append(
+                values[self.permutation[i]] - sum(map(mul, lu[i][:i], solution), 0.0)
+            )
+        for i in reversed(range(self.size)):
+            row = lu[i]
+            solution[i] = (
+                solution[i] - sum(map(mul, row[i + 1 :], solution[i + 1 :]), 0.0)
+            ) / row[i]
+        return solution
+
+    def solve(
+        self, rhs: Union[List[float], Vector, DenseLike]
+    ) -> Union[List[float], DenseLike]:
+        """
+        Solves A x = rhs.
+
+        Args:
+            rhs: Right-hand side: a vector (list of numbers or Vector), or a
+                matrix (list of lists, TransposedView or Matrix) whose
+                columns are solved for at once
+
+        Returns:
+            Solution x: a list for a vector, a Matrix for a Matrix,
+            otherwise a list of lists
+
+        Raises:
+            ValueError: If the matrix is singular or rhs has a wrong size
+        """
+        if self.singular:
+            raise ValueError("Matrix is singular!")
+        if isinstance(rhs, Vector) or (
+            isinstance(rhs, list) and rhs and not isinstance(rhs[0], list)
+        ):
+            if len(rhs) != self.size:
+                raise ValueError("Right-hand side must have one value per row!")
+            return self._solve_vector(list(rhs))
+
+        rhs_matrix: Any = rhs
+        if _shape(rhs_matrix)[0] != self.size:
+            raise ValueError("Right-hand side must have one value per row!")
+        columns = [
+            self._solve_vector(column) for column in zip(*_dense_rows(rhs_matrix))
+        ]
+        solution = [list(row) for row in zip(*columns)]
+        return Matrix(solution) if isinstance(rhs, Matrix) else solution
+
+    def inverse(self) -> List[List[float]]:
+        """
+        Returns:
+            Inverse matrix as a list of lists
+
+        Raises:
+            ValueError: If the matrix is singular
+        """
+        if self.singular:
+            raise ValueError("Matrix is singular!")
+        columns = [
+            self._solve_vector([float(i == j) for i in range(self.size)])
+            for j in range(self.size)
+        ]
+        return [list(row) for row in zip(*columns)]
+
+
+def _cache_key(matrix: DenseLike) -> Hashable:
+    rows = matrix.tolist() if isinstance(matrix, Matrix) else _rows(matrix)
+    return tuple(map(tuple, rows))
+
+
+def lu_factor(matrix: DenseLike) -> LUFactorization:
+    """
+    LU factorization of a matrix, cached by contents.
+
+    The last LU_CACHE_SIZE factorizations are kept; looking one up costs
+    O(n^2) for hashing the matrix instead of O(n^3) for factorizing it
+    again, and modifying the matrix simply misses the cache.
+
+    Args:
+        matrix: Square matrix (list of lists, TransposedView or Matrix)
+
+    Returns:
+        Factorization of the matrix
+
+    Raises:
+        ValueError: If the matrix is not square
+    """
+    key = _cache_key(matrix)
+    factorization = _lu_cache.get(key)
+    if factorization is None:
+        factorization = LUFactorization(matrix)
+        _lu_cache[key] = factorization
+        if len(_lu_cache) > LU_CACHE_SIZE:
+            _lu_cache.popitem(last=False)
+    else:
+        _lu_cache.move_to_end(key)
+    return factorization
+
+
+def clear_lu_cache() -> None:
+    """Drops all factorizations cached by lu_factor."""
+    _lu_cache.clear()
+
+
+def solve(
+    matrix: DenseLike, rhs: Union[List[float], Vector, DenseLike]
+) -> Union[List[float], DenseLike]:
+    """
+    Solves the linear system matrix @ x = rhs.
+
+    Args:
+        matrix: Square matrix (list of lists, TransposedView or Matrix)
+        rhs: Vector or matrix right-hand side, see LUFactorization.solve
+
+    Returns:
+        Solution x
+
+    Raises:
+        ValueError: If the matrix is not square or is singular
+    """
+    return lu_factor(matrix).solve(rhs)
+
+
+def inverse(matrix: DenseLike) -> DenseLike:
+    """
+    Inverts a matrix.
+
+    Args:
+        matrix: Square matrix (list of lists, TransposedView or Matrix)
+
+    Returns:
+        Inverse matrix, a Matrix if matrix is a Matrix
+
+    Raises:
+        ValueError: If the matrix is not square or is singular
+    """
+    result = lu_factor(matrix).inverse()
+    return Matrix(result) if isinstance(matrix, Matrix) else result
+
+
+def determinant(matrix: DenseLike) -> float:
+    """
+    Calculates the determinant of a matrix.
+
+    Args:
+        matrix: Square matrix (list of lists, TransposedView or Matrix)
+
+    Returns:
+        Determinant
+
+    Raises:
+        ValueError: If the matrix is not square
+    """
+    return lu_factor(matrix).determinant()
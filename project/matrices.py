@@ -1,89 +1,532 @@
-from typing import List
+from array import array
+from itertools import repeat
+from operator import add, mul
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from project.dense import Matrix
+from project.sparse import SparseMatrix, sparse_add, sparse_multiply
+
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore
+
+BLOCK_SIZE = 64
+"""Number of result columns computed per tile in the pure Python kernel."""
+
+NUMPY_THRESHOLD = 32**3
+"""Minimal rows * inner * cols product for which NumPy is used if installed."""
+
+
+class TransposedView:
+    """
+    Lazy transpose of a list of lists; nothing is copied on creation.
+
+    Element (i, j) is base[j][i]. matrix_multiply and matrix_add recognize
+    the view and read the base matrix in the order that suits them, e.g. the
+    rows of the base are exactly the columns a product needs. Where rows of
+    the view are needed (a left operand of a product, mixing with a Matrix)
+    the base is copied once. Use materialize() to get an ordinary list of
+    lists.
+    """
+
+    def __init__(self, base: List[List[float]]) -> None:
+        """
+        Args:
+            base: Matrix to transpose (list of lists)
+
+        Raises:
+            ValueError: If rows of base have different lengths
+        """
+        _shape(base)
+        self.base: List[List[float]] = base
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Number of rows and columns of the transposed matrix."""
+        return (len(self.base[0]) if self.base else 0), len(self.base)
+
+    def materialize(self) -> List[List[float]]:
+        """
+        Returns:
+            Transposed matrix as a new list of lists
+        """
+        return [list(column) for column in zip(*self.base)]
+
+    def transpose(self) -> List[List[float]]:
+        """
+        Returns:
+            The base matrix (transposing twice copies nothing)
+        """
+        return self.base
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __iter__(self) -> Iterator[Tuple[float, ...]]:
+        return zip(*self.base)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, tuple):
+            i, j = index
+            return self.base[j][i]
+        return [row[index] for row in self.base]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TransposedView):
+            return self.base == other.base
+        if isinstance(other, list):
+            return self.materialize() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"TransposedView({self.base!r})"
+
+
+DenseLike = Union[List[List[float]], Matrix, TransposedView]
+MatrixLike = Union[DenseLike, SparseMatrix]
+Output = Union[List[List[float]], Matrix]
+
+
+def _as_matrix(matrix: DenseLike) -> Matrix:
+    """
+    Returns a Matrix as is and copies other matrices into a new Matrix.
+
+    A TransposedView copies its base into a Matrix and returns the strided
+    transpose of that copy, so no transposition pass is made.
+    """
+    if isinstance(matrix, Matrix):
+        return matrix
+    if isinstance(matrix, TransposedView):
+        return Matrix(matrix.base).transpose()
+    return Matrix(matrix)
+
+
+def _shape(matrix: DenseLike, check: bool = True) -> Tuple[int, int]:
+    """
+    Number of rows and columns.
+
+    A Matrix knows its shape; a list of lists is scanned for ragged rows
+    unless check is False, then only the first row is looked at.
+
+    Raises:
+        ValueError: If rows of a list of lists have different lengths
+    """
+    if isinstance(matrix, Matrix):
+        return matrix.shape
+    if isinstance(matrix, TransposedView):
+        if check:
+            _shape(matrix.base)
+        return matrix.shape
+    cols = len(matrix[0]) if matrix else 0
+    if check and len(set(map(len, matrix))) > 1:
+        raise ValueError("All rows must have the same length!")
+    return len(matrix), cols
+
+
+def _rows(
+    matrix: Union[List[List[float]], TransposedView]
+) -> Sequence[Sequence[float]]:
+    """Rows of a matrix; a transposed view is copied into rows by one zip pass."""
+    if isinstance(matrix, TransposedView):
+        return list(zip(*matrix.base))
+    return matrix
+
+
+def _columns(
+    matrix: Union[List[List[float]], TransposedView]
+) -> Sequence[Sequence[float]]:
+    """Columns of a matrix; free for a transposed view."""
+    if isinstance(matrix, TransposedView):
+        return matrix.base
+    return list(zip(*matrix))
+
+
+def _to_numpy(matrix: Union[List[List[float]], TransposedView]) -> Any:
+    """NumPy array of a list of lists or transposed view."""
+    if isinstance(matrix, TransposedView):
+        return numpy.asarray(matrix.base, dtype=float).T
+    return numpy.asarray(matrix, dtype=float)
+
+
+def _row_views(matrix: DenseLike) -> Sequence[Sequence[float]]:
+    """Rows of any dense matrix; rows of a Matrix are memoryview slices."""
+    if isinstance(matrix, Matrix):
+        return [matrix.row_data(i) for i in range(matrix.rows)]
+    return _rows(matrix)
+
+
+def _assign(target: Any, values: Iterable[float]) -> None:
+    """Overwrites a row of a list of lists or a memoryview of a Matrix in place."""
+    if isinstance(target, list):
+        target[:] = values
+    else:
+        target[:] = array("d", values)
+
+
+def _check_out(out: Output, shape: Tuple[int, int]) -> Sequence[Any]:
+    """
+    Rows of an output matrix, after checking its shape.
+
+    Raises:
+        ValueError: If out has a different shape
+    """
+    if isinstance(out, Matrix):
+        if out.shape != shape:
+            raise ValueError("Output matrix must have the shape of the result!")
+        return _row_views(out)
+    if len(out) != shape[0] or any(len(row) != shape[1] for row in out):
+        raise ValueError("Output matrix must have the shape of the result!")
+    return out
+
+
+def _add_dense(matrix1: Matrix, matrix2: Matrix) -> Matrix:
+    """
+    Adds two Matrix objects with a flat pass over their buffers.
+
+    Raises:
+        ValueError: If matrices have different dimensions
+    """
+    if matrix1.shape != matrix2.shape:
+        raise ValueError("Matrices must have the same dimensions!")
+    rows, cols = matrix1.shape
+
+    order = matrix1.order
+    if order is not None and order == matrix2.order:
+        base = array("d", map(add, matrix1.flat_data(), matrix2.flat_data()))
+        return Matrix.from_buffer(base, rows, cols, order)
+
+    base = array("d")
+    for i in range(rows):
+        base.extend(map(add, matrix1.row_data(i), matrix2.row_data(i)))
+    return Matrix.from_buffer(base, rows, cols)
 
 
 def matrix_add(
-    matrix1: List[List[float]], matrix2: List[List[float]]
-) -> List[List[float]]:
+    matrix1: MatrixLike,
+    matrix2: MatrixLike,
+    out: Optional[Output] = None,
+    check: bool = True,
+) -> MatrixLike:
     """
     Adds two matrices.
 
     Args:
-        matrix1: First matrix (list of lists)
-        matrix2: Second matrix (list of lists)
+        matrix1: First matrix (list of lists, TransposedView, Matrix or sparse)
+        matrix2: Second matrix (list of lists, TransposedView, Matrix or sparse)
+        out: List of lists or Matrix to write the sum into instead of
+            allocating a new one; it may be one of the operands (see
+            matrix_add_) but not a TransposedView of one
+        check: Scan lists of lists for ragged rows; pass False to skip the
+            scan for inputs known to be rectangular (a Matrix never needs it)
+
+    Returns:
+        Sum of matrices: out if given, a CSRMatrix if both operands are
+        sparse, a Matrix if any operand is a Matrix, otherwise a list of lists
+
+    Raises:
+        ValueError: If matrices have different dimensions or ragged rows
+        TypeError: If out is given for sparse operands
+    """
+    if isinstance(matrix1, SparseMatrix) or isinstance(matrix2, SparseMatrix):
+        if out is not None:
+            raise TypeError("Sparse matrices cannot be added into out!")
+        return sparse_add(matrix1, matrix2)
+    if out is not None:
+        return _add_into(matrix1, matrix2, out, check)
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        return _add_dense(_as_matrix(matrix1), _as_matrix(matrix2))
+
+    if _shape(matrix1, check) != _shape(matrix2, check):
+        raise ValueError("Matrices must have the same dimensions!")
+
+    if isinstance(matrix1, TransposedView) and isinstance(matrix2, TransposedView):
+        # Add the bases row by row, then transpose the result once
+        return matrix_transpose(matrix_add(matrix1.base, matrix2.base))
+
+    return [
+        list(map(add, row1, row2)) for row1, row2 in zip(_rows(matrix1), _rows(matrix2))
+    ]
+
+
+def _add_into(
+    matrix1: DenseLike, matrix2: DenseLike, out: Output, check: bool = True
+) -> Output:
+    """Writes matrix1 + matrix2 into out row by row, see matrix_add."""
+    shape = _shape(matrix1, check)
+    if shape != _shape(matrix2, check):
+        raise ValueError("Matrices must have the same dimensions!")
+    out_rows = _check_out(out, shape)
+    if (
+        isinstance(out, Matrix)
+        and isinstance(matrix1, Matrix)
+        and isinstance(matrix2, Matrix)
+        and out.order is not None
+        and out.order == matrix1.order == matrix2.order
+    ):
+        out.flat_data()[:] = array(
+            "d", map(add, matrix1.flat_data(), matrix2.flat_data())
+        )
+        return out
+    for target, row1, row2 in zip(out_rows, _row_views(matrix1), _row_views(matrix2)):
+        _assign(target, map(add, row1, row2))
+    return out
+
+
+def matrix_add_(matrix: Output, other: DenseLike) -> Output:
+    """
+    Adds other to matrix in place.
+
+    Args:
+        matrix: Matrix to update (list of lists or Matrix)
+        other: Matrix to add (list of lists, TransposedView or Matrix)
 
     Returns:
-        Sum of matrices
+        matrix
 
     Raises:
         ValueError: If matrices have different dimensions
     """
-    rows1, cols1 = len(matrix1), len(matrix1[0])
-    rows2, cols2 = len(matrix2), len(matrix2[0])
+    return _add_into(matrix, other, matrix)
 
-    if rows1 != rows2 or cols1 != cols2:
+
+def matrix_axpy(alpha: float, matrix_x: DenseLike, matrix_y: Output) -> Output:
+    """
+    Computes matrix_y += alpha * matrix_x in place (BLAS axpy).
+
+    Args:
+        alpha: Scale factor
+        matrix_x: Matrix to scale and add (list of lists, TransposedView or Matrix)
+        matrix_y: Matrix to update (list of lists or Matrix)
+
+    Returns:
+        matrix_y
+
+    Raises:
+        ValueError: If matrices have different dimensions
+    """
+    shape = _shape(matrix_y)
+    if _shape(matrix_x) != shape:
         raise ValueError("Matrices must have the same dimensions!")
+    for target, row in zip(_check_out(matrix_y, shape), _row_views(matrix_x)):
+        _assign(target, map(add, target, map(mul, row, repeat(alpha))))
+    return matrix_y
+
+
+def _multiply_blocked(
+    matrix1: Sequence[Sequence[float]],
+    columns: Sequence[Sequence[float]],
+    block_size: int = BLOCK_SIZE,
+    out: Optional[Sequence[Any]] = None,
+) -> Any:
+    """
+    Pure Python multiplication kernel.
+
+    The right operand is given by its columns, so every result element is
+    a dot product of two rows computed by sum(map(mul, ...)) in C. Result
+    columns are processed in tiles, so the same block of columns is reused
+    for all rows while it is still hot in cache.
+
+    Args:
+        matrix1: First matrix
+        columns: Columns of the second matrix (its transpose)
+        block_size: Number of columns per tile
+        out: Rows to write the product into (lists or memoryviews)
 
-    result = []
-    for i in range(rows1):
-        row = []
-        for j in range(cols1):
-            row.append(matrix1[i][j] + matrix2[i][j])
-        result.append(row)
+    Returns:
+        Product of matrices (out if given)
+    """
+    cols = len(columns)
+    result = out if out is not None else [[0.0] * cols for _ in matrix1]
+    for start in range(0, cols, block_size):
+        tile = columns[start : start + block_size]
+        for row, target in zip(matrix1, result):
+            values = [sum(map(mul, row, column), 0.0) for column in tile]
+            if isinstance(target, list):
+                target[start : start + len(tile)] = values
+            else:
+                target[start : start + len(tile)] = array("d", values)
     return result
 
 
+def _multiply_dense(
+    matrix1: Matrix, matrix2: Matrix, use_numpy: Optional[bool]
+) -> Matrix:
+    """
+    Multiplies two Matrix objects.
+
+    Rows and columns are taken as memoryview slices of the buffers; the
+    right operand is copied to column-major layout first unless it already
+    is column-major, so the inner loop reads adjacent doubles.
+
+    Raises:
+        ValueError: If matrices cannot be multiplied
+    """
+    if matrix1.cols != matrix2.rows:
+        raise ValueError(
+            "Number of columns of the first matrix must equal number of rows of the second matrix!"
+        )
+    if use_numpy is None:
+        use_numpy = _use_numpy(matrix1, matrix1.rows, matrix1.cols, matrix2.cols)
+    if use_numpy:
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        return Matrix.from_numpy(matrix1.to_numpy() @ matrix2.to_numpy())
+
+    columns = matrix2.transpose()
+    if columns.order != "C":
+        columns = columns.copy()
+    rows = [matrix1.row_data(i) for i in range(matrix1.rows)]
+    product = _multiply_blocked(
+        rows, [columns.row_data(j) for j in range(columns.rows)]
+    )
+    base = array("d")
+    for row in product:
+        base.extend(row)
+    return Matrix.from_buffer(base, matrix1.rows, matrix2.cols)
+
+
+def _use_numpy(matrix1: DenseLike, rows: int, inner: int, cols: int) -> bool:
+    """Decides if a product is large enough and numeric for the NumPy backend."""
+    return (
+        numpy is not None
+        and rows * inner * cols >= NUMPY_THRESHOLD
+        and (isinstance(matrix1, Matrix) or type(matrix1[0][0]) in (float, int))
+    )
+
+
 def matrix_multiply(
-    matrix1: List[List[float]], matrix2: List[List[float]]
-) -> List[List[float]]:
+    matrix1: MatrixLike,
+    matrix2: MatrixLike,
+    use_numpy: Optional[bool] = None,
+    out: Optional[Output] = None,
+    check: bool = True,
+) -> MatrixLike:
     """
     Multiplies two matrices.
 
+    A TransposedView as the right operand is the cheapest case: its base
+    rows are the columns the product needs, so no transposition is done.
+
     Args:
-        matrix1: First matrix (list of lists)
-        matrix2: Second matrix (list of lists)
+        matrix1: First matrix (list of lists, TransposedView, Matrix or sparse)
+        matrix2: Second matrix (list of lists, TransposedView, Matrix or sparse)
+        use_numpy: Force (True) or forbid (False) the NumPy backend;
+            by default NumPy is used for large float matrices if installed
+        out: List of lists or Matrix to write the product into instead of
+            allocating a new one; it must not be one of the operands
+        check: Scan lists of lists for ragged rows; pass False to skip the
+            scan for inputs known to be rectangular (a Matrix never needs it)
 
     Returns:
-        Product of matrices
+        Product of matrices: out if given, a CSRMatrix if both operands are
+        sparse, a Matrix if any operand is a Matrix, otherwise a list of lists
 
     Raises:
-        ValueError: If matrices cannot be multiplied
+        ValueError: If matrices cannot be multiplied, have ragged rows
+            or out is an operand
+        TypeError: If out is given for sparse operands
     """
-    rows1, cols1 = len(matrix1), len(matrix1[0])
-    rows2, cols2 = len(matrix2), len(matrix2[0])
+    if isinstance(matrix1, SparseMatrix) or isinstance(matrix2, SparseMatrix):
+        if out is not None:
+            raise TypeError("Sparse matrices cannot be multiplied into out!")
+        return sparse_multiply(matrix1, matrix2)
+    if out is not None:
+        return _multiply_into(matrix1, matrix2, use_numpy, out, check)
+    if isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix):
+        return _multiply_dense(_as_matrix(matrix1), _as_matrix(matrix2), use_numpy)
+
+    rows1, cols1 = _shape(matrix1, check)
+    rows2, cols2 = _shape(matrix2, check)
 
     if cols1 != rows2:
         raise ValueError(
             "Number of columns of the first matrix must equal number of rows of the second matrix!"
         )
 
-    result = []
-    for i in range(rows1):
-        row = []
-        for j in range(cols2):
-            sum_val = 0.0
-            for k in range(cols1):
-                sum_val += matrix1[i][k] * matrix2[k][j]
-            row.append(sum_val)
-        result.append(row)
-    return result
+    if use_numpy is None:
+        use_numpy = _use_numpy(matrix1, rows1, cols1, cols2)
+    if use_numpy:
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        return (_to_numpy(matrix1) @ _to_numpy(matrix2)).tolist()
 
+    return _multiply_blocked(_rows(matrix1), _columns(matrix2))
 
-def matrix_transpose(matrix: List[List[float]]) -> List[List[float]]:
+
+def _multiply_into(
+    matrix1: DenseLike,
+    matrix2: DenseLike,
+    use_numpy: Optional[bool],
+    out: Output,
+    check: bool = True,
+) -> Output:
+    """Writes matrix1 @ matrix2 into out, see matrix_multiply."""
+    (rows, inner), (inner2, cols) = _shape(matrix1, check), _shape(matrix2, check)
+    if inner != inner2:
+        raise ValueError(
+            "Number of columns of the first matrix must equal number of rows of the second matrix!"
+        )
+    if _shares_rows(out, matrix1) or _shares_rows(out, matrix2):
+        raise ValueError("Output matrix must not be an operand of the product!")
+    out_rows = _check_out(out, (rows, cols))
+
+    if use_numpy is None:
+        use_numpy = _use_numpy(matrix1, rows, inner, cols)
+    if use_numpy:
+        if numpy is None:
+            raise ImportError("NumPy is not installed!")
+        left, right = _as_numpy(matrix1), _as_numpy(matrix2)
+        if isinstance(out, Matrix):
+            numpy.matmul(left, right, out=out.to_numpy())
+        else:
+            for target, row in zip(out, (left @ right).tolist()):
+                target[:] = row
+        return out
+
+    if isinstance(matrix2, Matrix):
+        # Strided column views instead of a column-major copy: no allocation
+        columns = [matrix2.column_data(j) for j in range(cols)]
+        _multiply_blocked(_row_views(matrix1), columns, out=out_rows)
+    else:
+        _multiply_blocked(_row_views(matrix1), _columns(matrix2), out=out_rows)
+    return out
+
+
+def _shares_rows(out: Output, matrix: DenseLike) -> bool:
+    """Checks if out is matrix itself, its base or shares its buffer."""
+    if isinstance(matrix, TransposedView):
+        matrix = matrix.base
+    if isinstance(out, Matrix) and isinstance(matrix, Matrix):
+        return out._base is matrix._base
+    return out is matrix
+
+
+def _as_numpy(matrix: DenseLike) -> Any:
+    return matrix.to_numpy() if isinstance(matrix, Matrix) else _to_numpy(matrix)
+
+
+def matrix_transpose(matrix: MatrixLike, lazy: bool = False) -> MatrixLike:
     """
     Transposes a matrix.
 
     Args:
-        matrix: Input matrix (list of lists)
+        matrix: Input matrix (list of lists, TransposedView, Matrix or sparse)
+        lazy: Return a TransposedView of a list of lists instead of a copy
 
     Returns:
-        Transposed matrix
-    """
-    rows, cols = len(matrix), len(matrix[0])
+        Transposed matrix; for a Matrix, a view sharing its memory,
+        for a TransposedView, its base matrix, for a sparse matrix, a sparse
+        matrix sharing its arrays
 
-    result = []
-    for j in range(cols):
-        row = []
-        for i in range(rows):
-            row.append(matrix[i][j])
-        result.append(row)
-    return result
+    Raises:
+        ValueError: If rows of a list of lists have different lengths
+    """
+    if isinstance(matrix, (Matrix, TransposedView, SparseMatrix)):
+        return matrix.transpose()
+    if lazy:
+        return TransposedView(matrix)
+    _shape(matrix)
+    return [list(column) for column in zip(*matrix)]
@@ -0,0 +1,326 @@
+from abc import ABC, abstractmethod
+from collections import Counter
+from itertools import repeat
+from operator import add, mul
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from project.dense import Matrix
+from project.matrices import DenseLike, TransposedView, _shape
+
+Rows = Sequence[Sequence[float]]
+RowSource = Callable[[int], Sequence[float]]
+
+
+class Expression(ABC):
+    """
+    Lazy matrix expression; nothing is computed until evaluate().
+
+    Expressions are built from lazy(matrix) leaves with `+`, `-`, `@`,
+    multiplication by a number and `.T`. Evaluation fuses element-wise steps
+    into the pass that writes the result: for lazy(A) @ lazy(B) + lazy(C).T
+    every result row is computed from a row of A, the columns of B (gathered
+    once, as matrix_multiply does) and a column of C read in place, and
+    written once, without an intermediate product or a copy of C.T.
+    Subexpressions that appear more than once are computed once.
+    """
+
+    shape: Tuple[int, int]
+
+    @property
+    @abstractmethod
+    def key(self) -> Hashable:
+        """Structural key: equal keys mean equal subexpressions."""
+
+    @property
+    def T(self) -> "Expression":
+        return self.transpose()
+
+    @abstractmethod
+    def transpose(self) -> "Expression":
+        """
+        Returns:
+            Lazy transpose of the expression
+        """
+
+    def children(self) -> Tuple["Expression", ...]:
+        return ()
+
+    def leaves(self) -> Iterator["Leaf"]:
+        for child in self.children():
+            yield from child.leaves()
+
+    def evaluate(
+        self, out: Optional[List[List[float]]] = None
+    ) -> Union[List[List[float]], Matrix]:
+        """
+        Computes the expression.
+
+        Args:
+            out: List of lists of the result shape to write the result into;
+                it must not be an operand of the expression
+
+        Returns:
+            Result as out or a new list of lists, or a Matrix if any operand
+            is a Matrix and out is not given
+
+        Raises:
+            ValueError: If out has a wrong shape
+        """
+        if out is not None and (
+            len(out) != self.shape[0] or any(len(row) != self.shape[1] for row in out)
+        ):
+            raise ValueError("Output buffer must have the shape of the result!")
+        counts: Counter = Counter()
+        _count(self, counts)
+        result = _Evaluator(counts).evaluate(self, out)
+        if out is None and any(
+            isinstance(leaf.matrix, Matrix) for leaf in self.leaves()
+        ):
+            return Matrix(result) if result else Matrix.zeros(*self.shape)
+        return result
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.evaluate())
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __add__(self, other: Any) -> "Expression":
+        other = _as_expression(other)
+        if self.shape != other.shape:
+            raise ValueError("Matrices must have the same dimensions!")
+        return Sum(_terms(self) + _terms(other))
+
+    def __radd__(self, other: Any) -> "Expression":
+        return _as_expression(other) + self
+
+    def __sub__(self, other: Any) -> "Expression":
+        return self + (-1.0) * _as_expression(other)
+
+    def __rsub__(self, other: Any) -> "Expression":
+        return _as_expression(other) - self
+
+    def __neg__(self) -> "Expression":
+        return (-1.0) * self
+
+    def __mul__(self, factor: float) -> "Expression":
+        if not isinstance(factor, (int, float)):
+            return NotImplemented
+        return Sum(tuple((coef * factor, term) for coef, term in _terms(self)))
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, other: Any) -> "Expression":
+        other = _as_expression(other)
+        if self.shape[1] != other.shape[0]:
+            raise ValueError(
+                "Number of columns of the first matrix must equal number of rows of the second matrix!"
+            )
+        return Product(self, other)
+
+    def __rmatmul__(self, other: Any) -> "Expression":
+        return _as_expression(other) @ self
+
+
+class Leaf(Expression):
+    """Operand of an expression, possibly transposed (never copied)."""
+
+    def __init__(
+        self, matrix: Union[List[List[float]], Matrix], transposed: bool
+    ) -> None:
+        self.matrix = matrix
+        self.transposed = transposed
+        rows, cols = _shape(matrix)
+        self.shape = (cols, rows) if transposed else (rows, cols)
+
+    @property
+    def key(self) -> Hashable:
+        return ("leaf", id(self.matrix), self.transposed)
+
+    def transpose(self) -> Expression:
+        return Leaf(self.matrix, not self.transposed)
+
+    def leaves(self) -> Iterator["Leaf"]:
+        yield self
+
+    def __repr__(self) -> str:
+        return (
+            f"lazy(<{self.shape[0]}x{self.shape[1]}>{'.T' if self.transposed else ''})"
+        )
+
+
+class Sum(Expression):
+    """Linear combination of terms: sum of coefficient * term."""
+
+    def __init__(self, terms: Tuple[Tuple[float, Expression], ...]) -> None:
+        self.terms = terms
+        self.shape = terms[0][1].shape
+
+    @property
+    def key(self) -> Hashable:
+        return ("sum", tuple((coef, term.key) for coef, term in self.terms))
+
+    def transpose(self) -> Expression:
+        return Sum(tuple((coef, term.transpose()) for coef, term in self.terms))
+
+    def children(self) -> Tuple[Expression, ...]:
+        return tuple(term for _, term in self.terms)
+
+    def __repr__(self) -> str:
+        return " + ".join(
+            f"{coef} * {term!r}" if coef != 1.0 else repr(term)
+            for coef, term in self.terms
+        )
+
+
+class Product(Expression):
+    """Matrix product of two expressions."""
+
+    def __init__(self, left: Expression, right: Expression) -> None:
+        self.left = left
+        self.right = right
+        self.shape = (left.shape[0], right.shape[1])
+
+    @property
+    def key(self) -> Hashable:
+        return ("product", self.left.key, self.right.key)
+
+    def transpose(self) -> Expression:
+        # (AB)^T = B^T A^T, so transposes only ever end up on leaves
+        return Product(self.right.transpose(), self.left.transpose())
+
+    def children(self) -> Tuple[Expression, ...]:
+        return self.left, self.right
+
+    def __repr__(self) -> str:
+        return f"({self.left!r} @ {self.right!r})"
+
+
+def lazy(matrix: Union[DenseLike, Expression]) -> Expression:
+    """
+    Starts a lazy expression.
+
+    Args:
+        matrix: Operand (list of lists, TransposedView or Matrix); it is
+            read only when the expression is evaluated
+
+    Returns:
+        Expression leaf
+    """
+    if isinstance(matrix, Expression):
+        return matrix
+    if isinstance(matrix, TransposedView):
+        return Leaf(matrix.base, True)
+    return Leaf(matrix, False)
+
+
+def _as_expression(value: Any) -> Expression:
+    if isinstance(value, (list, Matrix, TransposedView, Expression)):
+        return lazy(value)
+    raise TypeError(f"Cannot use {type(value).__name__} in a matrix expression")
+
+
+def _terms(expression: Expression) -> Tuple[Tuple[float, Expression], ...]:
+    if isinstance(expression, Sum):
+        return expression.terms
+    return ((1.0, expression),)
+
+
+def _count(expression: Expression, counts: Counter) -> None:
+    """Counts occurrences of every subexpression, visiting repeats once."""
+    counts[expression.key] += 1
+    if counts[expression.key] == 1:
+        for child in expression.children():
+            _count(child, counts)
+
+
+class _Evaluator:
+    """One evaluation: caches subexpressions that occur more than once."""
+
+    def __init__(self, counts: Counter) -> None:
+        self.counts = counts
+        self.cache: Dict[Hashable, Rows] = {}
+
+    def evaluate(
+        self, expression: Expression, out: Optional[List[List[float]]]
+    ) -> List[List[float]]:
+        rows, cols = expression.shape
+        terms = _terms(expression)
+        sources = [
+            (coef, self.source(term, term is expression)) for coef, term in terms
+        ]
+        result = out if out is not None else [[0.0] * cols for _ in range(rows)]
+        for i, row in enumerate(result):
+            # The output row is the only buffer; every term is accumulated
+            # into it in place
+            first_coef, first = sources[0]
+            if first_coef == 1.0:
+                row[:] = first(i)
+            else:
+                row[:] = map(mul, first(i), repeat(first_coef))
+            for coef, source in sources[1:]:
+                if coef == 1.0:
+                    row[:] = map(add, row, source(i))
+                else:
+                    row[:] = map(add, row, map(mul, source(i), repeat(coef)))
+        return result
+
+    def rows(self, expression: Expression) -> Rows:
+        """Materialized rows of a subexpression (cached if repeated)."""
+        key = expression.key
+        if key in self.cache:
+            return self.cache[key]
+        if isinstance(expression, Leaf):
+            rows = _leaf_rows(expression)
+        else:
+            rows = self.evaluate(expression, None)
+        if self.counts[key] > 1:
+            self.cache[key] = rows
+        return rows
+
+    def source(self, expression: Expression, fuse: bool = False) -> RowSource:
+        """
+        Function returning row i of a subexpression.
+
+        A product is fused into the output pass unless it is repeated
+        elsewhere (then it is materialized once and cached), or fuse is set
+        because this pass is the one materializing it.
+        """
+        if isinstance(expression, Product) and (
+            fuse or self.counts[expression.key] == 1
+        ):
+            # Fused: rows of the product are computed while writing the output
+            left = self.rows(expression.left)
+            columns = self.rows(expression.right.transpose())
+            return lambda i: [sum(map(mul, left[i], column), 0.0) for column in columns]
+        if (
+            isinstance(expression, Leaf)
+            and expression.transposed
+            and not isinstance(expression.matrix, Matrix)
+        ):
+            # Row i of a transposed list of lists is column i, read when needed
+            matrix = expression.matrix
+            return lambda i: [row[i] for row in matrix]
+        return self.rows(expression).__getitem__
+
+
+def _leaf_rows(leaf: Leaf) -> Rows:
+    matrix = leaf.matrix
+    if isinstance(matrix, Matrix):
+        if leaf.transposed:
+            matrix = matrix.transpose()
+        return [matrix.row_data(i) for i in range(matrix.rows)]
+    if leaf.transposed:
+        return list(zip(*matrix))
+    return matrix
@@ -0,0 +1,186 @@
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.util import Finalize
+from operator import mul
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from project.dense import Matrix
+from project.matrices import DenseLike, MatrixLike, _as_matrix, matrix_multiply
+
+_DOUBLE = 8
+
+_worker_state: Dict[str, Any] = {}
+"""Shared memory blocks attached by a worker process, see _attach."""
+
+
+def _doubles(block: SharedMemory) -> Any:
+    """Returns a memoryview of doubles over a shared memory block."""
+    buffer = block.buf
+    assert buffer is not None, "Shared memory block is closed"
+    return buffer.cast("d")
+
+
+def _attach(names: Tuple[str, str, str], shape: Tuple[int, int, int]) -> None:
+    """
+    Process pool initializer: attaches to the operand and result blocks once.
+
+    Args:
+        names: Shared memory names of the left operand, the transposed
+            right operand and the result
+        shape: rows, inner and cols of the product
+    """
+    _worker_state["blocks"] = [SharedMemory(name=name) for name in names]
+    _worker_state["shape"] = shape
+    # Run when the worker process exits, after its last tile
+    Finalize(None, _detach, exitpriority=10)
+
+
+def _detach() -> None:
+    """Closes the worker's handles of the shared memory blocks."""
+    for block in _worker_state.pop("blocks", ()):
+        block.close()
+
+
+def _compute_tile(tile: Tuple[int, int, int, int]) -> None:
+    """
+    Computes one tile of the product and writes it into the result block.
+
+    Args:
+        tile: First and past-the-last row, first and past-the-last column
+    """
+    row_start, row_end, col_start, col_end = tile
+    _, inner, cols = _worker_state["shape"]
+    left, right, result = (_doubles(block) for block in _worker_state["blocks"])
+    try:
+        columns = [
+            right[j * inner : (j + 1) * inner] for j in range(col_start, col_end)
+        ]
+        for i in range(row_start, row_end):
+            row = left[i * inner : (i + 1) * inner]
+            result[i * cols + col_start : i * cols + col_end] = array(
+                "d", [sum(map(mul, row, column), 0.0) for column in columns]
+            )
+            row.release()
+        for column in columns:
+            column.release()
+    finally:
+        left.release()
+        right.release()
+        result.release()
+
+
+def _split(size: int, parts: int) -> List[Tuple[int, int]]:
+    """Splits range(size) into at most parts contiguous nearly equal ranges."""
+    parts = max(1, min(parts, size))
+    step, extra = divmod(size, parts)
+    bounds = []
+    start = 0
+    for part in range(parts):
+        end = start + step + (1 if part < extra else 0)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _tiles(rows: int, cols: int, workers: int) -> List[Tuple[int, int, int, int]]:
+    """
+    Partitions the result into row blocks, and also into column blocks when
+    there are too few rows to keep every worker busy.
+    """
+    row_parts = min(rows, 4 * workers)
+    col_parts = 1 if row_parts >= 2 * workers else -(-2 * workers // row_parts)
+    return [
+        (row_start, row_end, col_start, col_end)
+        for row_start, row_end in _split(rows, row_parts)
+        for col_start, col_end in _split(cols, col_parts)
+    ]
+
+
+def _fill(block: SharedMemory, rows: Sequence[Sequence[float]], width: int) -> None:
+    """Copies rows of doubles into a shared memory block, row after row."""
+    view = _doubles(block)
+    try:
+        for i, row in enumerate(rows):
+            view[i * width : (i + 1) * width] = array("d", row)
+    finally:
+        view.release()
+
+
+def parallel_matrix_multiply(
+    matrix1: DenseLike,
+    matrix2: DenseLike,
+    workers: Optional[int] = None,
+) -> MatrixLike:
+    """
+    Multiplies two matrices in a pool of worker processes.
+
+    Operands are placed in multiprocessing.shared_memory once (the right one
+    transposed, so columns are contiguous) instead of being pickled to every
+    worker. Workers compute tiles of the result and write them directly into
+    a shared result block. Process start-up costs tens of milliseconds, so
+    this only pays off for large matrices (see
+    scripts/benchmark_parallel_matrices.py for the crossover size).
+
+    Args:
+        matrix1: First matrix (list of lists or Matrix)
+        matrix2: Second matrix (list of lists or Matrix)
+        workers: Number of processes (os.cpu_count() by default);
+            with 1 worker the product is computed by matrix_multiply
+
+    Returns:
+        Product of matrices, a Matrix if any operand is a Matrix
+
+    Raises:
+        ValueError: If matrices cannot be multiplied or workers is not positive
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError("Number of workers must be positive!")
+    if workers == 1:
+        return matrix_multiply(matrix1, matrix2, use_numpy=False)
+
+    dense = isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix)
+    left, right = _as_matrix(matrix1), _as_matrix(matrix2)
+    if left.cols != right.rows:
+        raise ValueError(
+            "Number of columns of the first matrix must equal number of rows of the second matrix!"
+        )
+    rows, inner, cols = left.rows, left.cols, right.cols
+    if rows == 0 or cols == 0:
+        return Matrix.zeros(rows, cols) if dense else [[] for _ in range(rows)]
+
+    blocks = [
+        SharedMemory(create=True, size=max(size, 1) * _DOUBLE)
+        for size in (rows * inner, cols * inner, rows * cols)
+    ]
+    try:
+        _fill(blocks[0], [left.row_data(i) for i in range(rows)], inner)
+        right_t = right.transpose()
+        _fill(blocks[1], [right_t.row_data(j) for j in range(cols)], inner)
+
+        names = (blocks[0].name, blocks[1].name, blocks[2].name)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_attach,
+            initargs=(names, (rows, inner, cols)),
+        ) as pool:
+            list(pool.map(_compute_tile, _tiles(rows, cols, workers)))
+
+        # The block is unlinked below, so the product is copied out once:
+        # into the buffer of the Matrix, or straight into the row lists
+        product = _doubles(blocks[2])
+        try:
+            if dense:
+                result = array("d")
+                result.frombytes(product[: rows * cols].cast("B"))
+                return Matrix.from_buffer(result, rows, cols)
+            return [product[i * cols : (i + 1) * cols].tolist() for i in range(rows)]
+        finally:
+            product.release()
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
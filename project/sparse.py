@@ -0,0 +1,570 @@
+from abc import ABC, abstractmethod
+from array import array
+from itertools import repeat
+from operator import add, mul
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from project.dense import Matrix
+
+INDEX_TYPE = "i"
+"""Type code of index arrays (32-bit integers)."""
+
+Triplet = Tuple[int, int, float]
+
+
+def _dense_rows(matrix: Any) -> List[Sequence[float]]:
+    """Rows of a dense matrix: list of lists, Matrix or any iterable of rows."""
+    if isinstance(matrix, Matrix):
+        return [matrix.row_data(i) for i in range(matrix.rows)]
+    return list(matrix)
+
+
+def _dense_shape(rows: List[Sequence[float]]) -> Tuple[int, int]:
+    return len(rows), (len(rows[0]) if rows else 0)
+
+
+def _compress(
+    size: int, minor_size: int, entries: Iterable[Tuple[int, int, float]]
+) -> Tuple[array, array, array]:
+    """
+    Builds compressed (CSR/CSC) arrays from (major, minor, value) entries.
+
+    Duplicate entries are summed, zeros are dropped and minor indices
+    are sorted inside every major line.
+
+    Raises:
+        IndexError: If an index is outside range(size) or range(minor_size)
+    """
+    lines: List[Dict[int, float]] = [{} for _ in range(size)]
+    for major, minor, value in entries:
+        if not (0 <= major < size and 0 <= minor < minor_size):
+            raise IndexError("Sparse matrix index out of range!")
+        line = lines[major]
+        line[minor] = line.get(minor, 0.0) + value
+    return _pack(lines)
+
+
+def _pack(lines: List[Dict[int, float]]) -> Tuple[array, array, array]:
+    """Packs per-line {minor index: value} dicts into compressed arrays."""
+    indptr = array(INDEX_TYPE, [0])
+    indices = array(INDEX_TYPE)
+    data = array("d")
+    for line in lines:
+        for minor in sorted(line):
+            value = line[minor]
+            if value != 0.0:
+                indices.append(minor)
+                data.append(value)
+        indptr.append(len(indices))
+    return indptr, indices, data
+
+
+class SparseMatrix(ABC):
+    """
+    Base class of sparse matrices.
+
+    Only non-zero elements are stored, so memory and the cost of
+    add/multiply/transpose are proportional to the number of non-zeros.
+    """
+
+    def __init__(self, shape: Tuple[int, int]) -> None:
+        """
+        Args:
+            shape: Number of rows and columns
+        """
+        self.shape: Tuple[int, int] = shape
+
+    @property
+    @abstractmethod
+    def nnz(self) -> int:
+        """Number of stored elements."""
+
+    @abstractmethod
+    def to_csr(self) -> "CSRMatrix":
+        """
+        Returns:
+            The same matrix in CSR format
+        """
+
+    @abstractmethod
+    def transpose(self) -> "SparseMatrix":
+        """
+        Returns:
+            Transposed matrix
+        """
+
+    @abstractmethod
+    def _arrays(self) -> Tuple[array, ...]:
+        """Arrays holding the matrix, used for memory accounting."""
+
+    @property
+    def density(self) -> float:
+        """Fraction of stored elements among all rows * cols elements."""
+        rows, cols = self.shape
+        return self.nnz / (rows * cols) if rows and cols else 0.0
+
+    def memory_usage(self) -> int:
+        """
+        Returns:
+            Bytes used by index and value arrays
+        """
+        return sum(part.itemsize * len(part) for part in self._arrays())
+
+    def dense_memory_usage(self) -> int:
+        """
+        Returns:
+            Bytes a flat dense buffer of doubles with the same shape would use
+        """
+        return self.shape[0] * self.shape[1] * 8
+
+    def to_dense(self) -> List[List[float]]:
+        """
+        Returns:
+            Matrix as a list of lists
+        """
+        csr = self.to_csr()
+        result = []
+        for i in range(csr.shape[0]):
+            row = [0.0] * csr.shape[1]
+            for j, value in csr.row(i):
+                row[j] = value
+            result.append(row)
+        return result
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, SparseMatrix):
+            mine, theirs = self.to_csr(), other.to_csr()
+            return (
+                mine.shape == theirs.shape
+                and mine.indptr == theirs.indptr
+                and mine.indices == theirs.indices
+                and mine.data == theirs.data
+            )
+        if isinstance(other, list):
+            return self.to_dense() == other
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(shape={self.shape}, nnz={self.nnz})"
+
+
+class CSRMatrix(SparseMatrix):
+    """
+    Compressed sparse row matrix.
+
+    Column indices and values of row i are indices[indptr[i]:indptr[i + 1]]
+    and data[indptr[i]:indptr[i + 1]].
+    """
+
+    def __init__(
+        self, shape: Tuple[int, int], indptr: array, indices: array, data: array
+    ) -> None:
+        """
+        Args:
+            shape: Number of rows and columns
+            indptr: Row start offsets (rows + 1 items)
+            indices: Column index of every stored element
+            data: Value of every stored element
+
+        Raises:
+            ValueError: If array sizes do not match the shape
+        """
+        super().__init__(shape)
+        if len(indptr) != shape[0] + 1 or len(indices) != len(data):
+            raise ValueError("Invalid CSR arrays!")
+        self.indptr: array = indptr
+        self.indices: array = indices
+        self.data: array = data
+
+    @classmethod
+    def from_dense(cls, matrix: Any) -> "CSRMatrix":
+        """
+        Args:
+            matrix: Dense matrix (list of lists or Matrix)
+
+        Returns:
+            CSR matrix with the non-zero elements
+        """
+        rows = _dense_rows(matrix)
+        indptr = array(INDEX_TYPE, [0])
+        indices = array(INDEX_TYPE)
+        data = array("d")
+        for row in rows:
+            for j, value in enumerate(row):
+                if value != 0:
+                    indices.append(j)
+                    data.append(value)
+            indptr.append(len(indices))
+        return cls(_dense_shape(rows), indptr, indices, data)
+
+    @classmethod
+    def from_triplets(
+        cls, shape: Tuple[int, int], triplets: Iterable[Triplet]
+    ) -> "CSRMatrix":
+        """
+        Args:
+            shape: Number of rows and columns
+            triplets: (row, column, value) entries; duplicates are summed
+
+        Returns:
+            CSR matrix
+
+        Raises:
+            IndexError: If coordinates are outside the matrix
+        """
+        return cls(shape, *_compress(shape[0], shape[1], triplets))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def row(self, i: int) -> Iterable[Tuple[int, float]]:
+        """
+        Args:
+            i: Row index
+
+        Returns:
+            (column, value) pairs of the stored elements of the row
+        """
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return zip(self.indices[start:end], self.data[start:end])
+
+    def to_csr(self) -> "CSRMatrix":
+        return self
+
+    def to_csc(self) -> "CSCMatrix":
+        """
+        Returns:
+            The same matrix in CSC format
+        """
+        return self.transpose().to_csr().transpose()
+
+    def to_coo(self) -> "COOMatrix":
+        """
+        Returns:
+            The same matrix in COO format
+        """
+        rows = array(INDEX_TYPE)
+        for i in range(self.shape[0]):
+            rows.extend(repeat(i, self.indptr[i + 1] - self.indptr[i]))
+        return COOMatrix(self.shape, rows, array(INDEX_TYPE, self.indices), self.data)
+
+    def transpose(self) -> "CSCMatrix":
+        """
+        Returns:
+            Transposed matrix; the CSR arrays of a matrix are the CSC arrays
+            of its transpose, so nothing is copied
+        """
+        rows, cols = self.shape
+        return CSCMatrix((cols, rows), self.indptr, self.indices, self.data)
+
+    def _arrays(self) -> Tuple[array, ...]:
+        return self.indptr, self.indices, self.data
+
+
+class CSCMatrix(SparseMatrix):
+    """
+    Compressed sparse column matrix.
+
+    Row indices and values of column j are indices[indptr[j]:indptr[j + 1]]
+    and data[indptr[j]:indptr[j + 1]].
+    """
+
+    def __init__(
+        self, shape: Tuple[int, int], indptr: array, indices: array, data: array
+    ) -> None:
+        """
+        Args:
+            shape: Number of rows and columns
+            indptr: Column start offsets (cols + 1 items)
+            indices: Row index of every stored element
+            data: Value of every stored element
+
+        Raises:
+            ValueError: If array sizes do not match the shape
+        """
+        super().__init__(shape)
+        if len(indptr) != shape[1] + 1 or len(indices) != len(data):
+            raise ValueError("Invalid CSC arrays!")
+        self.indptr: array = indptr
+        self.indices: array = indices
+        self.data: array = data
+
+    @classmethod
+    def from_dense(cls, matrix: Any) -> "CSCMatrix":
+        """
+        Args:
+            matrix: Dense matrix (list of lists or Matrix)
+
+        Returns:
+            CSC matrix with the non-zero elements
+        """
+        return CSRMatrix.from_dense(matrix).to_csc()
+
+    @classmethod
+    def from_triplets(
+        cls, shape: Tuple[int, int], triplets: Iterable[Triplet]
+    ) -> "CSCMatrix":
+        """
+        Args:
+            shape: Number of rows and columns
+            triplets: (row, column, value) entries; duplicates are summed
+
+        Returns:
+            CSC matrix
+
+        Raises:
+            IndexError: If coordinates are outside the matrix
+        """
+        entries = ((j, i, value) for i, j, value in triplets)
+        return cls(shape, *_compress(shape[1], shape[0], entries))
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def to_csr(self) -> CSRMatrix:
+        """
+        Returns:
+            The same matrix in CSR format (a counting pass over the elements)
+        """
+        rows, cols = self.shape
+        counts = [0] * (rows + 1)
+        for i in self.indices:
+            counts[i + 1] += 1
+        for i in range(rows):
+            counts[i + 1] += counts[i]
+        indptr = array(INDEX_TYPE, counts)
+        positions = counts[:-1]
+        indices = array(
+            INDEX_TYPE, bytes(len(self.indices) * array(INDEX_TYPE).itemsize)
+        )
+        data = array("d", bytes(8 * len(self.data)))
+        for j in range(cols):
+            for k in range(self.indptr[j], self.indptr[j + 1]):
+                i = self.indices[k]
+                indices[positions[i]] = j
+                data[positions[i]] = self.data[k]
+                positions[i] += 1
+        return CSRMatrix(self.shape, indptr, indices, data)
+
+    def transpose(self) -> CSRMatrix:
+        """
+        Returns:
+            Transposed matrix sharing the arrays of this one
+        """
+        rows, cols = self.shape
+        return CSRMatrix((cols, rows), self.indptr, self.indices, self.data)
+
+    def _arrays(self) -> Tuple[array, ...]:
+        return self.indptr, self.indices, self.data
+
+
+class COOMatrix(SparseMatrix):
+    """
+    Coordinate format: parallel arrays of row indices, column indices and values.
+
+    Convenient for building a matrix element by element; convert to CSR for
+    arithmetic. Duplicate coordinates are summed on conversion.
+    """
+
+    def __init__(
+        self, shape: Tuple[int, int], rows: array, cols: array, data: array
+    ) -> None:
+        """
+        Args:
+            shape: Number of rows and columns
+            rows: Row index of every element
+            cols: Column index of every element
+            data: Value of every element
+
+        Raises:
+            ValueError: If array sizes differ
+        """
+        super().__init__(shape)
+        if not len(rows) == len(cols) == len(data):
+            raise ValueError("Invalid COO arrays!")
+        self.rows: array = rows
+        self.cols: array = cols
+        self.data: array = data
+
+    @classmethod
+    def from_triplets(
+        cls, shape: Tuple[int, int], triplets: Iterable[Triplet]
+    ) -> "COOMatrix":
+        """
+        Args:
+            shape: Number of rows and columns
+            triplets: (row, column, value) entries
+
+        Returns:
+            COO matrix
+        """
+        matrix = cls(shape, array(INDEX_TYPE), array(INDEX_TYPE), array("d"))
+        for i, j, value in triplets:
+            matrix.append(i, j, value)
+        return matrix
+
+    @classmethod
+    def from_dense(cls, matrix: Any) -> "COOMatrix":
+        """
+        Args:
+            matrix: Dense matrix (list of lists or Matrix)
+
+        Returns:
+            COO matrix with the non-zero elements
+        """
+        return CSRMatrix.from_dense(matrix).to_coo()
+
+    def append(self, i: int, j: int, value: float) -> None:
+        """
+        Adds an element; values at repeated coordinates are summed.
+
+        Raises:
+            IndexError: If the coordinates are outside the matrix
+        """
+        if not (0 <= i < self.shape[0] and 0 <= j < self.shape[1]):
+            raise IndexError("Sparse matrix index out of range!")
+        self.rows.append(i)
+        self.cols.append(j)
+        self.data.append(value)
+
+    @property
+    def nnz(self) -> int:
+        return len(self.data)
+
+    def to_csr(self) -> CSRMatrix:
+        return CSRMatrix(
+            self.shape,
+            *_compress(*self.shape, zip(self.rows, self.cols, self.data)),
+        )
+
+    def transpose(self) -> "COOMatrix":
+        """
+        Returns:
+            Transposed matrix sharing the arrays of this one
+        """
+        rows, cols = self.shape
+        return COOMatrix((cols, rows), self.cols, self.rows, self.data)
+
+    def _arrays(self) -> Tuple[array, ...]:
+        return self.rows, self.cols, self.data
+
+
+def _add_csr(matrix1: CSRMatrix, matrix2: CSRMatrix) -> CSRMatrix:
+    lines = []
+    for i in range(matrix1.shape[0]):
+        line = dict(matrix1.row(i))
+        for j, value in matrix2.row(i):
+            line[j] = line.get(j, 0.0) + value
+        lines.append(line)
+    return CSRMatrix(matrix1.shape, *_pack(lines))
+
+
+def _multiply_csr(matrix1: CSRMatrix, matrix2: CSRMatrix) -> CSRMatrix:
+    """Row-by-row (Gustavson) product; work is proportional to the multiplications."""
+    lines = []
+    for i in range(matrix1.shape[0]):
+        line: Dict[int, float] = {}
+        for k, left in matrix1.row(i):
+            for j, right in matrix2.row(k):
+                line[j] = line.get(j, 0.0) + left * right
+        lines.append(line)
+    return CSRMatrix((matrix1.shape[0], matrix2.shape[1]), *_pack(lines))
+
+
+def _multiply_csr_dense(
+    matrix1: CSRMatrix, rows: Sequence[Sequence[float]], cols: int
+) -> List[List[float]]:
+    """Sparse times dense: row i gets dense row k scaled by every stored a[i][k]."""
+    result = []
+    for i in range(matrix1.shape[0]):
+        out: Sequence[float] = [0.0] * cols
+        for k, value in matrix1.row(i):
+            out = list(map(add, out, map(mul, repeat(value), rows[k])))
+        result.append(list(out))
+    return result
+
+
+def _wrap_like(result: List[List[float]], operand: Any) -> Any:
+    """Returns a Matrix if the dense operand was a Matrix, otherwise the lists."""
+    return Matrix(result) if isinstance(operand, Matrix) else result
+
+
+def sparse_add(matrix1: Any, matrix2: Any) -> Any:
+    """
+    Adds two matrices where at least one is sparse.
+
+    Args:
+        matrix1: First matrix (sparse or dense)
+        matrix2: Second matrix (sparse or dense)
+
+    Returns:
+        CSRMatrix if both are sparse; otherwise a dense result of the
+        dense operand's type, computed by scattering the non-zeros into a copy
+
+    Raises:
+        ValueError: If matrices have different dimensions
+    """
+    if isinstance(matrix1, SparseMatrix) and isinstance(matrix2, SparseMatrix):
+        if matrix1.shape != matrix2.shape:
+            raise ValueError("Matrices must have the same dimensions!")
+        return _add_csr(matrix1.to_csr(), matrix2.to_csr())
+
+    sparse, dense = (
+        (matrix1, matrix2) if isinstance(matrix1, SparseMatrix) else (matrix2, matrix1)
+    )
+    rows = _dense_rows(dense)
+    if sparse.shape != _dense_shape(rows):
+        raise ValueError("Matrices must have the same dimensions!")
+    result = [list(row) for row in rows]
+    csr = sparse.to_csr()
+    for i, out in enumerate(result):
+        for j, value in csr.row(i):
+            out[j] += value
+    return _wrap_like(result, dense)
+
+
+def sparse_multiply(matrix1: Any, matrix2: Any) -> Any:
+    """
+    Multiplies two matrices where at least one is sparse.
+
+    Args:
+        matrix1: First matrix (sparse or dense)
+        matrix2: Second matrix (sparse or dense)
+
+    Returns:
+        CSRMatrix if both are sparse, otherwise a dense result of the
+        dense operand's type
+
+    Raises:
+        ValueError: If matrices cannot be multiplied
+    """
+    shape1 = (
+        matrix1.shape
+        if isinstance(matrix1, SparseMatrix)
+        else _dense_shape(_dense_rows(matrix1))
+    )
+    shape2 = (
+        matrix2.shape
+        if isinstance(matrix2, SparseMatrix)
+        else _dense_shape(_dense_rows(matrix2))
+    )
+    if shape1[1] != shape2[0]:
+        raise ValueError(
+            "Number of columns of the first matrix must equal number of rows of the second matrix!"
+        )
+
+    if isinstance(matrix1, SparseMatrix) and isinstance(matrix2, SparseMatrix):
+        return _multiply_csr(matrix1.to_csr(), matrix2.to_csr())
+    if isinstance(matrix1, SparseMatrix):
+        result = _multiply_csr_dense(matrix1.to_csr(), _dense_rows(matrix2), shape2[1])
+        return _wrap_like(result, matrix2)
+
+    # dense @ sparse = (sparse^T @ dense^T)^T, so the sparse kernel is reused
+    columns = [list(column) for column in zip(*_dense_rows(matrix1))]
+    transposed = _multiply_csr_dense(matrix2.transpose().to_csr(), columns, shape1[0])
+    result = [list(row) for row in zip(*transposed)] or [[] for _ in range(shape1[0])]
+    return _wrap_like(result, matrix1)
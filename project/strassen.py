@@ -0,0 +1,236 @@
+import time
+from operator import add, sub
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from project.dense import Matrix
+from project.matrices import DenseLike, _multiply_blocked, _rows, _shape
+
+Rows = List[List[float]]
+
+STRASSEN = "strassen"
+WINOGRAD = "winograd"
+VARIANTS = (STRASSEN, WINOGRAD)
+
+DEFAULT_CUTOFF = 64
+"""Cutoff used when tuning is disabled with tune=False."""
+
+TUNING_SIZES = (16, 32, 64, 128)
+"""Sizes tried by tune_cutoff; larger sizes make tuning noticeably slow."""
+
+_tuned_cutoff: Optional[int] = None
+"""Cutoff measured on this machine by tune_cutoff, see get_cutoff."""
+
+
+def _add(matrix1: Rows, matrix2: Rows) -> Rows:
+    return [list(map(add, row1, row2)) for row1, row2 in zip(matrix1, matrix2)]
+
+
+def _sub(matrix1: Rows, matrix2: Rows) -> Rows:
+    return [list(map(sub, row1, row2)) for row1, row2 in zip(matrix1, matrix2)]
+
+
+def _pad(matrix: Rows, rows: int, cols: int) -> Rows:
+    """Pads a matrix with zero rows and columns up to rows x cols."""
+    extra = cols - (len(matrix[0]) if matrix else 0)
+    padded = [row + [0.0] * extra for row in matrix] if extra else list(matrix)
+    padded.extend([0.0] * cols for _ in range(rows - len(padded)))
+    return padded
+
+
+def _quadrants(matrix: Rows, rows: int, cols: int) -> Tuple[Rows, Rows, Rows, Rows]:
+    """Splits a matrix at row and column `rows`, `cols`."""
+    top, bottom = matrix[:rows], matrix[rows:]
+    return (
+        [row[:cols] for row in top],
+        [row[cols:] for row in top],
+        [row[:cols] for row in bottom],
+        [row[cols:] for row in bottom],
+    )
+
+
+def _join(c11: Rows, c12: Rows, c21: Rows, c22: Rows) -> Rows:
+    return [left + right for left, right in zip(c11, c12)] + [
+        left + right for left, right in zip(c21, c22)
+    ]
+
+
+def _classic(matrix1: Rows, matrix2: Rows) -> Rows:
+    """Blocked classic kernel used below the cutoff."""
+    return _multiply_blocked(matrix1, list(zip(*matrix2)))
+
+
+def _recurse(matrix1: Rows, matrix2: Rows, cutoff: int, winograd: bool) -> Rows:
+    """
+    One level of divide and conquer.
+
+    Odd dimensions are padded with a zero row or column to make the halves
+    equal; the padding is cut off the result again. Rectangular operands
+    are fine as long as every dimension is above the cutoff.
+    """
+    rows, inner, cols = len(matrix1), len(matrix2), len(matrix2[0])
+    if min(rows, inner, cols) <= cutoff:
+        return _classic(matrix1, matrix2)
+
+    half_rows, half_inner, half_cols = -(-rows // 2), -(-inner // 2), -(-cols // 2)
+    a11, a12, a21, a22 = _quadrants(
+        _pad(matrix1, 2 * half_rows, 2 * half_inner), half_rows, half_inner
+    )
+    b11, b12, b21, b22 = _quadrants(
+        _pad(matrix2, 2 * half_inner, 2 * half_cols), half_inner, half_cols
+    )
+
+    def product(left: Rows, right: Rows) -> Rows:
+        return _recurse(left, right, cutoff, winograd)
+
+    if winograd:
+        # Winograd form: 7 products and 15 additions instead of 18
+        s1 = _add(a21, a22)
+        s2 = _sub(s1, a11)
+        s3 = _sub(a11, a21)
+        s4 = _sub(a12, s2)
+        t1 = _sub(b12, b11)
+        t2 = _sub(b22, t1)
+        t3 = _sub(b22, b12)
+        t4 = _sub(t2, b21)
+        m1 = product(a11, b11)
+        m2 = product(a12, b21)
+        m3 = product(s4, b22)
+        m4 = product(a22, t4)
+        m5 = product(s1, t1)
+        m6 = product(s2, t2)
+        m7 = product(s3, t3)
+        u2 = _add(m1, m6)
+        u3 = _add(u2, m7)
+        u4 = _add(u2, m5)
+        c11 = _add(m1, m2)
+        c12 = _add(u4, m3)
+        c21 = _sub(u3, m4)
+        c22 = _add(u3, m5)
+    else:
+        m1 = product(_add(a11, a22), _add(b11, b22))
+        m2 = product(_add(a21, a22), b11)
+        m3 = product(a11, _sub(b12, b22))
+        m4 = product(a22, _sub(b21, b11))
+        m5 = product(_add(a11, a12), b22)
+        m6 = product(_sub(a21, a11), _add(b11, b12))
+        m7 = product(_sub(a12, a22), _add(b21, b22))
+        c11 = _add(_sub(_add(m1, m4), m5), m7)
+        c12 = _add(m3, m5)
+        c21 = _add(m2, m4)
+        c22 = _add(_add(_sub(m1, m2), m3), m6)
+
+    result = _join(c11, c12, c21, c22)
+    if len(result) != rows or len(result[0]) != cols:
+        result = [row[:cols] for row in result[:rows]]
+    return result
+
+
+def _best_time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def tune_cutoff(
+    sizes: Sequence[int] = TUNING_SIZES, repeat: int = 3, winograd: bool = False
+) -> int:
+    """
+    Measures the cutoff below which the classic kernel is faster.
+
+    For every size n, one level of recursion (seven classic n/2 products)
+    is timed against a classic n x n product. The cutoff is the last size
+    at which the classic kernel still wins; if it wins at every size, the
+    largest size is returned.
+
+    Args:
+        sizes: Increasing square sizes to try
+        repeat: Runs per measurement, the best time is taken
+        winograd: Tune for the Winograd variant
+
+    Returns:
+        Cutoff for strassen_multiply; also remembered for get_cutoff
+    """
+    global _tuned_cutoff
+
+    cutoff = sizes[0]
+    for size in sizes:
+        matrix = [[float((i * size + j) % 7) for j in range(size)] for i in range(size)]
+        classic = _best_time(lambda: _classic(matrix, matrix), repeat)
+        recursive = _best_time(
+            lambda: _recurse(matrix, matrix, size // 2, winograd), repeat
+        )
+        if recursive < classic:
+            break
+        cutoff = size
+    _tuned_cutoff = cutoff
+    return cutoff
+
+
+def get_cutoff(tune: bool = True) -> int:
+    """
+    Returns:
+        The cutoff tuned on this machine (running tune_cutoff on the first
+        call, which takes about a second) or DEFAULT_CUTOFF if tune is False
+        and no cutoff was tuned yet
+    """
+    if _tuned_cutoff is None:
+        return tune_cutoff() if tune else DEFAULT_CUTOFF
+    return _tuned_cutoff
+
+
+def strassen_multiply(
+    matrix1: DenseLike,
+    matrix2: DenseLike,
+    cutoff: Optional[int] = None,
+    variant: str = STRASSEN,
+) -> DenseLike:
+    """
+    Multiplies two matrices with Strassen's recursive algorithm.
+
+    Each level replaces 8 products of half-size blocks by 7 at the cost of
+    extra block additions, so it only pays off for large matrices. Blocks
+    whose smallest dimension is at most `cutoff` are multiplied by the
+    classic blocked kernel of matrix_multiply. Rounding error grows slightly
+    faster than for the classic product (by a small factor per level).
+
+    Args:
+        matrix1: First matrix (list of lists, TransposedView or Matrix)
+        matrix2: Second matrix (list of lists, TransposedView or Matrix)
+        cutoff: Size at which recursion stops; by default it is tuned on
+            this machine once per process, see get_cutoff
+        variant: STRASSEN or WINOGRAD (fewer block additions)
+
+    Returns:
+        Product of matrices, a Matrix if any operand is a Matrix
+
+    Raises:
+        ValueError: If matrices cannot be multiplied or variant is unknown
+    """
+    if variant not in VARIANTS:
+        raise ValueError(f"Unknown variant {variant!r}, expected one of {VARIANTS}")
+    dense = isinstance(matrix1, Matrix) or isinstance(matrix2, Matrix)
+    rows1 = matrix1.tolist() if isinstance(matrix1, Matrix) else _rows(matrix1)
+    rows2 = matrix2.tolist() if isinstance(matrix2, Matrix) else _rows(matrix2)
+
+    (rows, inner), (inner2, cols) = _shape(matrix1), _shape(matrix2)
+    if inner != inner2:
+        raise ValueError(
+            "Number of columns of the first matrix must equal number of rows of the second matrix!"
+        )
+    if rows == 0 or cols == 0 or inner == 0:
+        if dense:
+            return Matrix.zeros(rows, cols)
+        return [[0.0] * cols for _ in range(rows)]
+
+    if cutoff is None:
+        cutoff = get_cutoff()
+    result = _recurse(
+        [list(row) for row in rows1],
+        [list(row) for row in rows2],
+        max(cutoff, 1),
+        variant == WINOGRAD,
+    )
+    return Matrix(result) if dense else result
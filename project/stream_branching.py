@@ -0,0 +1,515 @@
+import threading
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from project.stream_processing import close_stream
+
+BLOCK = "block"
+"""Producer waits until the consumer frees space (threaded stages only)."""
+DROP_OLDEST = "drop_oldest"
+"""The oldest buffered item is discarded to make room."""
+DROP_NEWEST = "drop_newest"
+"""The incoming item is discarded."""
+ERROR = "error"
+"""BufferError is raised when a buffer overflows."""
+
+POLICIES = (BLOCK, DROP_OLDEST, DROP_NEWEST, ERROR)
+DEFAULT_BUFFER_SIZE = 1024
+
+
+class RingBuffer:
+    """
+    Bounded thread-safe FIFO buffer connecting a producer to a consumer.
+
+    What happens when the buffer is full is defined by the overflow policy.
+    Iterating the buffer yields items until it is closed and drained.
+    """
+
+    def __init__(self, capacity: int, policy: str = BLOCK) -> None:
+        """
+        Args:
+            capacity: Maximum number of buffered items
+            policy: Overflow policy (BLOCK, DROP_OLDEST, DROP_NEWEST or ERROR)
+
+        Raises:
+            ValueError: If capacity is not positive or policy is unknown
+        """
+        if capacity < 1:
+            raise ValueError("Buffer capacity must be positive!")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}!")
+        self.capacity: int = capacity
+        self.policy: str = policy
+        self.dropped: int = 0
+        self._items: Deque[Any] = deque()
+        self._condition = threading.Condition()
+        self._closed: bool = False
+        self._cancelled: bool = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @property
+    def cancelled(self) -> bool:
+        """True if the consumer stopped reading."""
+        return self._cancelled
+
+    def put(self, item: Any) -> bool:
+        """
+        Adds an item according to the overflow policy.
+
+        Args:
+            item: Item to add
+
+        Returns:
+            True if the item was buffered, False if it was dropped
+            or the consumer has stopped
+
+        Raises:
+            BufferError: If the buffer is full and the policy is ERROR
+        """
+        with self._condition:
+            if self._cancelled:
+                return False
+            if len(self._items) >= self.capacity:
+                if self.policy == BLOCK:
+                    while len(self._items) >= self.capacity and not self._cancelled:
+                        self._condition.wait()
+                    if self._cancelled:
+                        return False
+                elif self.policy == DROP_OLDEST:
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                else:
+                    raise BufferError(f"Buffer overflow ({self.capacity} items)!")
+            self._items.append(item)
+            self._condition.notify_all()
+            return True
+
+    def get(self, block: bool = True) -> Any:
+        """
+        Removes and returns the oldest item.
+
+        Args:
+            block: Wait for an item if the buffer is empty
+
+        Returns:
+            Oldest item
+
+        Raises:
+            IndexError: If the buffer is empty and block is False
+            EOFError: If the buffer is closed and drained
+        """
+        with self._condition:
+            while not self._items:
+                if self._closed or self._cancelled:
+                    raise EOFError("Buffer is closed!")
+                if not block:
+                    raise IndexError("Buffer is empty!")
+                self._condition.wait()
+            item = self._items.popleft()
+            self._condition.notify_all()
+            return item
+
+    def close(self) -> None:
+        """Marks the end of data; buffered items can still be read."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def cancel(self) -> None:
+        """Stops the buffer from the consumer side and drops buffered items."""
+        with self._condition:
+            self._cancelled = True
+            self._items.clear()
+            self._condition.notify_all()
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            try:
+                yield self.get()
+            except EOFError:
+                return
+
+
+class _Splitter:
+    """Lazily routes items of one source into per-branch buffers."""
+
+    def __init__(
+        self,
+        stream: Iterable,
+        branches: int,
+        route: Callable[[Any], Iterable[int]],
+        buffer_size: int,
+        policy: str,
+    ) -> None:
+        if policy == BLOCK:
+            raise ValueError("BLOCK policy needs threaded consumers!")
+        self.stream = stream
+        self.iterator = iter(stream)
+        self.route = route
+        self.buffers = [RingBuffer(buffer_size, policy) for _ in range(branches)]
+        self.exhausted = False
+        self.active = branches
+        self.pending: Optional[Tuple[Any, List[int]]] = None
+        """Item read from the source that did not fit into all its buffers."""
+
+    def branch(self, index: int) -> "_Branch":
+        return _Branch(self, index)
+
+    def pull(self, index: int) -> Any:
+        """
+        Next item of a branch, reading the source when its buffer is empty.
+
+        An item goes into all its buffers or none: with the ERROR policy it
+        is held back while one of them is full, so no branch loses it.
+
+        Raises:
+            BufferError: If the item for the branch cannot be delivered
+                because another branch's buffer is full
+        """
+        buffer = self.buffers[index]
+        while True:
+            try:
+                return buffer.get(block=False)
+            except IndexError:
+                pass
+            if self.pending is None:
+                if self.exhausted:
+                    raise StopIteration
+                try:
+                    item = next(self.iterator)
+                except StopIteration:
+                    self.exhausted = True
+                    raise
+                self.pending = item, list(self.route(item))
+            item, targets = self.pending
+            if buffer.policy == ERROR:
+                for target in targets:
+                    full = self.buffers[target]
+                    if not full.cancelled and len(full) >= full.capacity:
+                        raise BufferError(
+                            f"Buffer overflow in branch {target} "
+                            f"({full.capacity} items)!"
+                        )
+            self.pending = None
+            for target in targets:
+                self.buffers[target].put(item)
+
+    def release(self, index: int) -> None:
+        """Drops a finished branch; the source is closed with the last one."""
+        self.buffers[index].cancel()
+        self.active -= 1
+        if self.active == 0:
+            close_stream(self.stream)
+
+
+class _Branch(Iterator[Any]):
+    """
+    One stream of a _Splitter.
+
+    Unlike a generator, a branch releases its buffer when it is closed or
+    garbage collected before its first item, so the source is closed once
+    all branches are done even if some are never read.
+    """
+
+    def __init__(self, splitter: _Splitter, index: int) -> None:
+        self._splitter = splitter
+        self._index = index
+        self._closed = False
+
+    def __next__(self) -> Any:
+        if self._closed:
+            raise StopIteration
+        try:
+            return self._splitter.pull(self._index)
+        except BufferError:
+            # Another branch is full; this one can go on once it is read
+            raise
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """Stops the branch; buffered items are dropped."""
+        if not self._closed:
+            self._closed = True
+            self._splitter.release(self._index)
+
+    def __del__(self) -> None:
+        self.close()
+
+
+def tee(
+    stream: Iterable,
+    n: int = 2,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    policy: str = ERROR,
+) -> Tuple[Iterator, ...]:
+    """
+    Splits one stream into n independent streams without re-reading the source.
+
+    Items not yet read by a lagging branch wait in its bounded buffer.
+    Branches are consumed by the caller in one thread, so the overflow policy
+    can be ERROR, DROP_OLDEST or DROP_NEWEST. With ERROR, a read that would
+    overflow a lagging branch raises BufferError and keeps the item for all
+    branches; reading the lagging branch makes room again. See broadcast for
+    threaded consumers with backpressure. The source is closed once every branch is
+    exhausted, closed or garbage collected, whether it was read or not.
+    Args:
+        stream: Data stream
+        n: Number of branches
+        buffer_size: Maximum number of items buffered per branch
+        policy: Overflow policy
+    Returns:
+        Tuple of n streams
+    """
+    everyone = range(n)
+    splitter = _Splitter(stream, n, lambda item: everyone, buffer_size, policy)
+    return tuple(splitter.branch(i) for i in range(n))
+
+
+def partition(
+    stream: Iterable,
+    by: Callable[[Any], Hashable],
+    keys: Sequence[Hashable],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    policy: str = ERROR,
+) -> Dict[Hashable, Iterator]:
+    """
+    Splits a stream into branches by key. Items with other keys are skipped.
+    Args:
+        stream: Data stream
+        by: Function computing the branch key of an item
+        keys: Keys of the branches
+        buffer_size: Maximum number of items buffered per branch
+        policy: Overflow policy (ERROR, DROP_OLDEST or DROP_NEWEST)
+    Returns:
+        Dict mapping every key to its stream
+    """
+    index = {key: (i,) for i, key in enumerate(keys)}
+    splitter = _Splitter(
+        stream, len(keys), lambda item: index.get(by(item), ()), buffer_size, policy
+    )
+    return {key: splitter.branch(i) for i, key in enumerate(keys)}
+
+
+def _run_branches(
+    stream: Iterable,
+    consumers: Sequence[Callable[[Iterable], Any]],
+    route: Callable[[Any], Iterable[int]],
+    buffer_size: int,
+    policy: str,
+) -> List[Any]:
+    """Feeds consumers running on their own threads and collects their results."""
+    buffers = [RingBuffer(buffer_size, policy) for _ in consumers]
+    results: List[Any] = [None] * len(consumers)
+    errors: List[BaseException] = []
+
+    def run(index: int) -> None:
+        try:
+            results[index] = consumers[index](iter(buffers[index]))
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            buffers[index].cancel()
+
+    threads = [
+        threading.Thread(target=run, args=(i,), daemon=True)
+        for i in range(len(consumers))
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        for item in stream:
+            for target in route(item):
+                buffers[target].put(item)
+            if all(buffer.cancelled for buffer in buffers):
+                break
+    finally:
+        for buffer in buffers:
+            buffer.close()
+        for thread in threads:
+            thread.join()
+        close_stream(stream)
+
+    if errors:
+        raise errors[0]
+    return results
+
+
+def broadcast(
+    stream: Iterable,
+    *consumers: Callable[[Iterable], Any],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    policy: str = BLOCK,
+) -> List[Any]:
+    """
+    Sends every item to all consumers, each running on its own thread.
+
+    Consumers receive a stream and return a result, e.g. to_list or
+    lambda s: to_list(process_pipeline(s, ...)). With the BLOCK policy the
+    slowest consumer throttles the source; drop policies let it fall behind.
+    Args:
+        stream: Data stream
+        *consumers: Consumer functions
+        buffer_size: Maximum number of items buffered per consumer
+        policy: Overflow policy
+    Returns:
+        Results of the consumers in the same order
+    """
+    everyone = range(len(consumers))
+    return _run_branches(stream, consumers, lambda item: everyone, buffer_size, policy)
+
+
+def dispatch(
+    stream: Iterable,
+    by: Callable[[Any], Hashable],
+    consumers: Dict[Hashable, Callable[[Iterable], Any]],
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    policy: str = BLOCK,
+) -> Dict[Hashable, Any]:
+    """
+    Threaded partition: sends each item to the consumer of its key.
+    Items with other keys are skipped.
+    Args:
+        stream: Data stream
+        by: Function computing the key of an item
+        consumers: Consumer function for every key
+        buffer_size: Maximum number of items buffered per consumer
+        policy: Overflow policy
+    Returns:
+        Dict mapping every key to the result of its consumer
+    """
+    keys = list(consumers)
+    index = {key: (i,) for i, key in enumerate(keys)}
+    results = _run_branches(
+        stream,
+        [consumers[key] for key in keys],
+        lambda item: index.get(by(item), ()),
+        buffer_size,
+        policy,
+    )
+    return dict(zip(keys, results))
+
+
+def merge(
+    *streams: Iterable,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    policy: str = BLOCK,
+) -> Generator:
+    """
+    Merges several streams, each read by its own producer thread.
+
+    Items come in arrival order; order within one source is kept.
+    Args:
+        *streams: Data streams
+        buffer_size: Maximum number of items waiting to be consumed
+        policy: Overflow policy
+    Yields:
+        Items of all streams
+    """
+    buffer = RingBuffer(buffer_size, policy)
+    errors: List[BaseException] = []
+    remaining = [len(streams)]
+    lock = threading.Lock()
+
+    def produce(source: Iterable) -> None:
+        try:
+            for item in source:
+                if not buffer.put(item) and buffer.cancelled:
+                    break
+        except BaseException as error:
+            errors.append(error)
+        finally:
+            close_stream(source)
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    buffer.close()
+
+    if not streams:
+        return
+    threads = [
+        threading.Thread(target=produce, args=(source,), daemon=True)
+        for source in streams
+    ]
+    for thread in threads:
+        thread.start()
+    try:
+        yield from buffer
+    finally:
+        buffer.cancel()
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+
+
+def interleave(*streams: Iterable) -> Generator:
+    """
+    Merges streams round-robin in the calling thread, skipping exhausted ones.
+    Args:
+        *streams: Data streams
+    Yields:
+        One item of every live stream in turn
+    """
+    iterators = deque(iter(stream) for stream in streams)
+    try:
+        while iterators:
+            iterator = iterators.popleft()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                continue
+            iterators.append(iterator)
+            yield item
+    finally:
+        for stream in streams:
+            close_stream(stream)
+
+
+def zip_streams(*streams: Iterable, strict: bool = False) -> Generator:
+    """
+    Combines items of several streams into tuples.
+    Args:
+        *streams: Data streams
+        strict: Raise ValueError if the streams have different lengths
+    Yields:
+        Tuples with one item of every stream
+    """
+    iterators = [iter(stream) for stream in streams]
+    missing = object()
+    try:
+        while iterators:
+            row = []
+            for position, iterator in enumerate(iterators):
+                item = next(iterator, missing)
+                if item is missing:
+                    if strict and (
+                        position > 0
+                        or any(next(it, missing) is not missing for it in iterators)
+                    ):
+                        raise ValueError("Streams have different lengths!")
+                    return
+                row.append(item)
+            yield tuple(row)
+    finally:
+        for stream in streams:
+            close_stream(stream)
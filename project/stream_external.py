@@ -0,0 +1,243 @@
+import pickle
+import tempfile
+from heapq import merge
+from itertools import groupby, islice
+from typing import IO, Any, Callable, Generator, Iterable, List, Optional
+
+from project.stream_processing import close_stream
+
+DEFAULT_BUFFER_SIZE = 100_000
+"""Default number of items kept in memory before a sorted run is spilled."""
+
+_PICKLE_BATCH = 1024
+
+
+def _identity(item: Any) -> Any:
+    return item
+
+
+def _spill_run(items: List[Any], spill_dir: Optional[str]) -> IO[bytes]:
+    """
+    Writes already sorted items to a temporary file.
+
+    Args:
+        items: Sorted items
+        spill_dir: Directory for the temporary file (system default if None)
+
+    Returns:
+        File positioned at the beginning of the run
+    """
+    run = tempfile.TemporaryFile(dir=spill_dir)
+    for start in range(0, len(items), _PICKLE_BATCH):
+        pickle.dump(items[start : start + _PICKLE_BATCH], run, pickle.HIGHEST_PROTOCOL)
+    run.seek(0)
+    return run
+
+
+def _read_run(run: IO[bytes]) -> Generator:
+    """
+    Reads a spilled run back batch by batch and closes the file at the end.
+
+    Args:
+        run: File created by _spill_run
+    Yields:
+        Items of the run in sorted order
+    """
+    try:
+        while True:
+            try:
+                batch = pickle.load(run)
+            except EOFError:
+                return
+            yield from batch
+    finally:
+        run.close()
+
+
+def external_sort(
+    stream: Iterable,
+    key: Optional[Callable] = None,
+    reverse: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    spill_dir: Optional[str] = None,
+) -> Generator:
+    """
+    Sorts a stream holding at most buffer_size items in memory.
+
+    Each full buffer is sorted and spilled to a temporary file, then all
+    runs are combined with a k-way merge. The sort is stable.
+    Args:
+        stream: Data stream
+        key: Sort key function
+        reverse: Sort in descending order
+        buffer_size: Maximum number of items kept in memory
+        spill_dir: Directory for temporary files
+    Yields:
+        Items in sorted order
+    """
+    if buffer_size < 1:
+        raise ValueError("buffer_size must be positive!")
+
+    runs: List[IO[bytes]] = []
+    iterator = iter(stream)
+    try:
+        while True:
+            buffer = list(islice(iterator, buffer_size))
+            buffer.sort(key=key, reverse=reverse)
+            if len(buffer) < buffer_size:
+                break
+            runs.append(_spill_run(buffer, spill_dir))
+    except BaseException:
+        for run in runs:
+            run.close()
+        raise
+    finally:
+        close_stream(stream)
+
+    if not runs:
+        yield from buffer
+        return
+
+    readers = [_read_run(run) for run in runs]
+    try:
+        yield from merge(*readers, buffer, key=key, reverse=reverse)
+    finally:
+        for reader in readers:
+            reader.close()
+        for run in runs:
+            run.close()
+
+
+def sort_stream(
+    key: Optional[Callable] = None,
+    reverse: bool = False,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    spill_dir: Optional[str] = None,
+) -> Callable:
+    """
+    Sorts the stream within a memory budget (see external_sort).
+    Args:
+        key: Sort key function
+        reverse: Sort in descending order
+        buffer_size: Maximum number of items kept in memory
+        spill_dir: Directory for temporary files
+    Returns:
+        Function for the pipeline
+    """
+
+    def sorter(stream: Generator) -> Generator:
+        yield from external_sort(stream, key, reverse, buffer_size, spill_dir)
+
+    return sorter
+
+
+def group_by(
+    key: Callable,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    spill_dir: Optional[str] = None,
+) -> Callable:
+    """
+    Groups elements by key. Keys must be orderable.
+
+    The stream is sorted externally by key, so only one group at a time
+    is held in memory.
+    Args:
+        key: Grouping key function
+        buffer_size: Maximum number of items kept in memory while sorting
+        spill_dir: Directory for temporary files
+    Returns:
+        Function for the pipeline yielding (key, list of items) in key order
+    """
+
+    def grouper(stream: Generator) -> Generator:
+        ordered = external_sort(stream, key, False, buffer_size, spill_dir)
+        try:
+            for group_key, group in groupby(ordered, key):
+                yield group_key, list(group)
+        finally:
+            ordered.close()
+
+    return grouper
+
+
+def distinct(
+    key: Optional[Callable] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    spill_dir: Optional[str] = None,
+) -> Callable:
+    """
+    Removes duplicate elements. Keys must be orderable.
+
+    Duplicates are found after an external sort, so the result comes out
+    ordered by key and the first element of every key is kept.
+    Args:
+        key: Function defining equal elements (the element itself by default)
+        buffer_size: Maximum number of items kept in memory while sorting
+        spill_dir: Directory for temporary files
+    Returns:
+        Function for the pipeline
+    """
+    key_func = key or _identity
+
+    def deduplicator(stream: Generator) -> Generator:
+        ordered = external_sort(stream, key_func, False, buffer_size, spill_dir)
+        try:
+            for _, group in groupby(ordered, key_func):
+                yield next(group)
+        finally:
+            ordered.close()
+
+    return deduplicator
+
+
+def join(
+    right: Iterable,
+    key: Callable,
+    right_key: Optional[Callable] = None,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    spill_dir: Optional[str] = None,
+) -> Callable:
+    """
+    Inner sort-merge join of the stream with another iterable.
+    Keys must be orderable.
+
+    Both sides are sorted externally by key; only the items sharing the
+    current key are held in memory.
+    Args:
+        right: Second data source
+        key: Key function for stream elements
+        right_key: Key function for right elements (same as key if None)
+        buffer_size: Maximum number of items kept in memory while sorting
+        spill_dir: Directory for temporary files
+    Returns:
+        Function for the pipeline yielding (left, right) pairs in key order
+    """
+    right_key_func = right_key or key
+
+    def joiner(stream: Generator) -> Generator:
+        left_sorted = external_sort(stream, key, False, buffer_size, spill_dir)
+        right_sorted = external_sort(
+            right, right_key_func, False, buffer_size, spill_dir
+        )
+        try:
+            left_groups = groupby(left_sorted, key)
+            right_groups = groupby(right_sorted, right_key_func)
+            left_group = next(left_groups, None)
+            right_group = next(right_groups, None)
+            while left_group is not None and right_group is not None:
+                if left_group[0] < right_group[0]:
+                    left_group = next(left_groups, None)
+                elif right_group[0] < left_group[0]:
+                    right_group = next(right_groups, None)
+                else:
+                    right_items = list(right_group[1])
+                    for left_item in left_group[1]:
+                        for right_item in right_items:
+                            yield left_item, right_item
+                    left_group = next(left_groups, None)
+                    right_group = next(right_groups, None)
+        finally:
+            left_sorted.close()
+            right_sorted.close()
+
+    return joiner
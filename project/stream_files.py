@@ -0,0 +1,224 @@
+import csv
+import json
+import mmap
+import os
+from itertools import islice
+from typing import Any, Generator, Iterable, Optional, Sequence
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+"""Default size of file buffers in bytes."""
+
+_WRITE_BATCH = 4096
+
+
+def read_lines(
+    path: str,
+    encoding: str = "utf-8",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    keep_newline: bool = False,
+) -> Generator[str, None, None]:
+    """
+    Creates a stream of text lines from a file.
+    Args:
+        path: Path to the file
+        encoding: Text encoding
+        buffer_size: Size of the read buffer in bytes
+        keep_newline: Keep trailing line separators
+    Yields:
+        Lines one by one
+    """
+    with open(path, encoding=encoding, buffering=buffer_size, newline="") as file:
+        if keep_newline:
+            yield from file
+        else:
+            for line in file:
+                yield line.rstrip("\r\n")
+
+
+def read_csv(
+    path: str,
+    header: bool = True,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> Generator[Any, None, None]:
+    """
+    Creates a stream of CSV rows from a file.
+    Args:
+        path: Path to the file
+        header: Treat the first row as column names
+        delimiter: Field delimiter
+        encoding: Text encoding
+        buffer_size: Size of the read buffer in bytes
+    Yields:
+        Rows as dicts when header is True, otherwise as lists of strings
+    """
+    with open(path, encoding=encoding, buffering=buffer_size, newline="") as file:
+        if header:
+            yield from csv.DictReader(file, delimiter=delimiter)
+        else:
+            yield from csv.reader(file, delimiter=delimiter)
+
+
+def read_jsonl(
+    path: str, encoding: str = "utf-8", buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> Generator[Any, None, None]:
+    """
+    Creates a stream of objects from a JSON Lines file. Blank lines are skipped.
+    Args:
+        path: Path to the file
+        encoding: Text encoding
+        buffer_size: Size of the read buffer in bytes
+    Yields:
+        Decoded objects one by one
+    """
+    decode = json.loads
+    with open(path, encoding=encoding, buffering=buffer_size) as file:
+        for line in file:
+            if line.strip():
+                yield decode(line)
+
+
+def read_records(
+    path: str, record_size: int, batch_size: Optional[int] = None
+) -> Generator[memoryview, None, None]:
+    """
+    Creates a stream of fixed-width binary records from a memory-mapped file.
+
+    Records are memoryview slices of the mapping, so nothing is copied.
+    A trailing partial record is ignored.
+    Args:
+        path: Path to the file
+        record_size: Size of one record in bytes
+        batch_size: Yield views over this many records at once instead of
+            single records
+    Yields:
+        memoryview of one record (or of one batch of records)
+    """
+    if record_size < 1:
+        raise ValueError("record_size must be positive!")
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("batch_size must be positive!")
+
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        usable = size - size % record_size
+        if usable == 0:
+            return
+        mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)[:usable]
+    step = record_size * (batch_size or 1)
+    try:
+        for start in range(0, usable, step):
+            yield view[start : start + step]
+    finally:
+        view.release()
+        try:
+            mapping.close()
+        except BufferError:
+            # The consumer still holds record views; the mapping is released
+            # together with the last of them.
+            pass
+
+
+def _write_batched(file: Any, lines: Iterable) -> int:
+    """Writes an iterable to a file in batches and returns the item count."""
+    iterator = iter(lines)
+    written = 0
+    while True:
+        batch = list(islice(iterator, _WRITE_BATCH))
+        if not batch:
+            return written
+        file.writelines(batch)
+        written += len(batch)
+
+
+def write_lines(
+    stream: Iterable[str],
+    path: str,
+    encoding: str = "utf-8",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> int:
+    """
+    Writes a stream of strings to a text file, one per line.
+    Args:
+        stream: Data stream
+        path: Path to the file
+        encoding: Text encoding
+        buffer_size: Size of the write buffer in bytes
+    Returns:
+        Number of written lines
+    """
+    with open(path, "w", encoding=encoding, buffering=buffer_size) as file:
+        return _write_batched(file, (f"{line}\n" for line in stream))
+
+
+def write_csv(
+    stream: Iterable[Sequence[Any]],
+    path: str,
+    header: Optional[Sequence[str]] = None,
+    delimiter: str = ",",
+    encoding: str = "utf-8",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> int:
+    """
+    Writes a stream of rows to a CSV file.
+    Args:
+        stream: Stream of rows (sequences of fields)
+        path: Path to the file
+        header: Optional column names written first
+        delimiter: Field delimiter
+        encoding: Text encoding
+        buffer_size: Size of the write buffer in bytes
+    Returns:
+        Number of written rows, header excluded
+    """
+    with open(path, "w", encoding=encoding, buffering=buffer_size, newline="") as file:
+        writer = csv.writer(file, delimiter=delimiter)
+        if header is not None:
+            writer.writerow(header)
+        iterator = iter(stream)
+        written = 0
+        while True:
+            batch = list(islice(iterator, _WRITE_BATCH))
+            if not batch:
+                return written
+            writer.writerows(batch)
+            written += len(batch)
+
+
+def write_jsonl(
+    stream: Iterable[Any],
+    path: str,
+    encoding: str = "utf-8",
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+) -> int:
+    """
+    Writes a stream of objects to a JSON Lines file.
+    Args:
+        stream: Data stream
+        path: Path to the file
+        encoding: Text encoding
+        buffer_size: Size of the write buffer in bytes
+    Returns:
+        Number of written objects
+    """
+    encode = json.dumps
+    with open(path, "w", encoding=encoding, buffering=buffer_size) as file:
+        return _write_batched(file, (encode(item) + "\n" for item in stream))
+
+
+def write_records(
+    stream: Iterable[Any], path: str, buffer_size: int = DEFAULT_BUFFER_SIZE
+) -> int:
+    """
+    Writes a stream of bytes-like records (bytes, memoryview, array) to a file.
+    Args:
+        stream: Data stream
+        path: Path to the file
+        buffer_size: Size of the write buffer in bytes
+    Returns:
+        Number of written records
+    """
+    with open(path, "wb", buffering=buffer_size) as file:
+        return _write_batched(file, stream)
@@ -1,5 +1,32 @@
-from typing import Any, Callable, Generator, Iterable, List, Tuple, Set
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Set,
+)
 from functools import reduce
+from itertools import dropwhile, islice, takewhile
+
+if TYPE_CHECKING:
+    from project.stream_profiling import PipelineProfiler
+
+
+def close_stream(stream: Iterable) -> None:
+    """
+    Closes a stream if it supports closing (generators do).
+    Closing a generator runs its cleanup code and, for pipeline stages,
+    closes every stage upstream of it as well.
+    Args:
+        stream: Data stream
+    """
+    close = getattr(stream, "close", None)
+    if close is not None:
+        close()
 
 
 def generate_data(data: Iterable) -> Generator[Any, None, None]:
@@ -14,17 +41,24 @@ def generate_data(data: Iterable) -> Generator[Any, None, None]:
         yield item
 
 
-def process_pipeline(stream: Generator, *operations: Callable) -> Generator:
+def process_pipeline(
+    stream: Generator,
+    *operations: Callable,
+    profiler: Optional["PipelineProfiler"] = None,
+) -> Generator:
     """
     Applies operations to the data stream sequentially.
     Args:
         stream: Data stream
         *operations: Processing functions
+        profiler: Optional PipelineProfiler collecting per-stage statistics
     Yields:
         Processed data
     """
     current_stream = stream
     for operation in operations:
+        if profiler is not None:
+            operation = profiler.wrap(operation)
         current_stream = operation(current_stream)
     yield from current_stream
 
@@ -39,7 +73,10 @@ def map_stream(func: Callable) -> Callable:
     """
 
     def mapper(stream: Generator) -> Generator:
-        yield from map(func, stream)
+        try:
+            yield from map(func, stream)
+        finally:
+            close_stream(stream)
 
     return mapper
 
@@ -56,7 +93,10 @@ def filter_stream(func: Callable) -> Callable:
     """
 
     def filterer(stream: Generator) -> Generator:
-        yield from filter(func, stream)
+        try:
+            yield from filter(func, stream)
+        finally:
+            close_stream(stream)
 
     return filterer
 
@@ -64,18 +104,25 @@ def filter_stream(func: Callable) -> Callable:
 def take_items(count: int) -> Callable:
     """
     Takes only the first N elements.
+    The upstream stream is closed as soon as N elements were taken,
+    so no more work is done by the stages before it.
     Args:
         count: How many elements to take
 
     Returns:
         Function for the pipeline
+
+    Raises:
+        ValueError: If count is negative
     """
+    if count < 0:
+        raise ValueError("Count must not be negative!")
 
     def taker(stream: Generator) -> Generator:
-        for i, item in enumerate(stream):
-            if i >= count:
-                break
-            yield item
+        try:
+            yield from islice(stream, count)
+        finally:
+            close_stream(stream)
 
     return taker
 
@@ -87,16 +134,58 @@ def skip_items(count: int) -> Callable:
         count: How many elements to skip
     Returns:
         Function for the pipeline
+    Raises:
+        ValueError: If count is negative
     """
+    if count < 0:
+        raise ValueError("Count must not be negative!")
 
     def skipper(stream: Generator) -> Generator:
-        for i, item in enumerate(stream):
-            if i >= count:
-                yield item
+        try:
+            yield from islice(stream, count, None)
+        finally:
+            close_stream(stream)
 
     return skipper
 
 
+def take_while(predicate: Callable) -> Callable:
+    """
+    Takes elements while the predicate holds.
+    Stops reading and closes the upstream stream on the first failing element.
+    Args:
+        predicate: Condition function (returns True/False)
+    Returns:
+        Function for the pipeline
+    """
+
+    def taker(stream: Generator) -> Generator:
+        try:
+            yield from takewhile(predicate, stream)
+        finally:
+            close_stream(stream)
+
+    return taker
+
+
+def drop_while(predicate: Callable) -> Callable:
+    """
+    Skips elements while the predicate holds, then yields the rest.
+    Args:
+        predicate: Condition function (returns True/False)
+    Returns:
+        Function for the pipeline
+    """
+
+    def dropper(stream: Generator) -> Generator:
+        try:
+            yield from dropwhile(predicate, stream)
+        finally:
+            close_stream(stream)
+
+    return dropper
+
+
 def reduce_stream(func: Callable, initial: Any = None) -> Callable:
     """
     Reduces the stream to a single value.
@@ -119,6 +208,32 @@ def reduce_stream(func: Callable, initial: Any = None) -> Callable:
     return reducer
 
 
+def accumulate_stream(*accumulators: Any) -> Callable:
+    """
+    Feeds every element to one or more accumulators in a single pass.
+    Accumulators are objects with an update(item) method, like the ones in
+    stream_statistics; partial results of split streams can be combined
+    afterwards with reduce_stream(lambda a, b: a.merge(b)).
+    Args:
+        *accumulators: Objects to update with every element
+    Returns:
+        Function for the pipeline yielding the accumulator once the stream
+        is exhausted (a tuple of them if several were given)
+    """
+
+    def accumulator_stage(stream: Generator) -> Generator:
+        updates = [accumulator.update for accumulator in accumulators]
+        try:
+            for item in stream:
+                for update in updates:
+                    update(item)
+        finally:
+            close_stream(stream)
+        yield accumulators[0] if len(accumulators) == 1 else accumulators
+
+    return accumulator_stage
+
+
 def to_list(stream: Generator) -> List[Any]:
     """
     Collects the stream into a list.
@@ -150,3 +265,50 @@ def to_set(stream: Generator) -> Set[Any]:
         Set of elements
     """
     return set(stream)
+
+
+def first_item(stream: Iterable, default: Any = None) -> Any:
+    """
+    Returns the first element of the stream and closes it.
+    Args:
+        stream: Data stream
+        default: Value returned for an empty stream
+    Returns:
+        First element or default
+    """
+    try:
+        return next(iter(stream), default)
+    finally:
+        close_stream(stream)
+
+
+def any_item(stream: Iterable, predicate: Callable = bool) -> bool:
+    """
+    Checks if any element satisfies the predicate.
+    Reading stops and the stream is closed on the first match.
+    Args:
+        stream: Data stream
+        predicate: Condition function (truthiness by default)
+    Returns:
+        True if some element matches, False otherwise
+    """
+    try:
+        return any(map(predicate, stream))
+    finally:
+        close_stream(stream)
+
+
+def all_items(stream: Iterable, predicate: Callable = bool) -> bool:
+    """
+    Checks if all elements satisfy the predicate.
+    Reading stops and the stream is closed on the first mismatch.
+    Args:
+        stream: Data stream
+        predicate: Condition function (truthiness by default)
+    Returns:
+        True if every element matches, False otherwise
+    """
+    try:
+        return all(map(predicate, stream))
+    finally:
+        close_stream(stream)
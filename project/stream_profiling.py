@@ -0,0 +1,190 @@
+from time import perf_counter
+from typing import Callable, Generator, Iterable, List, Optional
+
+from project.stream_processing import close_stream
+
+
+class StageStats:
+    """
+    Counters collected for one pipeline stage.
+
+    Time spent inside the stages before this one is tracked separately,
+    so self_time shows only the work done by the stage itself.
+    peak_buffered is the largest number of items consumed between two
+    produced items, e.g. the whole input for reduce_stream.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize empty counters.
+
+        Args:
+            name: Stage name shown in the report
+        """
+        self.name: str = name
+        self.items_in: int = 0
+        self.items_out: int = 0
+        self.total_time: float = 0.0
+        self.upstream_time: float = 0.0
+        self.peak_buffered: int = 0
+        self._in_at_last_output: int = 0
+
+    @property
+    def self_time(self) -> float:
+        """Time spent in the stage itself, without upstream stages."""
+        return max(self.total_time - self.upstream_time, 0.0)
+
+    @property
+    def time_per_item(self) -> float:
+        """Average self time per consumed item."""
+        return self.self_time / self.items_in if self.items_in else 0.0
+
+    @property
+    def selectivity(self) -> float:
+        """Ratio of produced to consumed items (below 1 for filters)."""
+        return self.items_out / self.items_in if self.items_in else 1.0
+
+    def __repr__(self) -> str:
+        return (
+            f"StageStats({self.name!r}, in={self.items_in}, out={self.items_out}, "
+            f"self_time={self.self_time:.6f})"
+        )
+
+
+class PipelineReport:
+    """Statistics of all profiled stages of a pipeline."""
+
+    def __init__(self, stages: List[StageStats]) -> None:
+        """
+        Args:
+            stages: Stage statistics in pipeline order
+        """
+        self.stages: List[StageStats] = stages
+
+    @property
+    def total_time(self) -> float:
+        """Sum of self times of all stages."""
+        return sum(stage.self_time for stage in self.stages)
+
+    def bottleneck(self) -> Optional[StageStats]:
+        """
+        Finds the stage with the largest self time.
+
+        Returns:
+            Slowest stage or None if nothing was profiled
+        """
+        return max(self.stages, key=lambda stage: stage.self_time, default=None)
+
+    def __str__(self) -> str:
+        header = (
+            f"{'stage':<24}{'in':>10}{'out':>10}{'select':>8}"
+            f"{'time, s':>12}{'per item, us':>14}{'peak buf':>10}"
+        )
+        lines = [header]
+        for stage in self.stages:
+            lines.append(
+                f"{stage.name:<24}{stage.items_in:>10}{stage.items_out:>10}"
+                f"{stage.selectivity:>8.2f}{stage.self_time:>12.6f}"
+                f"{stage.time_per_item * 1e6:>14.3f}{stage.peak_buffered:>10}"
+            )
+        return "\n".join(lines)
+
+
+class PipelineProfiler:
+    """
+    Opt-in instrumentation for process_pipeline.
+
+    Pass an instance as process_pipeline(..., profiler=profiler). Without
+    a profiler the pipeline runs unchanged, so there is no overhead.
+    """
+
+    def __init__(
+        self,
+        sample_every: int = 0,
+        sampler: Optional[Callable[[StageStats], None]] = None,
+        clock: Callable[[], float] = perf_counter,
+    ) -> None:
+        """
+        Args:
+            sample_every: Call sampler after every N items produced by a stage
+                (0 disables sampling)
+            sampler: Hook receiving the current stats of the sampled stage
+            clock: Time source
+        """
+        self.sample_every: int = sample_every
+        self.sampler: Optional[Callable[[StageStats], None]] = sampler
+        self.clock: Callable[[], float] = clock
+        self.stages: List[StageStats] = []
+
+    def wrap(self, operation: Callable) -> Callable:
+        """
+        Wraps a pipeline operation so its input and output are measured.
+
+        Args:
+            operation: Pipeline operation
+
+        Returns:
+            Instrumented operation
+        """
+        name = getattr(operation, "__qualname__", type(operation).__name__)
+        stats = StageStats(f"{len(self.stages)}:{name.split('.<locals>')[0]}")
+        self.stages.append(stats)
+
+        def profiled(stream: Generator) -> Generator:
+            output = operation(self._count_input(stream, stats))
+            try:
+                yield from self._count_output(output, stats)
+            finally:
+                close_stream(output)
+
+        return profiled
+
+    def report(self) -> PipelineReport:
+        """
+        Returns:
+            Report over all stages wrapped so far
+        """
+        return PipelineReport(list(self.stages))
+
+    def _count_input(self, stream: Iterable, stats: StageStats) -> Generator:
+        """Counts items pulled by a stage and the time spent producing them."""
+        clock = self.clock
+        iterator = iter(stream)
+        try:
+            while True:
+                start = clock()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    stats.upstream_time += clock() - start
+                    return
+                stats.upstream_time += clock() - start
+                stats.items_in += 1
+                yield item
+        finally:
+            close_stream(stream)
+
+    def _count_output(self, output: Iterable, stats: StageStats) -> Generator:
+        """Counts items produced by a stage and the time spent producing them."""
+        clock = self.clock
+        iterator = iter(output)
+        while True:
+            start = clock()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                stats.total_time += clock() - start
+                return
+            stats.total_time += clock() - start
+            stats.items_out += 1
+            buffered = stats.items_in - stats._in_at_last_output
+            if buffered > stats.peak_buffered:
+                stats.peak_buffered = buffered
+            stats._in_at_last_output = stats.items_in
+            if (
+                self.sampler is not None
+                and self.sample_every
+                and stats.items_out % self.sample_every == 0
+            ):
+                self.sampler(stats)
+            yield item
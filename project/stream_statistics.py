@@ -0,0 +1,326 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right
+from itertools import repeat
+from operator import add, mul, sub
+from typing import Iterable, List, Optional, Sequence
+
+from project.vectors import VectorLike, _values, vector_length
+
+
+class Accumulator(ABC):
+    """
+    Single-pass statistic over a stream of vectors.
+
+    update() consumes one vector, merge() combines an accumulator filled
+    with another part of the data (e.g. in a worker process; accumulators
+    are plain picklable objects), so statistics of a split stream can be
+    computed in parallel and merged. Use accumulate_stream from
+    stream_processing to fill one inside a pipeline.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.dimension: Optional[int] = None
+
+    def _check(self, values: Sequence[float]) -> None:
+        if self.dimension is None:
+            self.dimension = len(values)
+            self._start(self.dimension)
+        elif len(values) != self.dimension:
+            raise ValueError("Invalid input: vectors must have the same length!")
+
+    def _check_merge(self, other: "Accumulator") -> bool:
+        """Returns False if other is empty and there is nothing to merge."""
+        if type(other) is not type(self):
+            raise TypeError(
+                f"Cannot merge {type(other).__name__} into {type(self).__name__}"
+            )
+        if other.count == 0:
+            return False
+        if self.dimension is not None and self.dimension != other.dimension:
+            raise ValueError("Invalid input: vectors must have the same length!")
+        return True
+
+    def _start(self, dimension: int) -> None:
+        """Allocates the state once the dimension is known."""
+
+    @abstractmethod
+    def update(self, vec: VectorLike) -> None:
+        """
+        Consumes one vector.
+
+        Args:
+            vec: Vector (list of numbers or Vector)
+
+        Raises:
+            ValueError: If vec has another length than the earlier vectors
+        """
+
+    def update_many(self, vectors: Iterable[VectorLike]) -> "Accumulator":
+        """
+        Feeds a sequence of vectors.
+
+        Returns:
+            self
+        """
+        for vec in vectors:
+            self.update(vec)
+        return self
+
+    @abstractmethod
+    def merge(self, other: "Accumulator") -> "Accumulator":
+        """
+        Adds the statistics of an accumulator of the same type.
+
+        Args:
+            other: Accumulator filled with another part of the data
+
+        Returns:
+            self
+
+        Raises:
+            TypeError: If other has a different type
+            ValueError: If other saw vectors of another length
+        """
+
+
+class RunningMoments(Accumulator):
+    """Per-component mean and variance (Welford's algorithm)."""
+
+    def _start(self, dimension: int) -> None:
+        self._mean = [0.0] * dimension
+        self._m2 = [0.0] * dimension
+
+    def update(self, vec: VectorLike) -> None:
+        """
+        Updates the mean and variance with one vector.
+
+        Args:
+            vec: Vector (list of numbers or Vector)
+
+        Raises:
+            ValueError: If vec has another length than the earlier vectors
+        """
+        values = _values(vec)
+        self._check(values)
+        self.count += 1
+        delta = list(map(sub, values, self._mean))
+        self._mean[:] = map(add, self._mean, map(mul, delta, repeat(1.0 / self.count)))
+        self._m2[:] = map(add, self._m2, map(mul, delta, map(sub, values, self._mean)))
+
+    def merge(self, other: Accumulator) -> "RunningMoments":
+        """
+        Adds the statistics of another RunningMoments (Chan et al.).
+
+        Returns:
+            self
+        """
+        if not self._check_merge(other):
+            return self
+        assert isinstance(other, RunningMoments)
+        if self.count == 0:
+            self.dimension = other.dimension
+            self.count, self._mean, self._m2 = other.count, other.mean, other._m2[:]
+            return self
+        count = self.count + other.count
+        delta = list(map(sub, other._mean, self._mean))
+        weight = self.count * other.count / count
+        self._m2[:] = map(
+            add,
+            map(add, self._m2, other._m2),
+            map(mul, map(mul, delta, delta), repeat(weight)),
+        )
+        self._mean[:] = map(
+            add, self._mean, map(mul, delta, repeat(other.count / count))
+        )
+        self.count = count
+        return self
+
+    @property
+    def mean(self) -> List[float]:
+        """Mean vector (empty before the first update)."""
+        return self._mean[:] if self.count else []
+
+    def variance(self, ddof: int = 0) -> List[float]:
+        """
+        Args:
+            ddof: Delta degrees of freedom, 1 for the sample variance
+
+        Returns:
+            Variance of every component
+
+        Raises:
+            ValueError: If there are not more than ddof vectors
+        """
+        if self.count <= ddof:
+            raise ValueError("Not enough vectors for the variance!")
+        return [m2 / (self.count - ddof) for m2 in self._m2]
+
+
+class RunningCovariance(Accumulator):
+    """Mean vector and covariance matrix, updated in O(d^2) per vector."""
+
+    def _start(self, dimension: int) -> None:
+        self._mean = [0.0] * dimension
+        self._comoment = [[0.0] * dimension for _ in range(dimension)]
+
+    def update(self, vec: VectorLike) -> None:
+        """
+        Updates the mean and the co-moment matrix with one vector.
+
+        Args:
+            vec: Vector (list of numbers or Vector)
+
+        Raises:
+            ValueError: If vec has another length than the earlier vectors
+        """
+        values = _values(vec)
+        self._check(values)
+        self.count += 1
+        delta = list(map(sub, values, self._mean))
+        self._mean[:] = map(add, self._mean, map(mul, delta, repeat(1.0 / self.count)))
+        residual = list(map(sub, values, self._mean))
+        for row, scale in zip(self._comoment, delta):
+            row[:] = map(add, row, map(mul, residual, repeat(scale)))
+
+    def merge(self, other: Accumulator) -> "RunningCovariance":
+        """
+        Adds the statistics of another RunningCovariance.
+
+        Returns:
+            self
+        """
+        if not self._check_merge(other):
+            return self
+        assert isinstance(other, RunningCovariance)
+        if self.count == 0:
+            self.dimension = other.dimension
+            self.count, self._mean = other.count, other._mean[:]
+            self._comoment = [row[:] for row in other._comoment]
+            return self
+        count = self.count + other.count
+        delta = list(map(sub, other._mean, self._mean))
+        weight = self.count * other.count / count
+        for row, other_row, scale in zip(self._comoment, other._comoment, delta):
+            row[:] = map(
+                add, map(add, row, other_row), map(mul, delta, repeat(scale * weight))
+            )
+        self._mean[:] = map(
+            add, self._mean, map(mul, delta, repeat(other.count / count))
+        )
+        self.count = count
+        return self
+
+    @property
+    def mean(self) -> List[float]:
+        """Mean vector (empty before the first update)."""
+        return self._mean[:] if self.count else []
+
+    def covariance(self, ddof: int = 0) -> List[List[float]]:
+        """
+        Args:
+            ddof: Delta degrees of freedom, 1 for the sample covariance
+
+        Returns:
+            Covariance matrix (list of lists)
+
+        Raises:
+            ValueError: If there are not more than ddof vectors
+        """
+        if self.count <= ddof:
+            raise ValueError("Not enough vectors for the covariance!")
+        scale = 1.0 / (self.count - ddof)
+        return [list(map(mul, row, repeat(scale))) for row in self._comoment]
+
+
+class RunningExtrema(Accumulator):
+    """Per-component minimum and maximum."""
+
+    def _start(self, dimension: int) -> None:
+        self.minimum = [float("inf")] * dimension
+        self.maximum = [float("-inf")] * dimension
+
+    def update(self, vec: VectorLike) -> None:
+        """
+        Lowers the minimum and raises the maximum to the vector's components.
+
+        Args:
+            vec: Vector (list of numbers or Vector)
+
+        Raises:
+            ValueError: If vec has another length than the earlier vectors
+        """
+        values = _values(vec)
+        self._check(values)
+        self.count += 1
+        self.minimum[:] = map(min, self.minimum, values)
+        self.maximum[:] = map(max, self.maximum, values)
+
+    def merge(self, other: Accumulator) -> "RunningExtrema":
+        """
+        Returns:
+            self
+        """
+        if not self._check_merge(other):
+            return self
+        assert isinstance(other, RunningExtrema)
+        self._check(other.minimum)
+        self.count += other.count
+        self.minimum[:] = map(min, self.minimum, other.minimum)
+        self.maximum[:] = map(max, self.maximum, other.maximum)
+        return self
+
+
+class NormHistogram(Accumulator):
+    """
+    Histogram of vector lengths over fixed bin edges.
+
+    Bin 0 counts lengths below edges[0], bin i counts lengths in
+    [edges[i - 1], edges[i]) and the last bin lengths from edges[-1] up.
+    """
+
+    def __init__(self, edges: Sequence[float]) -> None:
+        """
+        Args:
+            edges: Increasing bin edges
+
+        Raises:
+            ValueError: If edges are empty or not increasing
+        """
+        super().__init__()
+        if not edges or any(a >= b for a, b in zip(edges, edges[1:])):
+            raise ValueError("Bin edges must be increasing!")
+        self.edges = list(edges)
+        self.counts = [0] * (len(edges) + 1)
+
+    def update(self, vec: VectorLike) -> None:
+        """
+        Counts the length of one vector in its bin.
+
+        Args:
+            vec: Vector (list of numbers or Vector)
+
+        Raises:
+            ValueError: If vec has another length than the earlier vectors
+        """
+        self._check(_values(vec))
+        self.count += 1
+        self.counts[bisect_right(self.edges, vector_length(vec))] += 1
+
+    def merge(self, other: Accumulator) -> "NormHistogram":
+        """
+        Returns:
+            self
+
+        Raises:
+            ValueError: If the histograms have different edges
+        """
+        if not self._check_merge(other):
+            return self
+        assert isinstance(other, NormHistogram)
+        if other.edges != self.edges:
+            raise ValueError("Histograms must have the same bin edges!")
+        self.dimension = other.dimension
+        self.count += other.count
+        self.counts[:] = map(add, self.counts, other.counts)
+        return self
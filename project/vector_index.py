@@ -0,0 +1,245 @@
+import random
+from heapq import nlargest
+from itertools import combinations
+from operator import itemgetter, mul
+from math import sqrt
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from project.vectors import (
+    VectorBatch,
+    VectorLike,
+    _batch_values,
+    _values,
+    dot_product,
+    top_k_similar,
+)
+
+EXACT = "exact"
+LSH = "lsh"
+MODES = (EXACT, LSH)
+
+Match = Tuple[int, float]
+"""Search result: vector id and cosine similarity to the query."""
+
+
+class VectorIndex:
+    """
+    Index of vectors for cosine similarity search.
+
+    Vectors are stored normalized, so their norms are computed once on
+    insertion and a similarity is a single dot product. In EXACT mode a
+    query is compared with every vector. In LSH mode vectors are hashed by
+    the signs of their projections on random hyperplanes (SimHash): similar
+    vectors land in the same bucket with high probability, and only the
+    vectors in the query's buckets are compared. More tables and probes
+    raise recall at the cost of speed; more bits per table make buckets
+    smaller and queries faster but lower recall.
+    """
+
+    def __init__(
+        self,
+        dimension: int,
+        mode: str = EXACT,
+        tables: int = 8,
+        bits: int = 12,
+        probes: int = 1,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            dimension: Length of the indexed vectors
+            mode: EXACT (brute force) or LSH (approximate)
+            tables: Number of LSH hash tables
+            bits: Hyperplanes per table; a table has up to 2 ** bits buckets
+            probes: Also visit buckets whose signature differs in up to this
+                many bits, the least certain ones first (multi-probe LSH)
+            seed: Seed of the random hyperplanes
+
+        Raises:
+            ValueError: If mode is unknown or a parameter is not positive
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode {mode!r}, expected one of {MODES}")
+        if dimension <= 0 or tables <= 0 or bits <= 0 or probes < 0:
+            raise ValueError("Index parameters must be positive!")
+        self.dimension = dimension
+        self.mode = mode
+        self.probes = probes
+        self._vectors: Dict[int, List[float]] = {}
+        self._signatures: Dict[int, List[int]] = {}
+        self._next_id = 0
+        self._corpus: Optional[Tuple[List[int], List[List[float]]]] = None
+
+        rng = random.Random(seed)
+        self._planes: List[List[List[float]]] = []
+        self._buckets: List[Dict[int, Set[int]]] = []
+        if mode == LSH:
+            self._planes = [
+                [[rng.gauss(0.0, 1.0) for _ in range(dimension)] for _ in range(bits)]
+                for _ in range(tables)
+            ]
+            self._buckets = [{} for _ in range(tables)]
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def __contains__(self, vector_id: object) -> bool:
+        return vector_id in self._vectors
+
+    def _normalize(self, values: Sequence[float]) -> List[float]:
+        if len(values) != self.dimension:
+            raise ValueError("Invalid input: vectors must have the same length!")
+        length = sqrt(sum(map(mul, values, values), 0.0))
+        if length == 0:
+            raise ValueError("Invalid input: vectors must be non-zero!")
+        return [value / length for value in values]
+
+    def _projections(self, unit: List[float]) -> List[List[float]]:
+        return [
+            [sum(map(mul, plane, unit), 0.0) for plane in planes]
+            for planes in self._planes
+        ]
+
+    @staticmethod
+    def _signature(projections: List[float]) -> int:
+        signature = 0
+        for bit, value in enumerate(projections):
+            if value >= 0.0:
+                signature |= 1 << bit
+        return signature
+
+    def add(self, vector: VectorLike) -> int:
+        """
+        Adds a vector to the index.
+
+        Args:
+            vector: Vector (list of numbers or Vector) of the index dimension
+
+        Returns:
+            Id of the vector, used by remove and in search results
+
+        Raises:
+            ValueError: If the vector has a wrong length or is a zero vector
+        """
+        return self._insert(self._normalize(_values(vector)))
+
+    def _insert(self, unit: List[float]) -> int:
+        vector_id = self._next_id
+        self._next_id += 1
+        self._vectors[vector_id] = unit
+        if self._buckets:
+            signatures = [self._signature(p) for p in self._projections(unit)]
+            for buckets, signature in zip(self._buckets, signatures):
+                buckets.setdefault(signature, set()).add(vector_id)
+            self._signatures[vector_id] = signatures
+        self._corpus = None
+        return vector_id
+
+    def add_many(self, vectors: VectorBatch) -> List[int]:
+        """
+        Adds a batch of vectors.
+
+        Returns:
+            Ids of the vectors, in order
+        """
+        return [
+            self._insert(self._normalize(values)) for values in _batch_values(vectors)
+        ]
+
+    def remove(self, vector_id: int) -> None:
+        """
+        Removes a vector from the index.
+
+        Raises:
+            KeyError: If there is no vector with this id
+        """
+        del self._vectors[vector_id]
+        for buckets, signature in zip(
+            self._buckets, self._signatures.pop(vector_id, ())
+        ):
+            bucket = buckets[signature]
+            bucket.discard(vector_id)
+            if not bucket:
+                del buckets[signature]
+        self._corpus = None
+
+    def _candidates(self, unit: List[float]) -> Iterable[int]:
+        """Ids in the query's buckets and in the probed neighbouring buckets."""
+        candidates: Set[int] = set()
+        for buckets, projections in zip(self._buckets, self._projections(unit)):
+            signature = self._signature(projections)
+            # Bits whose projection is closest to zero are the likeliest
+            # to differ for a near neighbour, so they are flipped first
+            uncertain = sorted(
+                range(len(projections)), key=lambda b: abs(projections[b])
+            )
+            flips = uncertain[: self.probes + 1]
+            for count in range(self.probes + 1):
+                for bits in combinations(flips, count):
+                    probe = signature
+                    for bit in bits:
+                        probe ^= 1 << bit
+                    candidates.update(buckets.get(probe, ()))
+        return candidates
+
+    def search(self, query: VectorLike, k: int) -> List[Match]:
+        """
+        Finds the k indexed vectors most similar to a query.
+
+        Args:
+            query: Query vector of the index dimension
+            k: Number of results
+
+        Returns:
+            (id, cosine) pairs, most similar first; in LSH mode fewer than k
+            pairs if the probed buckets hold fewer vectors
+
+        Raises:
+            ValueError: If the query has a wrong length or is a zero vector
+        """
+        return self._search(self._normalize(_values(query)), k)
+
+    def _search(self, unit: List[float], k: int) -> List[Match]:
+        if self.mode == EXACT:
+            candidates: Iterable[int] = self._vectors
+        else:
+            candidates = self._candidates(unit)
+        vectors = self._vectors
+        scored = (
+            (vector_id, dot_product(unit, vectors[vector_id], check=False))
+            for vector_id in candidates
+        )
+        return nlargest(k, scored, key=itemgetter(1))
+
+    def search_batch(
+        self, queries: VectorBatch, k: int, use_numpy: Optional[bool] = None
+    ) -> List[List[Match]]:
+        """
+        Searches for several queries at once.
+
+        In EXACT mode all similarities are computed by top_k_similar as
+        one batch (with NumPy for large batches if installed).
+
+        Args:
+            queries: Batch of query vectors
+            k: Number of results per query
+            use_numpy: Passed to top_k_similar in EXACT mode
+
+        Returns:
+            Results of search for every query
+        """
+        if self.mode == LSH:
+            return [
+                self._search(self._normalize(values), k)
+                for values in _batch_values(queries)
+            ]
+        if not self._vectors:
+            return [[] for _ in _batch_values(queries)]
+        if self._corpus is None:
+            ids = list(self._vectors)
+            self._corpus = ids, [self._vectors[vector_id] for vector_id in ids]
+        ids, corpus = self._corpus
+        return [
+            [(ids[j], cosine) for j, cosine in matches]
+            for matches in top_k_similar(queries, corpus, k, use_numpy)
+        ]
@@ -1,14 +1,42 @@
+from array import array
+from collections import OrderedDict
+from heapq import nlargest
+from itertools import repeat
 from math import *
-from typing import List
+from operator import add, mul
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
 
+from project.dense import Matrix, Vector
 
-def dot_product(vec1: List[float], vec2: List[float]) -> float:
+try:
+    import numpy  # type: ignore
+except ImportError:  # NumPy is optional
+    numpy = None  # type: ignore
+
+VectorLike = Union[List[float], Vector]
+VectorBatch = Union[Sequence[VectorLike], Matrix]
+
+NUMPY_THRESHOLD = 32**3
+"""Minimal pairs * dimension product for which NumPy is used if installed."""
+
+NORM_CACHE_SIZE = 4096
+"""Default number of vectors whose lengths a NormCache remembers."""
+
+
+def _values(vec: VectorLike) -> Sequence[float]:
+    """Returns the memoryview of a Vector or the list itself."""
+    return vec.data if isinstance(vec, Vector) else vec
+
+
+def dot_product(vec1: VectorLike, vec2: VectorLike, check: bool = True) -> float:
     """
     Calculates the dot product of two vectors.
 
     Args:
-        vec1: First vector (list of numbers)
-        vec2: Second vector (list of numbers)
+        vec1: First vector (list of numbers or Vector)
+        vec2: Second vector (list of numbers or Vector)
+        check: Compare lengths; with False vectors of different lengths are
+            silently truncated to the shorter one
 
     Returns:
         Dot product of vectors
@@ -16,54 +44,436 @@ def dot_product(vec1: List[float], vec2: List[float]) -> float:
     Raises:
         ValueError: If vectors have different lengths
     """
-    if len(vec1) != len(vec2):
+    if check and len(vec1) != len(vec2):
         raise ValueError("Invalid input: vectors must have the same length!")
     else:
-        result = 0.0
-        for i in range(len(vec1)):
-            result += vec1[i] * vec2[i]
-        return result
+        return sum(map(mul, _values(vec1), _values(vec2)), 0.0)
 
 
-def vector_length(vec: List[float]) -> float:
+def vector_length(vec: VectorLike) -> float:
     """
     Calculates the length of a vector.
 
     Args:
-        vec: Vector (list of numbers)
+        vec: Vector (list of numbers or Vector)
 
     Returns:
         Length of the vector
     """
-    sm_sq = 0.0
-    for num in vec:
-        sm_sq += num**2
-    return sqrt(sm_sq)
+    values = _values(vec)
+    return sqrt(sum(map(mul, values, values), 0.0))
+
+
+def _assign(target: VectorLike, values: Iterable[float]) -> None:
+    """Overwrites the elements of a list or a Vector in place."""
+    if isinstance(target, Vector):
+        target.data[:] = array("d", values)
+    else:
+        target[:] = values
+
+
+def vector_add(
+    vec1: VectorLike, vec2: VectorLike, out: Optional[VectorLike] = None
+) -> VectorLike:
+    """
+    Adds two vectors.
+
+    Args:
+        vec1: First vector (list of numbers or Vector)
+        vec2: Second vector (list of numbers or Vector)
+        out: List or Vector to write the sum into instead of allocating
+            a new one; it may be one of the operands
+
+    Returns:
+        Sum of vectors: out if given, a Vector if any operand is a Vector,
+        otherwise a list
+
+    Raises:
+        ValueError: If vectors (or out) have different lengths
+    """
+    if len(vec1) != len(vec2) or (out is not None and len(out) != len(vec1)):
+        raise ValueError("Invalid input: vectors must have the same length!")
+    values = map(add, _values(vec1), _values(vec2))
+    if out is not None:
+        _assign(out, values)
+        return out
+    if isinstance(vec1, Vector) or isinstance(vec2, Vector):
+        return Vector(values)
+    return list(values)
+
+
+def axpy(alpha: float, vec_x: VectorLike, vec_y: VectorLike) -> VectorLike:
+    """
+    Computes vec_y += alpha * vec_x in place (BLAS axpy).
+
+    Args:
+        alpha: Scale factor
+        vec_x: Vector to scale and add (list of numbers or Vector)
+        vec_y: Vector to update (list of numbers or Vector)
+
+    Returns:
+        vec_y
+
+    Raises:
+        ValueError: If vectors have different lengths
+    """
+    if len(vec_x) != len(vec_y):
+        raise ValueError("Invalid input: vectors must have the same length!")
+    _assign(vec_y, map(add, _values(vec_y), map(mul, _values(vec_x), repeat(alpha))))
+    return vec_y
+
+
+class NormCache:
+    """
+    Bounded memo of vector lengths, keyed by vector identity.
+
+    For workloads comparing queries with a fixed corpus, pass one cache to
+    vector_angle or cosine_similarity and every corpus vector's length is
+    computed once. A content hash would cost as much as the length itself,
+    so the key is id(): the cache keeps a reference to each vector (the id
+    cannot be reused while it is cached) and the caller must not modify a
+    vector while it is cached, or must call discard for it. The least
+    recently used entries are dropped beyond maxsize.
+    """
+
+    def __init__(self, maxsize: int = NORM_CACHE_SIZE) -> None:
+        """
+        Args:
+            maxsize: Number of vectors to remember
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._lengths: "OrderedDict[int, Tuple[VectorLike, float]]" = OrderedDict()
+
+    def length(self, vec: VectorLike) -> float:
+        """
+        Args:
+            vec: Vector (list of numbers or Vector)
+
+        Returns:
+            Length of the vector, computed only on the first request
+        """
+        key = id(vec)
+        entry = self._lengths.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._lengths.move_to_end(key)
+            return entry[1]
+        self.misses += 1
+        length = vector_length(vec)
+        self._lengths[key] = (vec, length)
+        if len(self._lengths) > self.maxsize:
+            self._lengths.popitem(last=False)
+        return length
+
+    def discard(self, vec: VectorLike) -> None:
+        """Forgets the length of a vector, e.g. after modifying it."""
+        self._lengths.pop(id(vec), None)
 
+    def clear(self) -> None:
+        """Forgets all lengths, e.g. after modifying many vectors."""
+        self._lengths.clear()
 
-def vector_angle(vec1: List[float], vec2: List[float]) -> float:
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+
+def cosine_similarity(
+    vec1: VectorLike,
+    vec2: VectorLike,
+    check: bool = True,
+    norms: Optional[NormCache] = None,
+) -> float:
+    """
+    Calculates the cosine of the angle between two vectors.
+
+    Args:
+        vec1: First vector (list of numbers or Vector)
+        vec2: Second vector (list of numbers or Vector)
+        check: Compare lengths, see dot_product
+        norms: Cache to take vector lengths from
+
+    Returns:
+        Cosine, clamped to [-1, 1] against rounding error
+
+    Raises:
+        ValueError: If vectors have different lengths or are zero vectors
+    """
+    if check and len(vec1) != len(vec2):
+        raise ValueError("Invalid input: vectors must have the same length!")
+    dot = dot_product(vec1, vec2, check=False)
+    if norms is None:
+        len1, len2 = vector_length(vec1), vector_length(vec2)
+    else:
+        len1, len2 = norms.length(vec1), norms.length(vec2)
+    if len1 == 0 or len2 == 0:
+        raise ValueError("Invalid input: vectors must be non-zero!")
+    return max(-1.0, min(1.0, dot / (len1 * len2)))
+
+
+def vector_angle(
+    vec1: VectorLike,
+    vec2: VectorLike,
+    check: bool = True,
+    norms: Optional[NormCache] = None,
+) -> float:
     """
     Calculates the angle between two vectors in radians.
 
     Args:
-        vec1: First vector (list of numbers)
-        vec2: Second vector (list of numbers)
+        vec1: First vector (list of numbers or Vector)
+        vec2: Second vector (list of numbers or Vector)
+        check: Compare lengths, see dot_product
+        norms: Cache to take vector lengths from, see NormCache
 
     Returns:
-        Angle between vectors in radians
+        Angle between vectors in radians; nearly parallel vectors give 0.0
+        instead of a math domain error from rounding
 
     Raises:
         ValueError: If vectors have different lengths or are zero vectors
     """
-    if len(vec1) != len(vec2):
+    return acos(cosine_similarity(vec1, vec2, check, norms))
+
+
+def _batch_values(vectors: VectorBatch) -> List[Sequence[float]]:
+    """
+    Values of every vector of a batch; rows of a Matrix are memoryview slices.
+
+    Raises:
+        ValueError: If vectors have different lengths
+    """
+    if isinstance(vectors, Matrix):
+        return [vectors.row_data(i) for i in range(vectors.rows)]
+    values = [_values(vec) for vec in vectors]
+    if values and any(len(vec) != len(values[0]) for vec in values):
+        raise ValueError("Invalid input: vectors must have the same length!")
+    return values
+
+
+def _check_dimensions(
+    values1: List[Sequence[float]], values2: List[Sequence[float]]
+) -> None:
+    if values1 and values2 and len(values1[0]) != len(values2[0]):
         raise ValueError("Invalid input: vectors must have the same length!")
 
+
+def _lengths(values: List[Sequence[float]]) -> List[float]:
+    return [sqrt(sum(map(mul, vec, vec), 0.0)) for vec in values]
+
+
+def _use_numpy(use_numpy: Optional[bool], work: int) -> bool:
+    """
+    Chooses NumPy if it is forced, or if it is installed and work (number of
+    multiplications) reaches NUMPY_THRESHOLD.
+    """
+    if use_numpy is None:
+        return numpy is not None and work >= NUMPY_THRESHOLD
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed!")
+    return use_numpy
+
+
+def _pair_work(values1: List[Sequence[float]], values2: List[Sequence[float]]) -> int:
+    return len(values1) * len(values2) * (len(values1[0]) if values1 else 0)
+
+
+def _numpy_cosines(
+    values1: List[Sequence[float]], values2: List[Sequence[float]]
+) -> Any:
+    array1 = numpy.asarray(values1, dtype=float).reshape(len(values1), -1)
+    array2 = numpy.asarray(values2, dtype=float).reshape(len(values2), -1)
+    lengths1 = numpy.linalg.norm(array1, axis=1)
+    lengths2 = numpy.linalg.norm(array2, axis=1)
+    if not (lengths1.all() and lengths2.all()):
+        raise ValueError("Invalid input: vectors must be non-zero!")
+    cosines = (array1 @ array2.T) / numpy.outer(lengths1, lengths2)
+    return numpy.clip(cosines, -1.0, 1.0)
+
+
+def _cosine_rows(
+    values1: List[Sequence[float]], values2: List[Sequence[float]]
+) -> List[List[float]]:
+    """Pure Python cosine matrix: norms are computed once, each pair in one pass."""
+    lengths1 = _lengths(values1)
+    lengths2 = _lengths(values2)
+    if 0.0 in lengths1 or 0.0 in lengths2:
+        raise ValueError("Invalid input: vectors must be non-zero!")
+    return [
+        [
+            max(-1.0, min(1.0, sum(map(mul, vec1, vec2), 0.0) / (len1 * len2)))
+            for vec2, len2 in zip(values2, lengths2)
+        ]
+        for vec1, len1 in zip(values1, lengths1)
+    ]
+
+
+def dot_products(
+    vectors1: VectorBatch,
+    vectors2: VectorBatch,
+    use_numpy: Optional[bool] = None,
+    out: Optional[List[List[float]]] = None,
+) -> List[List[float]]:
+    """
+    Calculates dot products of all pairs of vectors from two batches.
+
+    Args:
+        vectors1: First batch (sequence of vectors or Matrix of row vectors)
+        vectors2: Second batch
+        use_numpy: Force (True) or forbid (False) the NumPy backend;
+            by default NumPy is used for large batches if installed
+        out: List of lists to write the products into instead of
+            allocating a new one
+
+    Returns:
+        Matrix (list of lists) where element [i][j] is vectors1[i] . vectors2[j]
+
+    Raises:
+        ValueError: If vectors have different lengths or out has a wrong shape
+    """
+    values1, values2 = _batch_values(vectors1), _batch_values(vectors2)
+    _check_dimensions(values1, values2)
+    if out is not None and (
+        len(out) != len(values1) or any(len(row) != len(values2) for row in out)
+    ):
+        raise ValueError("Output matrix must have the shape of the result!")
+    if _use_numpy(use_numpy, _pair_work(values1, values2)):
+        array1 = numpy.asarray(values1, dtype=float).reshape(len(values1), -1)
+        array2 = numpy.asarray(values2, dtype=float).reshape(len(values2), -1)
+        products = (array1 @ array2.T).tolist()
+        if out is None:
+            return products
+        for target, row in zip(out, products):
+            target[:] = row
+        return out
+    if out is None:
+        out = [[0.0] * len(values2) for _ in values1]
+    for target, vec1 in zip(out, values1):
+        target[:] = [sum(map(mul, vec1, vec2), 0.0) for vec2 in values2]
+    return out
+
+
+def vector_lengths(
+    vectors: VectorBatch,
+    use_numpy: Optional[bool] = None,
+    out: Optional[VectorLike] = None,
+) -> VectorLike:
+    """
+    Calculates the length of every vector of a batch.
+
+    Args:
+        vectors: Batch of vectors (sequence of vectors or Matrix of row vectors)
+        use_numpy: Force (True) or forbid (False) the NumPy backend
+        out: List or Vector to write the lengths into
+
+    Returns:
+        List of lengths (out if given)
+
+    Raises:
+        ValueError: If out has a different length than the batch
+    """
+    values = _batch_values(vectors)
+    if out is not None and len(out) != len(values):
+        raise ValueError("Invalid input: vectors must have the same length!")
+    if _use_numpy(use_numpy, len(values) * (len(values[0]) if values else 0)):
+        matrix = numpy.asarray(values, dtype=float).reshape(len(values), -1)
+        lengths = numpy.linalg.norm(matrix, axis=1).tolist()
     else:
-        dot = dot_product(vec1, vec2)
-        len1 = vector_length(vec1)
-        len2 = vector_length(vec2)
+        lengths = _lengths(values)
+    if out is None:
+        return lengths
+    _assign(out, lengths)
+    return out
+
+
+def cosine_similarities(
+    vectors1: VectorBatch, vectors2: VectorBatch, use_numpy: Optional[bool] = None
+) -> List[List[float]]:
+    """
+    Calculates cosines of angles between all pairs of vectors from two batches.
+
+    Args:
+        vectors1: First batch (sequence of vectors or Matrix of row vectors)
+        vectors2: Second batch
+        use_numpy: Force (True) or forbid (False) the NumPy backend
+
+    Returns:
+        Matrix (list of lists) of cosines, clamped to [-1, 1]
+
+    Raises:
+        ValueError: If vectors have different lengths or are zero vectors
+    """
+    values1, values2 = _batch_values(vectors1), _batch_values(vectors2)
+    _check_dimensions(values1, values2)
+    if _use_numpy(use_numpy, _pair_work(values1, values2)):
+        return _numpy_cosines(values1, values2).tolist()
+    return _cosine_rows(values1, values2)
+
+
+def vector_angles(
+    vectors1: VectorBatch, vectors2: VectorBatch, use_numpy: Optional[bool] = None
+) -> List[List[float]]:
+    """
+    Calculates angles in radians between all pairs of vectors from two batches.
+
+    Args:
+        vectors1: First batch (sequence of vectors or Matrix of row vectors)
+        vectors2: Second batch
+        use_numpy: Force (True) or forbid (False) the NumPy backend
+
+    Returns:
+        Matrix (list of lists) of angles
+
+    Raises:
+        ValueError: If vectors have different lengths or are zero vectors
+    """
+    values1, values2 = _batch_values(vectors1), _batch_values(vectors2)
+    _check_dimensions(values1, values2)
+    if _use_numpy(use_numpy, _pair_work(values1, values2)):
+        return numpy.arccos(_numpy_cosines(values1, values2)).tolist()
+    return [list(map(acos, row)) for row in _cosine_rows(values1, values2)]
+
+
+def top_k_similar(
+    queries: VectorBatch,
+    corpus: VectorBatch,
+    k: int,
+    use_numpy: Optional[bool] = None,
+) -> List[List[Tuple[int, float]]]:
+    """
+    Finds the k corpus vectors most similar (by cosine) to every query.
+
+    Args:
+        queries: Batch of query vectors
+        corpus: Batch of vectors to search in
+        k: Number of results per query
+        use_numpy: Force (True) or forbid (False) the NumPy backend
+
+    Returns:
+        For every query, a list of (corpus index, cosine) pairs,
+        most similar first; equal cosines are ordered by index
+
+    Raises:
+        ValueError: If vectors have different lengths or are zero vectors
+    """
+    values1, values2 = _batch_values(queries), _batch_values(corpus)
+    _check_dimensions(values1, values2)
+    k = min(k, len(values2))
+    if k <= 0:
+        return [[] for _ in values1]
 
-        if len1 == 0 or len2 == 0:
-            raise ValueError("Invalid input: vectors must be non-zero!")
+    if _use_numpy(use_numpy, _pair_work(values1, values2)):
+        cosines = _numpy_cosines(values1, values2)
+        # A stable sort, unlike argpartition, gives ties to the lower index
+        ranked = numpy.argsort(-cosines, axis=1, kind="stable")[:, :k]
+        return [
+            [(int(j), float(row[j])) for j in indices]
+            for row, indices in zip(cosines, ranked)
+        ]
 
-        return acos(dot / (len1 * len2))
+    result = []
+    for row in _cosine_rows(values1, values2):
+        best = nlargest(k, range(len(row)), key=row.__getitem__)
+        result.append([(j, row[j]) for j in best])
+    return result
@@ -0,0 +1,85 @@
+import argparse
+import random
+import sys
+import tracemalloc
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.dense import Matrix  # noqa: E402
+from project.matrices import matrix_add, matrix_axpy, matrix_multiply  # noqa: E402
+
+
+def random_matrix(size, rng):
+    return [[rng.uniform(-1.0, 1.0) for _ in range(size)] for _ in range(size)]
+
+
+def fresh_step(a, x, y):
+    """One iteration allocating every result: y = y + 0.5 * (a @ x) + x"""
+    product = matrix_multiply(a, x, use_numpy=False)
+    half = [[0.5 * value for value in row] for row in product]
+    return matrix_add(matrix_add(y, half), x)
+
+
+def out_step(a, x, y, buffer):
+    """The same iteration writing into preallocated storage"""
+    matrix_multiply(a, x, use_numpy=False, out=buffer)
+    matrix_axpy(0.5, buffer, y)
+    matrix_add(y, x, out=y)
+    return y
+
+
+def measure(step, iterations):
+    """
+    Runs step after one warm-up call and reports, per iteration, the memory
+    kept alive (current) and the largest transient footprint (peak).
+    """
+    tracemalloc.start()
+    # Warm up while tracing, so replacing untraced objects is not counted
+    step()
+    baseline, _ = tracemalloc.get_traced_memory()
+    peak = 0
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        step()
+        current, step_peak = tracemalloc.get_traced_memory()
+        peak = max(peak, step_peak - current)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (current - baseline) / iterations, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Memory allocated per iteration with and without out="
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16, 64, 128])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f"{'size':>6}{'kind':>14}{'kept B/iter':>14}"
+        f"{'fresh peak, B':>16}{'out= peak, B':>16}"
+    )
+    for size in args.sizes:
+        a, x = random_matrix(size, rng), random_matrix(size, rng)
+        for kind, wrap in (("list", lambda m: m), ("Matrix", Matrix)):
+            ma, mx = wrap(a), wrap(x)
+            state = {"y": wrap(random_matrix(size, rng))}
+
+            def fresh():
+                state["y"] = fresh_step(ma, mx, state["y"])
+
+            y = wrap(random_matrix(size, rng))
+            buffer = wrap([[0.0] * size for _ in range(size)])
+            kept, out_peak = measure(
+                lambda: out_step(ma, mx, y, buffer), args.iterations
+            )
+            _, fresh_peak = measure(fresh, args.iterations)
+            print(f"{size:>6}{kind:>14}{kept:>14.1f}{fresh_peak:>16}{out_peak:>16}")
+
+
+if __name__ == "__main__":
+    main()
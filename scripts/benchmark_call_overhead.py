@@ -0,0 +1,48 @@
+import argparse
+import sys
+import timeit
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.dense import Matrix, Vector  # noqa: E402
+from project.matrices import matrix_add, matrix_multiply  # noqa: E402
+from project.vectors import dot_product, vector_angle  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-call overhead of validation on tiny operands"
+    )
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    vec1, vec2 = [1.0, 2.0, 3.0], [4.0, 5.0, 6.0]
+    mat1, mat2 = [[1.0, 2.0], [3.0, 4.0]], [[5.0, 6.0], [7.0, 8.0]]
+    dense_vec1, dense_vec2 = Vector(vec1), Vector(vec2)
+    dense1, dense2 = Matrix(mat1), Matrix(mat2)
+    cases = [
+        ("dot_product, lists", lambda: dot_product(vec1, vec2)),
+        ("dot_product, check=False", lambda: dot_product(vec1, vec2, check=False)),
+        ("dot_product, Vector", lambda: dot_product(dense_vec1, dense_vec2)),
+        ("vector_angle, lists", lambda: vector_angle(vec1, vec2)),
+        ("vector_angle, check=False", lambda: vector_angle(vec1, vec2, check=False)),
+        ("matrix_add 2x2, lists", lambda: matrix_add(mat1, mat2)),
+        ("matrix_add 2x2, check=False", lambda: matrix_add(mat1, mat2, check=False)),
+        ("matrix_add 2x2, Matrix", lambda: matrix_add(dense1, dense2)),
+        ("matrix_multiply 2x2, lists", lambda: matrix_multiply(mat1, mat2)),
+        (
+            "matrix_multiply 2x2, check=False",
+            lambda: matrix_multiply(mat1, mat2, check=False),
+        ),
+        ("matrix_multiply 2x2, Matrix", lambda: matrix_multiply(dense1, dense2)),
+    ]
+    print(f"{'case':<36}{'ns/call':>10}")
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=args.number, repeat=3))
+        print(f"{name:<36}{best / args.number * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import random
+import sys
+import time
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project import matrices  # noqa: E402
+
+
+def naive_multiply(matrix1, matrix2):
+    """Textbook triple loop used as the reference implementation."""
+    rows, inner, cols = len(matrix1), len(matrix2), len(matrix2[0])
+    result = []
+    for i in range(rows):
+        row = []
+        for j in range(cols):
+            sum_val = 0.0
+            for k in range(inner):
+                sum_val += matrix1[i][k] * matrix2[k][j]
+            row.append(sum_val)
+        result.append(row)
+    return result
+
+
+def random_matrix(size, rng):
+    return [[rng.random() for _ in range(size)] for _ in range(size)]
+
+
+def measure(func, *args, repeat=3):
+    """Returns the best wall time of several runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark matrix_multiply")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[8, 16, 32, 64, 128, 256, 512, 1024]
+    )
+    parser.add_argument(
+        "--naive-limit", type=int, default=256, help="largest size for the naive loop"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(
+        f"{'size':>6}{'naive, s':>12}{'blocked, s':>12}{'numpy, s':>12}{'speedup':>10}"
+    )
+    for size in args.sizes:
+        a, b = random_matrix(size, rng), random_matrix(size, rng)
+        repeat = args.repeat if size <= 256 else 1
+        naive = (
+            measure(naive_multiply, a, b, repeat=repeat)
+            if size <= args.naive_limit
+            else None
+        )
+        blocked = measure(
+            lambda x, y: matrices.matrix_multiply(x, y, use_numpy=False),
+            a,
+            b,
+            repeat=repeat,
+        )
+        numpy_time = (
+            measure(
+                lambda x, y: matrices.matrix_multiply(x, y, use_numpy=True),
+                a,
+                b,
+                repeat=repeat,
+            )
+            if matrices.numpy is not None
+            else None
+        )
+        print(
+            f"{size:>6}"
+            f"{naive if naive is not None else float('nan'):>12.5f}"
+            f"{blocked:>12.5f}"
+            f"{numpy_time if numpy_time is not None else float('nan'):>12.5f}"
+            f"{naive / blocked if naive is not None else float('nan'):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.matrices import matrix_multiply  # noqa: E402
+from project.parallel_matrices import parallel_matrix_multiply  # noqa: E402
+
+
+def random_matrix(size, rng):
+    return [[rng.random() for _ in range(size)] for _ in range(size)]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Scaling of parallel_matrix_multiply from 1 to N processes"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[32, 64, 128, 256, 512])
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    worker_counts = [1]
+    while worker_counts[-1] * 2 <= args.max_workers:
+        worker_counts.append(worker_counts[-1] * 2)
+    if worker_counts[-1] != args.max_workers:
+        worker_counts.append(args.max_workers)
+
+    rng = random.Random(0)
+    print(f"{'size':>6}" + "".join(f"{f'{n} proc, s':>14}" for n in worker_counts))
+    crossover = None
+    for size in args.sizes:
+        a, b = random_matrix(size, rng), random_matrix(size, rng)
+        serial = measure(lambda x, y: matrix_multiply(x, y, use_numpy=False), a, b)
+        times = [serial] + [
+            measure(parallel_matrix_multiply, a, b, workers)
+            for workers in worker_counts[1:]
+        ]
+        print(f"{size:>6}" + "".join(f"{t:>14.4f}" for t in times))
+        if crossover is None and len(times) > 1 and min(times[1:]) < serial:
+            crossover = size
+
+    if crossover is None:
+        print("Parallel multiplication did not pay off for the tested sizes")
+    else:
+        print(
+            f"Crossover: parallel multiplication is faster from {crossover}x{crossover}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import random
+import sys
+import timeit
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.Yatzy.scoring import (  # noqa: E402
+    Category,
+    _calculate_score,
+    calculate_score,
+    score_vector,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Yatzy scoring: table lookup against computing from scratch"
+    )
+    parser.add_argument("--rolls", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    rolls = [[rng.randint(1, 6) for _ in range(5)] for _ in range(args.rolls)]
+    categories = list(Category)
+
+    def reference():
+        for dice in rolls:
+            for category in categories:
+                _calculate_score(dice, category)
+
+    def table():
+        for dice in rolls:
+            for category in categories:
+                calculate_score(dice, category)
+
+    def vector():
+        for dice in rolls:
+            score_vector(dice)
+
+    cases = [
+        ("computed, one call per category", reference),
+        ("table, one call per category", table),
+        ("table, score_vector", vector),
+    ]
+    print(f"{'case':<34}{'ns/roll':>10}")
+    for name, func in cases:
+        best = min(timeit.repeat(func, number=1, repeat=5))
+        print(f"{name:<34}{best / args.rolls * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import sys
+import time
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project import strassen  # noqa: E402
+from project.matrices import matrix_multiply  # noqa: E402
+
+
+def random_matrix(size, rng):
+    return [[rng.uniform(-1.0, 1.0) for _ in range(size)] for _ in range(size)]
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def max_error(result, expected):
+    return max(
+        abs(value - reference)
+        for row, expected_row in zip(result, expected)
+        for value, reference in zip(row, expected_row)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark strassen_multiply against the classic kernel"
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[64, 128, 256, 384, 512]
+    )
+    parser.add_argument(
+        "--cutoff", type=int, default=None, help="skip tuning and use this cutoff"
+    )
+    args = parser.parse_args()
+
+    if args.cutoff is None:
+        start = time.perf_counter()
+        cutoff = strassen.tune_cutoff()
+        print(f"Tuned cutoff: {cutoff} ({time.perf_counter() - start:.2f} s)")
+    else:
+        cutoff = args.cutoff
+
+    rng = random.Random(0)
+    header = f"{'size':>6}{'classic, s':>12}"
+    for variant in strassen.VARIANTS:
+        header += f"{f'{variant}, s':>14}{'speedup':>9}{'max error':>12}"
+    print(header)
+    for size in args.sizes:
+        a, b = random_matrix(size, rng), random_matrix(size, rng)
+        classic, expected = measure(
+            lambda x, y: matrix_multiply(x, y, use_numpy=False), a, b
+        )
+        line = f"{size:>6}{classic:>12.4f}"
+        for variant in strassen.VARIANTS:
+            elapsed, result = measure(
+                lambda x, y: strassen.strassen_multiply(x, y, cutoff, variant), a, b
+            )
+            line += (
+                f"{elapsed:>14.4f}{classic / elapsed:>9.2f}"
+                f"{max_error(result, expected):>12.2e}"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
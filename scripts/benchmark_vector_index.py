@@ -0,0 +1,66 @@
+import argparse
+import random
+import sys
+import time
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.vector_index import EXACT, LSH, VectorIndex  # noqa: E402
+
+
+def random_vectors(count, dimension, rng):
+    return [[rng.gauss(0.0, 1.0) for _ in range(dimension)] for _ in range(count)]
+
+
+def run(index, queries, k):
+    start = time.perf_counter()
+    results = [index.search(query, k) for query in queries]
+    return results, len(queries) / (time.perf_counter() - start)
+
+
+def recall(results, truth, k):
+    hits = sum(
+        len({i for i, _ in found} & {i for i, _ in expected})
+        for found, expected in zip(results, truth)
+    )
+    return hits / (k * len(truth))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@k versus queries/sec")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--dimension", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vectors = random_vectors(args.count, args.dimension, rng)
+    # Queries are perturbed corpus vectors, like lookups of near duplicates
+    queries = [
+        [value + rng.gauss(0.0, 0.3) for value in rng.choice(vectors)]
+        for _ in range(args.queries)
+    ]
+
+    exact = VectorIndex(args.dimension, EXACT)
+    exact.add_many(vectors)
+    truth, exact_qps = run(exact, queries, args.k)
+    start = time.perf_counter()
+    exact.search_batch(queries, args.k)
+    batch_qps = args.queries / (time.perf_counter() - start)
+
+    print(f"{'index':<34}{f'recall@{args.k}':>10}{'queries/s':>12}")
+    print(f"{'exact':<34}{1.0:>10.3f}{exact_qps:>12.1f}")
+    print(f"{'exact, batched':<34}{1.0:>10.3f}{batch_qps:>12.1f}")
+    for tables, bits, probes in [(4, 12, 0), (8, 12, 1), (8, 10, 2), (16, 10, 2)]:
+        index = VectorIndex(args.dimension, LSH, tables, bits, probes, seed=1)
+        index.add_many(vectors)
+        results, qps = run(index, queries, args.k)
+        name = f"lsh tables={tables} bits={bits} probes={probes}"
+        print(f"{name:<34}{recall(results, truth, args.k):>10.3f}{qps:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import sys
+import time
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.Yatzy.batch import simulate_batch  # noqa: E402
+from project.Yatzy.engine import simulate  # noqa: E402
+from project.Yatzy.player import AdaptiveBot, ConservativeBot, RiskyBot  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Yatzy games per second")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--batch-games", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'bot':<18}{'mode':<8}{'games/s':>10}{'mean':>10}")
+    for bot in (ConservativeBot, RiskyBot, AdaptiveBot):
+        start = time.perf_counter()
+        stats = simulate(args.games, [bot(bot.__name__)], seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{bot.__name__:<18}{'engine':<8}{args.games / elapsed:>10.0f}"
+            f"{stats.players[0].mean:>10.1f}"
+        )
+        start = time.perf_counter()
+        scores = simulate_batch(args.batch_games, bot, seed=args.seed)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{bot.__name__:<18}{'batch':<8}{args.batch_games / elapsed:>10.0f}"
+            f"{scores.mean():>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+import os
+import sys
+import time
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.Yatzy.player import AdaptiveBot, ConservativeBot, RiskyBot  # noqa: E402
+from project.Yatzy.tournament import run_tournament  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Tournament throughput by number of worker processes"
+    )
+    parser.add_argument("--games", type=int, default=6000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    players = [ConservativeBot("Safe"), RiskyBot("Risky"), AdaptiveBot("Adaptive")]
+    print(f"{'workers':>8}{'games/s':>10}{'speedup':>10}")
+    base = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        result = run_tournament(players, args.games, workers, early_stop=False)
+        rate = result.games / (time.perf_counter() - start)
+        base = base or rate
+        print(f"{workers:>8}{rate:>10.0f}{rate / base:>10.2f}")
+    for name, stats in result.summary().items():
+        low, high = stats["win_interval"]
+        print(f"{name:<10} win rate {stats['win_rate']:.3f} [{low:.3f}, {high:.3f}]")
+
+
+if __name__ == "__main__":
+    main()
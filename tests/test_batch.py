@@ -0,0 +1,106 @@
+import random
+from collections import Counter
+
+import pytest
+from project.Yatzy.batch import STRATEGIES, BatchRoller, batch_scores, simulate_batch
+from project.Yatzy.scoring import Category, score_vector
+
+
+class TestBatchRoller:
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_roll(self, use_numpy):
+        if use_numpy:
+            pytest.importorskip("numpy")
+        roller = BatchRoller(seed=1, use_numpy=use_numpy)
+        dice = roller.roll(2000)
+        values = Counter(int(value) for row in dice for value in row)
+
+        assert len(dice) == 2000
+        assert all(len(row) == 5 for row in dice)
+        assert set(values) == {1, 2, 3, 4, 5, 6}
+        assert all(1500 < count < 1850 for count in values.values())
+
+    @pytest.mark.parametrize("use_numpy", [False, True])
+    def test_reroll_keeps_dice(self, use_numpy):
+        if use_numpy:
+            numpy = pytest.importorskip("numpy")
+        roller = BatchRoller(seed=2, use_numpy=use_numpy)
+        dice = roller.roll(100)
+        keep = [[i % 2 == 0] * 5 for i in range(100)]
+        if use_numpy:
+            keep = numpy.array(keep)
+        rerolled = roller.reroll(dice, keep)
+
+        for i in range(0, 100, 2):
+            assert list(rerolled[i]) == list(dice[i])
+        changed = sum(list(rerolled[i]) != list(dice[i]) for i in range(1, 100, 2))
+        assert changed > 40
+
+    def test_seed(self):
+        first = BatchRoller(seed=3, use_numpy=False).roll(10)
+        assert BatchRoller(seed=3, use_numpy=False).roll(10) == first
+
+
+class TestSimulateBatch:
+    def test_batch_scores(self):
+        pytest.importorskip("numpy")
+        dice = BatchRoller(seed=4).roll(500)
+        scores = batch_scores(dice)
+        for row, expected in zip(dice, scores):
+            assert tuple(expected) == score_vector(list(row))
+
+    @pytest.mark.parametrize("bot", list(STRATEGIES))
+    def test_policies_match_bots(self, bot):
+        numpy = pytest.importorskip("numpy")
+        keep_policy, category_policy = STRATEGIES[bot]
+        player = bot("Bot")
+        rng = random.Random(5)
+        dice = BatchRoller(seed=5).roll(300)
+        filled = numpy.array(
+            [[rng.random() < 0.5 for _ in Category] for _ in range(300)]
+        )
+        filled[:, 0] = False
+        points = numpy.where(filled, numpy.array(batch_scores(dice)), 0)
+
+        for roll in (1, 2):
+            keep = keep_policy(dice, roll)
+            for row, mask in zip(dice, keep):
+                assert player.choose_dice_to_keep(list(map(int, row)), roll) == list(
+                    mask
+                )
+
+        chosen = category_policy(batch_scores(dice), filled, points)
+        categories = list(Category)
+        for row, free, row_points, category in zip(dice, filled, points, chosen):
+            player.scorecard.categories = {
+                cat: (int(score) if done else None)
+                for cat, done, score in zip(categories, free, row_points)
+            }
+            available = player.scorecard.get_available_categories()
+            expected = player.choose_category(list(map(int, row)), available)
+            assert categories[category] == expected
+
+    def test_simulate_batch(self):
+        pytest.importorskip("numpy")
+        scores = simulate_batch(2000, seed=6)
+        assert len(scores) == 2000
+        assert list(simulate_batch(50, seed=7)) == list(simulate_batch(50, seed=7))
+        assert 125 < scores.mean() < 145
+        assert scores.min() >= 0
+
+    def test_unknown_bot(self):
+        pytest.importorskip("numpy")
+        from project.Yatzy.player import OptimalBot
+
+        with pytest.raises(ValueError):
+            simulate_batch(10, OptimalBot)
+
+    def test_numpy_missing(self, monkeypatch):
+        monkeypatch.setattr("project.Yatzy.batch.numpy", None)
+        with pytest.raises(ImportError):
+            batch_scores([[1, 2, 3, 4, 5]])
+        with pytest.raises(ImportError):
+            simulate_batch(10)
+        with pytest.raises(ImportError):
+            BatchRoller(use_numpy=True)
+        assert len(BatchRoller(seed=8).roll(3)) == 3
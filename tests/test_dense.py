@@ -0,0 +1,120 @@
+import pytest
+from array import array
+from project.dense import Matrix, Vector
+from project.matrices import matrix_add, matrix_multiply, matrix_transpose
+from project.vectors import dot_product, vector_angle, vector_length
+
+
+@pytest.fixture
+def matrix() -> Matrix:
+    return Matrix([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]])
+
+
+def test_vector_basics() -> None:
+    vec = Vector([1.0, 2.0, 3.0, 4.0])
+    assert len(vec) == 4
+    assert vec[1] == 2.0
+    assert vec.tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert vec == [1.0, 2.0, 3.0, 4.0]
+    view = vec[::2]
+    assert view == [1.0, 3.0]
+    view[1] = 10.0
+    assert vec[2] == 10.0
+    assert Vector.zeros(2) == [0.0, 0.0]
+
+
+def test_vector_from_buffer_shares_memory() -> None:
+    buffer = array("d", [1.0, 2.0])
+    vec = Vector.from_buffer(buffer)
+    vec[0] = 5.0
+    assert buffer[0] == 5.0
+
+
+def test_matrix_layouts(matrix: Matrix) -> None:
+    column_major = Matrix([[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]], order="F")
+    assert matrix.order == "C"
+    assert column_major.order == "F"
+    assert list(column_major.data) == [1.0, 4.0, 2.0, 5.0, 3.0, 6.0]
+    assert column_major == matrix
+    assert matrix.shape == (2, 3)
+    assert matrix[1, 2] == 6.0
+    assert matrix[1] == [4.0, 5.0, 6.0]
+    assert matrix.column(1) == [2.0, 5.0]
+    assert [row.tolist() for row in matrix] == matrix.tolist()
+    with pytest.raises(ValueError):
+        Matrix([[1.0], [1.0, 2.0]])
+
+
+def test_matrix_views_share_memory(matrix: Matrix) -> None:
+    transposed = matrix.T
+    assert transposed == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+    assert transposed.order == "F"
+    sub = matrix[:, 1:]
+    assert sub == [[2.0, 3.0], [5.0, 6.0]]
+    assert sub.order is None
+    sub[0, 0] = 20.0
+    assert matrix[0, 1] == 20.0
+    assert transposed[1, 0] == 20.0
+    assert matrix[1:] == [[4.0, 5.0, 6.0]]
+    assert matrix.column(2)[1:] == [6.0]
+    copy = sub.copy()
+    copy[0, 0] = 0.0
+    assert matrix[0, 1] == 20.0
+    assert sub.copy(order="F").order == "F"
+
+
+def test_matrix_from_buffer() -> None:
+    buffer = array("d", range(6))
+    matrix = Matrix.from_buffer(buffer, 3, 2, order="F")
+    assert matrix == [[0.0, 3.0], [1.0, 4.0], [2.0, 5.0]]
+    with pytest.raises(ValueError):
+        Matrix.from_buffer(buffer, 4, 2)
+
+
+def test_functions_accept_dense_types(matrix: Matrix) -> None:
+    lists = matrix.tolist()
+    assert isinstance(matrix_add(matrix, matrix), Matrix)
+    assert matrix_add(matrix, lists) == matrix_add(lists, lists)
+    assert matrix_add(matrix.T, matrix_transpose(lists)) == matrix_transpose(
+        matrix_add(lists, lists)
+    )
+    product = matrix_multiply(matrix, matrix.T, use_numpy=False)
+    assert isinstance(product, Matrix)
+    assert product == matrix_multiply(lists, matrix_transpose(lists))
+    with pytest.raises(ValueError):
+        matrix_multiply(matrix, matrix)
+    with pytest.raises(ValueError):
+        matrix_add(matrix, matrix.T)
+
+    vec = Vector([3.0, 4.0])
+    assert dot_product(vec, [1.0, 2.0]) == 11.0
+    assert vector_length(vec) == 5.0
+    assert vector_angle(matrix.column(0), matrix.column(0)) == pytest.approx(0.0)
+
+
+def test_numpy_round_trip(matrix: Matrix) -> None:
+    numpy = pytest.importorskip("numpy")
+    array2d = matrix.to_numpy()
+    array2d[0, 0] = 7.0
+    assert matrix[0, 0] == 7.0
+    assert matrix.T.to_numpy().shape == (3, 2)
+
+    wrapped = Matrix.from_numpy(numpy.asfortranarray(array2d))
+    assert wrapped.order == "F"
+    assert wrapped == matrix
+    product = matrix_multiply(matrix, matrix.T, use_numpy=True)
+    assert product == matrix_multiply(matrix, matrix.T, use_numpy=False)
+
+    vec = Vector.from_numpy(numpy.arange(4.0)[::2])
+    assert vec == [0.0, 2.0]
+    assert vec.to_numpy().tolist() == [0.0, 2.0]
+
+
+def test_numpy_missing(monkeypatch: pytest.MonkeyPatch, matrix: Matrix) -> None:
+    monkeypatch.setattr("project.dense.numpy", None)
+    with pytest.raises(ImportError):
+        Matrix.from_numpy([[1.0]])
+    with pytest.raises(ImportError):
+        Vector.from_numpy([1.0])
+    with pytest.raises(ImportError):
+        matrix.to_numpy()
@@ -0,0 +1,94 @@
+import io
+import json
+import random
+
+import pytest
+from project.Yatzy.engine import (
+    CounterSink,
+    Engine,
+    LogSink,
+    NullSink,
+    SimulationStats,
+    simulate,
+)
+from project.Yatzy.game import Game
+from project.Yatzy.player import AdaptiveBot, ConservativeBot, RiskyBot
+from project.Yatzy.scoring import Category
+
+
+class TestEngine:
+    def test_play_game(self, capsys):
+        players = [ConservativeBot("Bot1"), RiskyBot("Bot2")]
+        scores = Engine(NullSink(), random.Random(1)).play_game(players)
+
+        assert capsys.readouterr().out == ""
+        assert scores == [p.scorecard.get_total_score() for p in players]
+        assert all(p.scorecard.is_complete() for p in players)
+
+    def test_counter_sink(self):
+        sink = CounterSink()
+        Engine(sink, random.Random(2)).play_game([AdaptiveBot("Bot")])
+
+        assert sink.counts["games"] == 1
+        assert sink.counts["turns"] == 15
+        assert sink.counts["rolls"] == 45
+        assert set(sink.categories) == set(Category)
+
+    def test_log_sink(self):
+        sink = LogSink()
+        player = ConservativeBot("Bot")
+        Engine(sink, random.Random(3)).play_turn(player)
+
+        events = [record["event"] for record in sink.records]
+        assert events == ["rolled", "kept", "rolled", "kept", "rolled", "scored"]
+        assert sink.records[-1]["player"] == "Bot"
+        assert sink.records[-1]["score"] == player.scorecard.get_total_score()
+
+        stream = io.StringIO()
+        Engine(LogSink(stream), random.Random(3)).play_turn(ConservativeBot("Bot"))
+        lines = stream.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == sink.records
+
+    def test_game_prints_turns(self, capsys):
+        game = Game([ConservativeBot("Bot")])
+        game.play_turn(game.players[0])
+
+        output = capsys.readouterr().out
+        assert "(Roll 1)" in output
+        assert "Final dice:" in output
+        assert "Scored" in output
+        assert game.dice.values == game.dice.get_values()
+
+
+class TestSimulate:
+    def test_deterministic(self):
+        first = simulate(20, [ConservativeBot("A"), RiskyBot("B")], seed=7)
+        second = simulate(20, [ConservativeBot("A"), RiskyBot("B")], seed=7)
+
+        assert first.summary() == second.summary()
+        assert first.games == 20
+        assert sum(p.wins for p in first.players) == pytest.approx(20)
+
+    def test_statistics(self):
+        stats = SimulationStats(["A", "B"])
+        stats.add_game([100, 120])
+        stats.add_game([150, 150])
+        stats.add_game([110, 90])
+        a, b = stats.players
+
+        assert a.wins == 1.5
+        assert b.win_rate == pytest.approx(0.5)
+        assert a.mean == pytest.approx(120)
+        assert a.variance() == pytest.approx(((20**2) + (30**2) + (10**2)) / 3)
+        assert (a.minimum, a.maximum) == (100, 150)
+
+    def test_merge(self):
+        players = [ConservativeBot("A"), AdaptiveBot("B")]
+        merged = simulate(10, players, seed=1).merge(simulate(15, players, seed=2))
+
+        assert merged.games == 25
+        assert merged.players[0].games == 25
+        assert sum(merged.players[1].histogram.values()) == 25
+
+        with pytest.raises(ValueError):
+            merged.merge(SimulationStats(["A", "C"]))
@@ -21,14 +21,15 @@ class TestGame:
         assert "Bot1" in state["scores"]
         assert state["scores"]["Bot1"] == 0
 
-    def test_play_turn(self):
+    def test_play_turn(self, monkeypatch):
         players = [ConservativeBot("TestBot")]
         game = Game(players)
 
-        # Mock the dice to control randomness
-        game.dice.values = [1, 1, 1, 2, 2]
+        # Mock the dice to control randomness: every die shows a six
+        monkeypatch.setattr("project.Yatzy.dice.random.randint", lambda a, b: 6)
 
         game.play_turn(players[0])
 
-        # Bot should have scored something
-        assert players[0].scorecard.get_total_score() >= 0
+        assert game.dice.get_values() == [6, 6, 6, 6, 6]
+        assert game.dice.roll_count == 3
+        assert players[0].scorecard.get_total_score() == 50
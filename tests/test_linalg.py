@@ -0,0 +1,109 @@
+import pytest
+from project import linalg
+from project.dense import Matrix
+from project.linalg import (
+    LUFactorization,
+    determinant,
+    inverse,
+    lu_factor,
+    matrix_chain_multiply,
+    matrix_chain_order,
+    matrix_power,
+    solve,
+)
+from project.matrices import matrix_multiply
+from project.sparse import COOMatrix, CSCMatrix, CSRMatrix
+
+
+def close(result, expected, tolerance=1e-9):
+    return all(
+        abs(value - reference) <= tolerance
+        for row, expected_row in zip(result, expected)
+        for value, reference in zip(row, expected_row)
+    )
+
+
+@pytest.fixture
+def square():
+    return [[4.0, 3.0, 0.0], [6.0, 3.0, 1.0], [0.0, 2.0, 5.0]]
+
+
+def test_matrix_power(square) -> None:
+    expected_identity = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    expected = expected_identity
+    for power in range(7):
+        assert matrix_power(square, power, use_numpy=False) == expected
+        expected = matrix_multiply(expected, square, use_numpy=False)
+    assert close(
+        matrix_multiply(matrix_power(square, -2), matrix_power(square, 2)),
+        matrix_power(square, 0),
+    )
+    assert isinstance(matrix_power(Matrix(square), 3), Matrix)
+    assert matrix_power(CSRMatrix.from_dense(square), 3) == matrix_power(square, 3)
+    for sparse in (CSRMatrix, CSCMatrix, COOMatrix):
+        identity = matrix_power(sparse.from_dense(square), 0)
+        assert isinstance(identity, sparse)
+        assert identity.to_dense() == expected_identity
+    with pytest.raises(ValueError):
+        matrix_power([[1.0, 2.0]], 2)
+
+
+def test_matrix_chain_order() -> None:
+    """The textbook example: 10x30, 30x5, 5x60 is cheapest as (A0 A1) A2"""
+    assert matrix_chain_order([(10, 30), (30, 5), (5, 60)]) == (4500, ((0, 1), 2))
+    assert matrix_chain_order([(40, 20), (20, 30), (30, 10), (10, 30)]) == (
+        26000,
+        ((0, (1, 2)), 3),
+    )
+    assert matrix_chain_order([(3, 4)]) == (0, 0)
+    with pytest.raises(ValueError):
+        matrix_chain_order([(2, 3), (2, 3)])
+    with pytest.raises(ValueError):
+        matrix_chain_order([])
+
+
+def test_matrix_chain_multiply() -> None:
+    mat1 = [[1.0, 2.0]]
+    mat2 = [[1.0, 0.0, 2.0], [0.0, 1.0, 1.0]]
+    mat3 = [[1.0], [2.0], [3.0]]
+    expected = matrix_multiply(matrix_multiply(mat1, mat2), mat3)
+    assert matrix_chain_multiply([mat1, mat2, mat3]) == expected
+    assert matrix_chain_multiply([mat2]) is mat2
+
+
+def test_solve_inverse_determinant(square) -> None:
+    vector = [1.0, 2.0, 3.0]
+    solution = solve(square, vector)
+    assert close(
+        matrix_multiply(square, [[x] for x in solution]), [[v] for v in vector]
+    )
+    assert close(matrix_multiply(square, inverse(square)), matrix_power(square, 0))
+    assert determinant(square) == pytest.approx(-38.0)
+    rhs = Matrix([[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+    result = solve(Matrix(square), rhs)
+    assert isinstance(result, Matrix)
+    assert close(matrix_multiply(Matrix(square), result).tolist(), rhs.tolist())
+
+
+def test_singular_matrix() -> None:
+    singular = [[1.0, 2.0], [2.0, 4.0]]
+    assert determinant(singular) == 0.0
+    with pytest.raises(ValueError):
+        inverse(singular)
+    with pytest.raises(ValueError):
+        solve(singular, [1.0, 1.0])
+    with pytest.raises(ValueError):
+        LUFactorization([[1.0, 2.0]])
+
+
+def test_factorization_cache(square, monkeypatch) -> None:
+    linalg.clear_lu_cache()
+    factorization = lu_factor(square)
+    assert lu_factor([row[:] for row in square]) is factorization
+    square[0][0] = 1.0
+    assert lu_factor(square) is not factorization
+
+    monkeypatch.setattr(linalg, "LU_CACHE_SIZE", 2)
+    for value in range(3):
+        lu_factor([[float(value + 1)]])
+    assert len(linalg._lu_cache) == 2
@@ -1,5 +1,13 @@
 import pytest
-from project.matrices import matrix_add, matrix_multiply, matrix_transpose
+from project.dense import Matrix
+from project.matrices import (
+    TransposedView,
+    matrix_add,
+    matrix_add_,
+    matrix_axpy,
+    matrix_multiply,
+    matrix_transpose,
+)
 
 
 def test_matrix_add() -> None:
@@ -36,3 +44,142 @@ def test_matrix_transpose() -> None:
     """Test matrix transposition"""
     matrix = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
     assert matrix_transpose(matrix) == [[1.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+
+
+def naive_multiply(mat1, mat2):
+    return [
+        [
+            sum(mat1[i][k] * mat2[k][j] for k in range(len(mat2)))
+            for j in range(len(mat2[0]))
+        ]
+        for i in range(len(mat1))
+    ]
+
+
+def test_matrix_multiply_blocked() -> None:
+    """Test the pure Python kernel on a product spanning several tiles"""
+    mat1 = [[float((i * 7 + j) % 5) for j in range(70)] for i in range(9)]
+    mat2 = [[float((i + j * 3) % 4) for j in range(130)] for i in range(70)]
+    assert matrix_multiply(mat1, mat2, use_numpy=False) == naive_multiply(mat1, mat2)
+
+
+def test_matrix_multiply_numpy_backend() -> None:
+    """Test that the NumPy backend gives the same result"""
+    pytest.importorskip("numpy")
+    mat1 = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    mat2 = [[1.0, 0.0], [0.0, 1.0], [2.0, 2.0]]
+    expected = matrix_multiply(mat1, mat2, use_numpy=False)
+    assert matrix_multiply(mat1, mat2, use_numpy=True) == expected
+
+
+def test_lazy_transpose() -> None:
+    """Test that a lazy transpose shares the base matrix"""
+    matrix = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    view = matrix_transpose(matrix, lazy=True)
+    assert isinstance(view, TransposedView)
+    assert view.shape == (3, 2)
+    assert view[2] == [3.0, 6.0]
+    assert view[2, 1] == 6.0
+    matrix[0][0] = 10.0
+    assert view.materialize() == [[10.0, 4.0], [2.0, 5.0], [3.0, 6.0]]
+    assert matrix_transpose(view) is matrix
+
+
+def test_operations_with_transposed_views() -> None:
+    """Test multiplication and addition with lazy transposes"""
+    mat1 = [[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]]
+    mat2 = [[2.0, 0.0], [1.0, 2.0], [0.0, 1.0]]
+    view1 = matrix_transpose(mat1, lazy=True)
+    view2 = matrix_transpose(mat2, lazy=True)
+    copy1, copy2 = matrix_transpose(mat1), matrix_transpose(mat2)
+
+    assert matrix_multiply(mat1, view2) == matrix_multiply(mat1, copy2)
+    assert matrix_multiply(view1, mat2) == matrix_multiply(copy1, mat2)
+    assert matrix_multiply(view1, view1.transpose()) == matrix_multiply(copy1, mat1)
+    assert matrix_add(view1, copy2) == matrix_add(copy1, copy2)
+    assert matrix_add(view1, view2) == matrix_add(copy1, copy2)
+    assert matrix_add(Matrix(copy1), view2) == matrix_add(copy1, copy2)
+    with pytest.raises(ValueError):
+        matrix_add(view1, mat2)
+    with pytest.raises(ValueError):
+        matrix_multiply(view1, view2)
+
+
+def test_matrix_add_out() -> None:
+    """Test writing sums into existing storage"""
+    mat1 = [[1.0, 2.0], [3.0, 4.0]]
+    mat2 = [[5.0, 6.0], [7.0, 8.0]]
+    out = [[0.0, 0.0], [0.0, 0.0]]
+    rows = list(out)
+    assert matrix_add(mat1, mat2, out=out) is out
+    assert out == [[6.0, 8.0], [10.0, 12.0]]
+    assert all(a is b for a, b in zip(out, rows))
+
+    dense = Matrix.zeros(2, 2)
+    assert matrix_add(Matrix(mat1), mat2, out=dense) is dense
+    assert dense == [[6.0, 8.0], [10.0, 12.0]]
+    assert matrix_add(Matrix(mat1), Matrix(mat2), out=dense) == dense
+    view = matrix_transpose(mat2, lazy=True)
+    assert matrix_add(mat1, view, out=dense) == matrix_add(mat1, view)
+    with pytest.raises(ValueError):
+        matrix_add(mat1, mat2, out=[[0.0, 0.0]])
+
+
+def test_in_place_variants() -> None:
+    mat1 = [[1.0, 2.0], [3.0, 4.0]]
+    assert matrix_add_(mat1, [[1.0, 1.0], [1.0, 1.0]]) is mat1
+    assert mat1 == [[2.0, 3.0], [4.0, 5.0]]
+    assert matrix_axpy(0.5, [[2.0, 2.0], [4.0, 4.0]], mat1) is mat1
+    assert mat1 == [[3.0, 4.0], [6.0, 7.0]]
+
+    dense = Matrix([[1.0, 2.0], [3.0, 4.0]], order="F")
+    matrix_axpy(-1.0, Matrix([[1.0, 2.0], [3.0, 4.0]]), dense)
+    assert dense == [[0.0, 0.0], [0.0, 0.0]]
+    with pytest.raises(ValueError):
+        matrix_axpy(1.0, [[1.0]], mat1)
+
+
+@pytest.mark.parametrize("use_numpy", [False, True])
+def test_matrix_multiply_out(use_numpy: bool) -> None:
+    """Test writing products into existing storage"""
+    if use_numpy:
+        pytest.importorskip("numpy")
+    mat1 = [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]]
+    mat2 = [[1.0, 0.0], [0.0, 1.0], [2.0, 2.0]]
+    expected = matrix_multiply(mat1, mat2)
+    out = [[0.0, 0.0], [0.0, 0.0]]
+    assert matrix_multiply(mat1, mat2, use_numpy, out=out) is out
+    assert out == expected
+    dense = Matrix.zeros(2, 2)
+    assert matrix_multiply(Matrix(mat1), Matrix(mat2), use_numpy, out=dense) is dense
+    assert dense == expected
+    assert matrix_multiply(mat1, Matrix(mat2, order="F"), use_numpy, out=dense) == dense
+    with pytest.raises(ValueError):
+        matrix_multiply(mat1, mat2, use_numpy, out=[[0.0]])
+    square = [[1.0, 2.0], [3.0, 4.0]]
+    with pytest.raises(ValueError):
+        matrix_multiply(square, square, use_numpy, out=square)
+
+
+def test_ragged_rows_are_rejected() -> None:
+    """Every row is checked, not only the first one"""
+    ragged = [[1.0, 2.0], [3.0]]
+    square = [[1.0, 2.0], [3.0, 4.0]]
+    with pytest.raises(ValueError):
+        matrix_add(square, ragged)
+    with pytest.raises(ValueError):
+        matrix_multiply(square, ragged)
+    with pytest.raises(ValueError):
+        matrix_transpose(ragged + [[5.0]], lazy=True)
+    with pytest.raises(ValueError):
+        matrix_transpose([[1.0], [2.0, 3.0]])
+    with pytest.raises(ValueError):
+        Matrix(ragged)
+
+
+def test_unchecked_fast_path() -> None:
+    mat1 = [[1.0, 2.0], [3.0, 4.0]]
+    mat2 = [[5.0, 6.0], [7.0, 8.0]]
+    assert matrix_add(mat1, mat2, check=False) == matrix_add(mat1, mat2)
+    assert matrix_multiply(mat1, mat2, check=False) == matrix_multiply(mat1, mat2)
+    assert Matrix(mat1, check=False) == mat1
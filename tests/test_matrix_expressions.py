@@ -0,0 +1,99 @@
+import pytest
+from project.dense import Matrix
+from project.matrices import matrix_add, matrix_multiply, matrix_transpose
+from project.matrix_expressions import Expression, _Evaluator, lazy
+
+
+@pytest.fixture
+def operands():
+    mat_a = [[1.0, 2.0, 0.0], [3.0, -1.0, 4.0]]
+    mat_b = [[2.0, 1.0], [0.0, 1.0], [5.0, -2.0]]
+    mat_c = [[1.0, 1.0], [2.0, 3.0]]
+    return mat_a, mat_b, mat_c
+
+
+def test_fused_expression(operands) -> None:
+    mat_a, mat_b, mat_c = operands
+    expression = lazy(mat_a) @ mat_b + lazy(mat_c).T
+    assert isinstance(expression, Expression)
+    assert expression.shape == (2, 2)
+    expected = matrix_add(matrix_multiply(mat_a, mat_b), matrix_transpose(mat_c))
+    assert expression.evaluate() == expected
+    assert list(expression) == expected
+
+
+class _IndexOnlyRow(list):
+    """Row that fails if it is iterated as a whole, e.g. by zip(*rows)."""
+
+    def __iter__(self):
+        raise AssertionError("row was copied")
+
+
+def test_transposed_leaf_is_not_copied(operands) -> None:
+    mat_a, mat_b, mat_c = operands
+    guarded = [_IndexOnlyRow(row) for row in mat_c]
+    expression = lazy(mat_a) @ mat_b + lazy(guarded).T
+    expected = matrix_add(matrix_multiply(mat_a, mat_b), matrix_transpose(mat_c))
+    assert expression.evaluate() == expected
+
+
+def test_expression_is_lazy(operands) -> None:
+    mat_a, _, mat_c = operands
+    expression = lazy(mat_c) - 2 * lazy(mat_a) @ lazy(mat_a).T
+    mat_c[0][0] = 10.0
+    expected = [
+        [c - 2 * p for c, p in zip(row_c, row_p)]
+        for row_c, row_p in zip(mat_c, matrix_multiply(mat_a, matrix_transpose(mat_a)))
+    ]
+    assert expression.evaluate() == expected
+
+
+def test_transpose_is_pushed_to_leaves(operands) -> None:
+    mat_a, mat_b, mat_c = operands
+    expression = ((lazy(mat_a) @ mat_b) + mat_c).T
+    expected = matrix_transpose(matrix_add(matrix_multiply(mat_a, mat_b), mat_c))
+    assert expression.evaluate() == expected
+    assert lazy(mat_a).T.T.evaluate() == mat_a
+
+
+def test_common_subexpressions_are_cached(operands, monkeypatch) -> None:
+    mat_a, mat_b, _ = operands
+    product = lazy(mat_a) @ mat_b
+    expression = (product + product.T) @ product
+    evaluated = []
+    original = _Evaluator.evaluate
+
+    def evaluate(self, node, out):
+        evaluated.append(node.key)
+        return original(self, node, out)
+
+    monkeypatch.setattr(_Evaluator, "evaluate", evaluate)
+    left = matrix_multiply(mat_a, mat_b)
+    expected = matrix_multiply(matrix_add(left, matrix_transpose(left)), left)
+    assert expression.evaluate() == expected
+    assert evaluated.count(product.key) == 1
+
+
+def test_output_buffer_and_dense_operands(operands) -> None:
+    mat_a, mat_b, mat_c = operands
+    out = [[0.0, 0.0], [0.0, 0.0]]
+    rows = list(out)
+    result = (lazy(mat_a) @ mat_b + mat_c).evaluate(out=out)
+    assert result is out and all(a is b for a, b in zip(out, rows))
+    assert out == matrix_add(matrix_multiply(mat_a, mat_b), mat_c)
+
+    dense = (lazy(Matrix(mat_a)) @ Matrix(mat_b, order="F")).evaluate()
+    assert isinstance(dense, Matrix)
+    assert dense == matrix_multiply(mat_a, mat_b)
+    with pytest.raises(ValueError):
+        (lazy(mat_a) @ mat_b).evaluate(out=[[0.0]])
+
+
+def test_shape_errors(operands) -> None:
+    mat_a, mat_b, mat_c = operands
+    with pytest.raises(ValueError):
+        lazy(mat_a) + mat_b
+    with pytest.raises(ValueError):
+        lazy(mat_a) @ mat_c
+    with pytest.raises(TypeError):
+        lazy(mat_a) + "matrix"
@@ -0,0 +1,124 @@
+import pytest
+from project.Yatzy.optimal import (
+    KEEPS,
+    OUTCOMES,
+    ROLLS,
+    UPPER_CAP,
+    ValueTable,
+    keep_mask,
+    solve,
+)
+from project.Yatzy.player import OptimalBot
+from project.Yatzy.scoring import Category
+
+
+class TestSolver:
+    def test_enumeration(self):
+        assert len(ROLLS) == 252
+        assert len(KEEPS) == 462
+        for rolls, probabilities in OUTCOMES:
+            assert len(set(rolls)) == len(rolls)
+            assert sum(probabilities) == pytest.approx(1.0)
+
+    def test_single_category_values(self):
+        # Chance: keep every die above the expected value of a reroll
+        assert solve([Category.CHANCE], use_numpy=False).value(0, 0) == pytest.approx(
+            70 / 3, abs=1e-5
+        )
+        # Yatzy: probability of five of a kind within three rolls
+        assert solve([Category.YATZY], use_numpy=False).value(0, 0) == pytest.approx(
+            50 * 0.046028643, abs=1e-5
+        )
+
+    def test_upper_bonus(self):
+        table = solve([Category.SIXES], use_numpy=False)
+        sixes = 30 * (1 - (5 / 6) ** 3)
+        assert table.value(0, UPPER_CAP) == pytest.approx(sixes, abs=1e-4)
+        assert table.value(0, 0) == pytest.approx(sixes, abs=1e-4)
+        assert table.value(0, 60) > sixes + 40
+        assert table.value(0, 100) == table.value(0, UPPER_CAP)
+        assert table.value(1, 0) == 0.0
+
+    def test_numpy_matches_python(self):
+        pytest.importorskip("numpy")
+        categories = [Category.ONES, Category.PAIR, Category.YATZY]
+        expected = solve(categories, use_numpy=False)
+        result = solve(categories, use_numpy=True)
+        assert list(result.values) == pytest.approx(list(expected.values), abs=1e-4)
+
+    def test_save_and_load(self, tmp_path):
+        table = solve([Category.TWOS, Category.CHANCE], use_numpy=False)
+        path = tmp_path / "values.bin"
+        table.save(path)
+
+        loaded = ValueTable.load(path)
+        assert loaded.categories == table.categories
+        assert list(loaded.values) == list(table.values)
+        loaded.close()
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / "values.bin"
+        path.write_bytes(b"not a value table at all")
+        with pytest.raises(ValueError):
+            ValueTable.load(path)
+
+    def test_keep_mask(self):
+        assert keep_mask([6, 1, 6, 6, 2], (6, 6)) == [True, False, True, False, False]
+        assert keep_mask([3, 4, 5, 1, 2], ()) == [False] * 5
+
+
+class TestOptimalBot:
+    def test_keeps_high_dice_for_chance(self):
+        bot = OptimalBot("Optimal", solve([Category.CHANCE], use_numpy=False))
+        # Two rerolls left are worth 4.25 per die, one reroll 3.5
+        assert bot.choose_dice_to_keep([6, 4, 1, 5, 3], 1) == [
+            True,
+            False,
+            False,
+            True,
+            False,
+        ]
+        assert bot.choose_dice_to_keep([6, 4, 1, 5, 3], 2) == [
+            True,
+            True,
+            False,
+            True,
+            False,
+        ]
+
+    def test_choose_category(self):
+        table = solve([Category.ONES, Category.YATZY], use_numpy=False)
+        bot = OptimalBot("Optimal", table)
+        available = [Category.ONES, Category.YATZY]
+
+        assert bot.choose_category([1, 1, 1, 1, 1], available) == Category.YATZY
+        assert bot.choose_category([1, 1, 1, 2, 3], available) == Category.ONES
+        # Categories outside the table fall back to the highest score
+        assert bot.choose_category([2, 2, 3, 3, 5], [Category.CHANCE]) == (
+            Category.CHANCE
+        )
+
+    def test_follows_scorecard(self):
+        table = solve([Category.ONES, Category.YATZY], use_numpy=False)
+        bot = OptimalBot("Optimal", table)
+        bot.scorecard.record_score(Category.YATZY, 0)
+
+        # Only ones are left, so all ones are kept
+        assert bot.choose_dice_to_keep([1, 6, 6, 6, 1], 1) == [
+            True,
+            False,
+            False,
+            False,
+            True,
+        ]
+        assert table.state(bot.scorecard) == (2, 0)
+
+    def test_default_table_needs_numpy(self, monkeypatch, tmp_path):
+        from project.Yatzy import optimal
+
+        monkeypatch.setattr(optimal, "numpy", None)
+        monkeypatch.setattr(optimal, "_default_table", None)
+        monkeypatch.setattr(optimal, "DEFAULT_TABLE_PATH", tmp_path / "values.bin")
+        with pytest.raises(ImportError):
+            OptimalBot("Optimal")
+        assert not (tmp_path / "values.bin").exists()
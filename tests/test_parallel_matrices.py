@@ -0,0 +1,46 @@
+import random
+import pytest
+from project.dense import Matrix
+from project.matrices import matrix_multiply
+from project.parallel_matrices import parallel_matrix_multiply
+
+
+@pytest.fixture
+def operands():
+    rng = random.Random(3)
+    mat1 = [[rng.random() for _ in range(13)] for _ in range(9)]
+    mat2 = [[rng.random() for _ in range(11)] for _ in range(13)]
+    return mat1, mat2
+
+
+def test_parallel_matches_serial(operands) -> None:
+    mat1, mat2 = operands
+    expected = matrix_multiply(mat1, mat2, use_numpy=False)
+    assert parallel_matrix_multiply(mat1, mat2, workers=2) == expected
+    assert parallel_matrix_multiply(mat1, mat2, workers=1) == expected
+
+
+def test_parallel_with_dense_views(operands) -> None:
+    mat1, mat2 = operands
+    product = parallel_matrix_multiply(Matrix(mat1), Matrix(mat2, order="F"), 3)
+    assert isinstance(product, Matrix)
+    assert product == matrix_multiply(mat1, mat2, use_numpy=False)
+
+
+def test_parallel_few_rows() -> None:
+    """A single row is split into column tiles"""
+    row = [[1.0, 2.0]]
+    mat2 = [[float(j) for j in range(10)], [1.0] * 10]
+    expected = matrix_multiply(row, mat2, use_numpy=False)
+    assert parallel_matrix_multiply(row, mat2, workers=4) == expected
+
+
+def test_parallel_incompatible() -> None:
+    with pytest.raises(ValueError):
+        parallel_matrix_multiply([[1.0, 2.0]], [[1.0, 2.0]], workers=2)
+
+
+def test_parallel_invalid_workers(operands) -> None:
+    mat1, mat2 = operands
+    with pytest.raises(ValueError):
+        parallel_matrix_multiply(mat1, mat2, workers=0)
@@ -59,3 +59,63 @@ class TestScoreCard:
             card.record_score(category, 0)
 
         assert card.is_complete() == True
+
+    def test_running_state(self):
+        card = ScoreCard()
+        card.record_score(Category.SIXES, 24)
+        card.record_score(Category.FIVES, 20)
+        card.record_score(Category.CHANCE, 22)
+
+        assert card.upper_sum == 44
+        assert card.total == 66
+        assert not card.has_bonus
+        assert card.is_filled(Category.SIXES)
+        assert not card.is_filled(Category.ONES)
+        assert card.filled == (1 << 5) | (1 << 4) | (1 << 13)
+        assert Category.CHANCE not in card.available_categories()
+        assert len(card.available_categories()) == 12
+
+        card.record_score(Category.FOURS, 20)
+        assert card.has_bonus
+        assert card.get_total_score() == 86 + 50
+
+    def test_categories_view(self):
+        card = ScoreCard()
+        card.record_score(Category.PAIR, 12)
+
+        assert dict(card.categories)[Category.PAIR] == 12
+        assert card.categories.get(Category.YATZY) is None
+        assert list(card.categories) == list(Category)
+
+        card.categories = {Category.ONES: 2, Category.TWOS: None}
+        assert card.categories[Category.PAIR] is None
+        assert card.get_available_categories() == list(Category)[1:]
+        assert card.get_total_score() == 2
+
+    def test_categories_assignment(self):
+        card = ScoreCard()
+        card.categories[Category.SIXES] = 30
+        card.categories[Category.FIVES] = 25
+        assert card.is_filled(Category.SIXES)
+        assert card.upper_sum == 55
+
+        card.categories[Category.SIXES] = 18
+        assert (card.upper_sum, card.total) == (43, 43)
+        card.categories[Category.FIVES] = None
+        assert not card.is_filled(Category.FIVES)
+        assert card.key() == (1 << 5, 18, 18)
+        with pytest.raises(TypeError):
+            del card.categories[Category.SIXES]
+
+    def test_copy_and_key(self):
+        card = ScoreCard()
+        card.record_score(Category.THREES, 9)
+        copy = card.copy()
+
+        assert copy is not card and copy != card
+        assert copy.key() == card.key()
+        assert {card.key(): "memo"}[copy.key()] == "memo"
+
+        copy.record_score(Category.YATZY, 50)
+        assert copy.key() != card.key()
+        assert card.categories[Category.YATZY] is None
@@ -1,5 +1,15 @@
+import itertools
+
 import pytest
-from project.Yatzy.scoring import calculate_score, Category
+from project.Yatzy.scoring import (
+    CATEGORY_INDEX,
+    ROLLS,
+    _calculate_score,
+    calculate_score,
+    roll_index,
+    score_vector,
+    Category,
+)
 
 
 class TestScoring:
@@ -43,3 +53,32 @@ class TestScoring:
     def test_yatzy(self):
         assert calculate_score([1, 1, 1, 1, 1], Category.YATZY) == 50
         assert calculate_score([1, 1, 1, 1, 2], Category.YATZY) == 0
+
+    def test_table_matches_reference(self):
+        for dice in itertools.product(range(1, 7), repeat=5):
+            dice = list(dice)
+            scores = score_vector(dice)
+            for category in Category:
+                expected = _calculate_score(dice, category)
+                assert calculate_score(dice, category) == expected
+                assert scores[CATEGORY_INDEX[category]] == expected
+
+    def test_roll_index(self):
+        assert len(ROLLS) == 252
+        assert roll_index([5, 1, 3, 1, 6]) == roll_index([1, 1, 3, 5, 6])
+        assert ROLLS[roll_index([5, 1, 3, 1, 6])] == (1, 1, 3, 5, 6)
+        with pytest.raises(ValueError):
+            roll_index([1, 2, 3, 4])
+        with pytest.raises(ValueError):
+            score_vector([0, 1, 2, 3, 4])
+
+    def test_invalid_dice_fall_back(self):
+        assert calculate_score([6, 6, 6, 6], Category.SIXES) == 24
+
+    def test_unknown_category_scores_zero(self):
+        assert calculate_score([1, 2, 3, 4, 5], None) == 0
+        assert calculate_score([6, 6, 6, 6], None) == 0
+
+    def test_category_index(self):
+        assert [category.index for category in Category] == list(range(15))
+        assert all(CATEGORY_INDEX[c] == c.index for c in Category)
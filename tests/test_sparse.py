@@ -0,0 +1,87 @@
+import pytest
+from project.dense import Matrix
+from project.matrices import matrix_add, matrix_multiply, matrix_transpose
+from project.sparse import COOMatrix, CSCMatrix, CSRMatrix
+
+
+@pytest.fixture
+def dense():
+    return [
+        [0.0, 2.0, 0.0, 0.0],
+        [0.0, 0.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0, 3.0],
+    ]
+
+
+@pytest.fixture
+def other():
+    return [
+        [0.0, -2.0, 5.0, 0.0],
+        [0.0, 0.0, 0.0, 1.0],
+        [0.0, 0.0, 0.0, 0.0],
+    ]
+
+
+def test_construction_and_conversion(dense) -> None:
+    csr = CSRMatrix.from_dense(dense)
+    assert csr.nnz == 3
+    assert list(csr.indptr) == [0, 1, 1, 3]
+    assert list(csr.indices) == [1, 0, 3]
+    assert csr.to_dense() == dense
+
+    triplets = [(2, 3, 1.0), (0, 1, 2.0), (2, 0, 1.0), (2, 3, 2.0)]
+    assert CSRMatrix.from_triplets((3, 4), triplets) == csr
+    assert CSCMatrix.from_triplets((3, 4), triplets) == csr
+    assert COOMatrix.from_triplets((3, 4), triplets) == csr
+    assert CSCMatrix.from_dense(Matrix(dense)).to_dense() == dense
+    assert csr.to_csc().to_csr() == csr
+    assert csr.to_coo().to_dense() == dense
+    for triplet in [(1, 0, 1.0), (0, 1, 1.0), (-1, 0, 1.0), (0, -1, 1.0)]:
+        for cls in (COOMatrix, CSRMatrix, CSCMatrix):
+            with pytest.raises(IndexError):
+                cls.from_triplets((1, 1), [triplet])
+
+
+def test_memory_usage(dense) -> None:
+    csr = CSRMatrix.from_dense(dense)
+    assert csr.memory_usage() == 4 * 4 + 3 * 4 + 3 * 8
+    assert csr.dense_memory_usage() == 12 * 8
+    assert csr.density == pytest.approx(0.25)
+
+
+def test_transpose_shares_arrays(dense) -> None:
+    csr = CSRMatrix.from_dense(dense)
+    transposed = matrix_transpose(csr)
+    assert isinstance(transposed, CSCMatrix)
+    assert transposed.data is csr.data
+    assert transposed.to_dense() == matrix_transpose(dense)
+
+
+def test_sparse_add(dense, other) -> None:
+    expected = matrix_add(dense, other)
+    result = matrix_add(CSRMatrix.from_dense(dense), CSCMatrix.from_dense(other))
+    assert isinstance(result, CSRMatrix)
+    assert result == expected
+    assert result.nnz == 4  # 2.0 + -2.0 cancels out
+    assert matrix_add(CSRMatrix.from_dense(dense), other) == expected
+    mixed = matrix_add(Matrix(dense), COOMatrix.from_dense(other))
+    assert isinstance(mixed, Matrix)
+    assert mixed == expected
+    with pytest.raises(ValueError):
+        matrix_add(CSRMatrix.from_dense(dense), [[1.0]])
+
+
+def test_sparse_multiply(dense, other) -> None:
+    right = matrix_transpose(other)
+    expected = matrix_multiply(dense, right)
+    sparse_left = CSRMatrix.from_dense(dense)
+    sparse_right = CSRMatrix.from_dense(right)
+
+    result = matrix_multiply(sparse_left, sparse_right)
+    assert isinstance(result, CSRMatrix)
+    assert result == expected
+    assert matrix_multiply(sparse_left, right) == expected
+    assert matrix_multiply(dense, sparse_right) == expected
+    assert matrix_multiply(Matrix(dense), sparse_right.to_csc()) == expected
+    with pytest.raises(ValueError):
+        matrix_multiply(sparse_left, sparse_left)
@@ -0,0 +1,65 @@
+import random
+import pytest
+from project import strassen
+from project.dense import Matrix
+from project.matrices import matrix_multiply, matrix_transpose
+from project.strassen import WINOGRAD, get_cutoff, strassen_multiply, tune_cutoff
+
+
+def random_matrix(rows, cols, rng):
+    return [[rng.uniform(-1.0, 1.0) for _ in range(cols)] for _ in range(rows)]
+
+
+def max_error(result, expected):
+    return max(
+        abs(value - reference)
+        for row, expected_row in zip(result, expected)
+        for value, reference in zip(row, expected_row)
+    )
+
+
+@pytest.mark.parametrize("variant", strassen.VARIANTS)
+@pytest.mark.parametrize("shape", [(8, 8, 8), (9, 7, 13), (31, 40, 17), (1, 5, 3)])
+def test_strassen_matches_classic(variant, shape) -> None:
+    """Odd and rectangular sizes are padded at every level"""
+    rng = random.Random(sum(shape))
+    rows, inner, cols = shape
+    mat1, mat2 = random_matrix(rows, inner, rng), random_matrix(inner, cols, rng)
+    expected = matrix_multiply(mat1, mat2, use_numpy=False)
+    result = strassen_multiply(mat1, mat2, cutoff=2, variant=variant)
+    assert len(result) == rows and len(result[0]) == cols
+    assert max_error(result, expected) < 1e-12
+
+
+def test_strassen_exact_on_integers() -> None:
+    mat1 = [[float((i * 3 + j) % 5) for j in range(12)] for i in range(10)]
+    mat2 = [[float((i + 2 * j) % 4) for j in range(11)] for i in range(12)]
+    expected = matrix_multiply(mat1, mat2, use_numpy=False)
+    assert strassen_multiply(mat1, mat2, cutoff=1) == expected
+    assert strassen_multiply(mat1, mat2, cutoff=1, variant=WINOGRAD) == expected
+
+
+def test_strassen_operand_types() -> None:
+    rng = random.Random(5)
+    mat1, mat2 = random_matrix(6, 6, rng), random_matrix(6, 6, rng)
+    expected = matrix_multiply(mat1, mat2, use_numpy=False)
+    product = strassen_multiply(Matrix(mat1), mat2, cutoff=2)
+    assert isinstance(product, Matrix)
+    assert max_error(product.tolist(), expected) < 1e-12
+    view = matrix_transpose(matrix_transpose(mat2), lazy=True)
+    assert max_error(strassen_multiply(mat1, view, cutoff=2), expected) < 1e-12
+
+
+def test_strassen_errors() -> None:
+    with pytest.raises(ValueError):
+        strassen_multiply([[1.0, 2.0]], [[1.0, 2.0]], cutoff=1)
+    with pytest.raises(ValueError):
+        strassen_multiply([[1.0]], [[1.0]], variant="unknown")
+
+
+def test_tune_cutoff(monkeypatch) -> None:
+    monkeypatch.setattr(strassen, "_tuned_cutoff", None)
+    assert get_cutoff(tune=False) == strassen.DEFAULT_CUTOFF
+    cutoff = tune_cutoff(sizes=(4, 8), repeat=1)
+    assert cutoff in (4, 8)
+    assert get_cutoff() == cutoff
@@ -0,0 +1,151 @@
+import pytest
+from project.stream_processing import *
+from project.stream_branching import (
+    DROP_NEWEST,
+    DROP_OLDEST,
+    RingBuffer,
+    broadcast,
+    dispatch,
+    interleave,
+    merge,
+    partition,
+    tee,
+    zip_streams,
+)
+
+
+def test_ring_buffer_policies():
+    buffer = RingBuffer(2, DROP_OLDEST)
+    for item in range(4):
+        buffer.put(item)
+    buffer.close()
+    assert list(buffer) == [2, 3]
+    assert buffer.dropped == 2
+
+    buffer = RingBuffer(2, DROP_NEWEST)
+    assert [buffer.put(item) for item in range(3)] == [True, True, False]
+
+    buffer = RingBuffer(1, "error")
+    buffer.put(1)
+    with pytest.raises(BufferError):
+        buffer.put(2)
+
+    with pytest.raises(ValueError):
+        RingBuffer(1, "unknown")
+
+
+def test_tee_reads_source_once():
+    pulled = []
+    source = map_stream(lambda x: pulled.append(x) or x)(generate_data(range(5)))
+    first, second = tee(source)
+    assert to_list(first) == [0, 1, 2, 3, 4]
+    assert to_list(second) == [0, 1, 2, 3, 4]
+    assert pulled == [0, 1, 2, 3, 4]
+
+
+def test_tee_bounded_buffer():
+    first, second = tee(generate_data(range(10)), buffer_size=3)
+    with pytest.raises(BufferError):
+        to_list(first)
+
+    first, second = tee(generate_data(range(10)), buffer_size=3, policy=DROP_OLDEST)
+    assert to_list(first) == list(range(10))
+    assert to_list(second) == [7, 8, 9]
+
+
+def test_tee_overflow_loses_nothing():
+    first, second = tee(generate_data(range(10)), buffer_size=2)
+    assert [next(first), next(first)] == [0, 1]
+    # The second branch is full: item 2 is held back for both branches
+    with pytest.raises(BufferError):
+        next(first)
+    assert [next(second) for _ in range(3)] == [0, 1, 2]
+    assert [next(first) for _ in range(3)] == [2, 3, 4]
+    assert [next(second) for _ in range(4)] == [3, 4, 5, 6]
+    second.close()
+    assert to_list(first) == [5, 6, 7, 8, 9]
+
+
+def test_partition():
+    branches = partition(generate_data(range(10)), lambda x: x % 3, [0, 1])
+    assert to_list(take_items(2)(branches[1])) == [1, 4]
+    # take_items closed branch 1, so its items are no longer buffered
+    assert to_list(branches[0]) == [0, 3, 6, 9]
+    assert to_list(branches[1]) == []
+
+
+def test_unread_branches_close_source():
+    closed = []
+
+    def source():
+        try:
+            yield from range(10)
+        finally:
+            closed.append(True)
+
+    first, second = tee(source())
+    assert to_list(take_items(2)(first)) == [0, 1]
+    assert closed == []
+    second.close()
+    assert closed == [True]
+
+    branches = partition(source(), lambda x: x % 2, [0, 1])
+    assert to_list(take_items(1)(branches[0])) == [0]
+    del branches
+    assert closed == [True, True]
+
+
+def test_broadcast_threads():
+    total, count, evens = broadcast(
+        generate_data(range(1000)),
+        lambda s: sum(s),
+        lambda s: len(list(s)),
+        lambda s: to_list(process_pipeline(s, filter_stream(lambda x: x % 2 == 0))),
+        buffer_size=16,
+    )
+    assert total == sum(range(1000))
+    assert count == 1000
+    assert evens == list(range(0, 1000, 2))
+
+
+def test_broadcast_early_stop_and_errors():
+    def infinite():
+        i = 0
+        while True:
+            yield i
+            i += 1
+
+    assert broadcast(infinite(), lambda s: first_item(s), buffer_size=4) == [0]
+
+    def failing(stream):
+        raise RuntimeError("consumer failed")
+
+    with pytest.raises(RuntimeError):
+        broadcast(generate_data(range(100)), failing, to_list, buffer_size=4)
+
+
+def test_dispatch():
+    result = dispatch(
+        generate_data(range(10)),
+        lambda x: "even" if x % 2 == 0 else "odd",
+        {"even": to_list, "odd": sum},
+        buffer_size=2,
+    )
+    assert result == {"even": [0, 2, 4, 6, 8], "odd": 25}
+
+
+def test_merge():
+    result = to_list(merge(range(100), range(100, 200), buffer_size=8))
+    assert sorted(result) == list(range(200))
+    assert [x for x in result if x < 100] == list(range(100))
+    assert to_list(merge()) == []
+
+
+def test_interleave_and_zip():
+    assert to_list(interleave([1, 2, 3], [10], [20, 30])) == [1, 10, 20, 2, 30, 3]
+    assert to_list(zip_streams([1, 2, 3], "ab")) == [(1, "a"), (2, "b")]
+    with pytest.raises(ValueError):
+        to_list(zip_streams([1, 2, 3], "ab", strict=True))
+    with pytest.raises(ValueError):
+        to_list(zip_streams([1], "ab", strict=True))
+    assert to_list(zip_streams([1, 2], "ab", strict=True)) == [(1, "a"), (2, "b")]
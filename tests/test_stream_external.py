@@ -0,0 +1,73 @@
+import random
+import pytest
+from project.stream_processing import generate_data, process_pipeline, to_list
+from project.stream_external import (
+    distinct,
+    external_sort,
+    group_by,
+    join,
+    sort_stream,
+)
+
+
+@pytest.fixture
+def shuffled():
+    data = list(range(200))
+    random.Random(1).shuffle(data)
+    return data
+
+
+def test_sort_in_memory(shuffled):
+    result = to_list(sort_stream()(generate_data(shuffled)))
+    assert result == list(range(200))
+
+
+def test_sort_spills_to_disk(shuffled, tmp_path):
+    stream = generate_data(shuffled)
+    sorter = external_sort(stream, buffer_size=16, spill_dir=str(tmp_path))
+    first = next(sorter)
+    assert first == 0
+    assert [first] + list(sorter) == list(range(200))
+
+
+def test_sort_reverse_with_key_is_stable():
+    data = [(i % 3, i) for i in range(30)]
+    result = to_list(
+        sort_stream(key=lambda x: x[0], reverse=True, buffer_size=4)(
+            generate_data(data)
+        )
+    )
+    assert result == sorted(data, key=lambda x: x[0], reverse=True)
+
+
+def test_sort_invalid_buffer():
+    with pytest.raises(ValueError):
+        to_list(sort_stream(buffer_size=0)(generate_data([1])))
+
+
+def test_group_by(shuffled):
+    result = to_list(
+        process_pipeline(generate_data(shuffled), group_by(lambda x: x % 3, 10))
+    )
+    assert [key for key, _ in result] == [0, 1, 2]
+    assert sorted(result[1][1]) == list(range(1, 200, 3))
+
+
+def test_distinct():
+    data = [5, 1, 5, 2, 1, 3] * 10
+    assert to_list(distinct(buffer_size=7)(generate_data(data))) == [1, 2, 3, 5]
+    words = ["b", "A", "a", "B"]
+    assert to_list(distinct(key=str.lower)(generate_data(words))) == ["A", "b"]
+
+
+def test_join():
+    users = [(1, "ann"), (2, "bob"), (3, "eve")]
+    orders = [(1, "tea"), (3, "jam"), (1, "cake"), (4, "milk")]
+    result = to_list(
+        join(orders, key=lambda x: x[0], buffer_size=2)(generate_data(users))
+    )
+    assert result == [
+        ((1, "ann"), (1, "tea")),
+        ((1, "ann"), (1, "cake")),
+        ((3, "eve"), (3, "jam")),
+    ]
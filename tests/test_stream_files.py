@@ -0,0 +1,63 @@
+import pytest
+from project.stream_processing import generate_data, map_stream, process_pipeline
+from project.stream_files import (
+    read_csv,
+    read_jsonl,
+    read_lines,
+    read_records,
+    write_csv,
+    write_jsonl,
+    write_lines,
+    write_records,
+)
+
+
+def test_lines_round_trip(tmp_path):
+    path = str(tmp_path / "data.txt")
+    assert write_lines(generate_data(["a", "b", "c"]), path) == 3
+    assert list(read_lines(path)) == ["a", "b", "c"]
+    assert list(read_lines(path, keep_newline=True)) == ["a\n", "b\n", "c\n"]
+
+
+def test_csv_round_trip(tmp_path):
+    path = str(tmp_path / "data.csv")
+    rows = [[1, "x"], [2, "y"]]
+    assert write_csv(rows, path, header=["id", "name"]) == 2
+    assert list(read_csv(path)) == [
+        {"id": "1", "name": "x"},
+        {"id": "2", "name": "y"},
+    ]
+    assert list(read_csv(path, header=False))[1:] == [["1", "x"], ["2", "y"]]
+
+
+def test_jsonl_pipeline(tmp_path):
+    source = str(tmp_path / "in.jsonl")
+    target = str(tmp_path / "out.jsonl")
+    write_jsonl([{"v": 1}, {"v": 2}], source)
+    with open(source, "a") as file:
+        file.write("\n")
+    stream = process_pipeline(
+        read_jsonl(source), map_stream(lambda obj: {"v": obj["v"] * 10})
+    )
+    assert write_jsonl(stream, target) == 2
+    assert list(read_jsonl(target)) == [{"v": 10}, {"v": 20}]
+
+
+def test_records_are_views(tmp_path):
+    path = str(tmp_path / "data.bin")
+    assert write_records([b"abcd", b"efgh", bytearray(b"ij")], path) == 3
+
+    records = list(read_records(path, 4))
+    assert all(isinstance(record, memoryview) for record in records)
+    assert [bytes(record) for record in records] == [b"abcd", b"efgh"]
+
+    batches = [bytes(batch) for batch in read_records(path, 2, batch_size=2)]
+    assert batches == [b"abcd", b"efgh", b"ij"]
+
+
+def test_records_empty_and_invalid(tmp_path):
+    path = str(tmp_path / "empty.bin")
+    write_records([], path)
+    assert list(read_records(path, 4)) == []
+    with pytest.raises(ValueError):
+        list(read_records(path, 0))
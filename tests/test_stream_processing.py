@@ -108,3 +108,66 @@ def test_lazy_evaluation_infinite():
 
     result = to_list(result_stream)
     assert result == [1, 2, 3]
+
+
+def tracked_source(data, log):
+    try:
+        for item in data:
+            log.append(item)
+            yield item
+    finally:
+        log.append("closed")
+
+
+def test_take_closes_upstream():
+    log = []
+    stream = tracked_source([1, 2, 3, 4, 5], log)
+    result = to_list(process_pipeline(stream, map_stream(lambda x: x), take_items(2)))
+    assert result == [1, 2]
+    assert log == [1, 2, "closed"]
+
+
+def test_closing_pipeline_closes_source():
+    log = []
+    pipeline = process_pipeline(tracked_source([1, 2, 3], log), map_stream(str))
+    assert next(pipeline) == "1"
+    pipeline.close()
+    assert log == [1, "closed"]
+
+
+def test_skip_operation():
+    stream = generate_data([1, 2, 3, 4, 5])
+    assert to_list(skip_items(2)(stream)) == [3, 4, 5]
+
+
+def test_negative_counts():
+    with pytest.raises(ValueError, match="negative"):
+        take_items(-1)
+    with pytest.raises(ValueError, match="negative"):
+        skip_items(-1)
+
+
+def test_take_while_and_drop_while():
+    log = []
+    result = to_list(take_while(lambda x: x < 3)(tracked_source([1, 2, 3, 4], log)))
+    assert result == [1, 2]
+    assert log == [1, 2, 3, "closed"]
+
+    stream = generate_data([1, 2, 3, 1])
+    assert to_list(drop_while(lambda x: x < 3)(stream)) == [3, 1]
+
+
+def test_terminal_operators_short_circuit():
+    log = []
+    assert first_item(tracked_source([7, 8, 9], log)) == 7
+    assert log == [7, "closed"]
+    assert first_item(generate_data([]), default=0) == 0
+
+    log = []
+    assert any_item(tracked_source([1, 2, 3, 4], log), lambda x: x == 2)
+    assert log == [1, 2, "closed"]
+
+    log = []
+    assert not all_items(tracked_source([1, 2, 3, 4], log), lambda x: x < 2)
+    assert log == [1, 2, "closed"]
+    assert all_items(generate_data([1, 2, 3]), lambda x: x > 0)
@@ -0,0 +1,77 @@
+import pytest
+from project.stream_processing import *
+from project.stream_profiling import PipelineProfiler
+
+
+def test_profiler_counts_items():
+    profiler = PipelineProfiler()
+    result = to_list(
+        process_pipeline(
+            generate_data(range(10)),
+            filter_stream(lambda x: x % 2 == 0),
+            map_stream(lambda x: x * 10),
+            reduce_stream(lambda x, y: x + y),
+            profiler=profiler,
+        )
+    )
+    assert result == [200]
+
+    report = profiler.report()
+    filter_stats, map_stats, reduce_stats = report.stages
+    assert (filter_stats.items_in, filter_stats.items_out) == (10, 5)
+    assert filter_stats.selectivity == 0.5
+    assert (map_stats.items_in, map_stats.items_out) == (5, 5)
+    assert map_stats.peak_buffered == 1
+    assert (reduce_stats.items_in, reduce_stats.items_out) == (5, 1)
+    assert reduce_stats.peak_buffered == 5
+    assert filter_stats.name == "0:filter_stream"
+    assert report.bottleneck() in report.stages
+    assert "map_stream" in str(report)
+
+
+def test_profiler_self_time_excludes_upstream():
+    ticks = iter(range(1000))
+    profiler = PipelineProfiler(clock=lambda: float(next(ticks)))
+    to_list(
+        process_pipeline(
+            generate_data([1, 2, 3]),
+            map_stream(lambda x: x),
+            map_stream(lambda x: x),
+            profiler=profiler,
+        )
+    )
+    # Every clock call advances one tick. Each of the 4 pulls (3 items and
+    # the end of the stream) takes 3 ticks of the inner stage, 1 of them
+    # upstream, and 7 of the outer stage, 5 of them in the inner stage.
+    inner, outer = profiler.report().stages
+    assert (inner.total_time, inner.upstream_time, inner.self_time) == (12, 4, 8)
+    assert (outer.total_time, outer.upstream_time, outer.self_time) == (28, 20, 8)
+    assert inner.time_per_item == outer.time_per_item == 8 / 3
+    assert profiler.report().total_time == 16
+
+
+def test_profiler_sampling_hook():
+    samples = []
+    profiler = PipelineProfiler(
+        sample_every=2, sampler=lambda stats: samples.append(stats.items_out)
+    )
+    to_list(
+        process_pipeline(
+            generate_data(range(5)), map_stream(lambda x: x), profiler=profiler
+        )
+    )
+    assert samples == [2, 4]
+
+
+def test_profiler_with_early_termination():
+    profiler = PipelineProfiler()
+    result = to_list(
+        process_pipeline(
+            generate_data(range(100)),
+            map_stream(lambda x: x + 1),
+            take_items(3),
+            profiler=profiler,
+        )
+    )
+    assert result == [1, 2, 3]
+    assert profiler.report().stages[0].items_in == 3
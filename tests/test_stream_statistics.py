@@ -0,0 +1,117 @@
+import random
+import pytest
+from project.dense import Matrix
+from project.stream_processing import (
+    accumulate_stream,
+    generate_data,
+    map_stream,
+    process_pipeline,
+    reduce_stream,
+    to_list,
+)
+from project.stream_statistics import (
+    NormHistogram,
+    RunningCovariance,
+    RunningExtrema,
+    RunningMoments,
+)
+
+
+@pytest.fixture
+def vectors():
+    rng = random.Random(11)
+    return [[rng.gauss(5.0, 2.0) for _ in range(3)] for _ in range(101)]
+
+
+def two_pass(vectors):
+    count = len(vectors)
+    mean = [sum(column) / count for column in zip(*vectors)]
+    centered = [[v - m for v, m in zip(vec, mean)] for vec in vectors]
+    covariance = [
+        [sum(row[i] * row[j] for row in centered) / count for j in range(3)]
+        for i in range(3)
+    ]
+    return mean, covariance
+
+
+def assert_close(actual, expected):
+    assert actual == pytest.approx(expected, rel=1e-9, abs=1e-12)
+
+
+def test_moments_and_covariance(vectors) -> None:
+    mean, covariance = two_pass(vectors)
+    moments = RunningMoments().update_many(vectors)
+    assert_close(moments.mean, mean)
+    assert_close(moments.variance(), [covariance[i][i] for i in range(3)])
+    assert_close(
+        moments.variance(ddof=1),
+        [covariance[i][i] * 101 / 100 for i in range(3)],
+    )
+    running = RunningCovariance().update_many(Matrix(vectors))
+    assert_close(running.mean, mean)
+    for row, expected in zip(running.covariance(), covariance):
+        assert_close(row, expected)
+
+
+def test_merge_equals_single_pass(vectors) -> None:
+    """Partial results from separate chunks combine to the full statistics"""
+    chunks = [vectors[:10], vectors[10:60], [], vectors[60:]]
+    for kind in (RunningMoments, RunningCovariance, RunningExtrema):
+        full = kind().update_many(vectors)
+        merged = kind()
+        for chunk in chunks:
+            merged.merge(kind().update_many(chunk))
+        assert merged.count == full.count == len(vectors)
+        if kind is RunningExtrema:
+            assert merged.minimum == full.minimum
+            assert merged.maximum == full.maximum
+        elif kind is RunningMoments:
+            assert_close(merged.mean, full.mean)
+            assert_close(merged.variance(), full.variance())
+        else:
+            for row, expected in zip(merged.covariance(), full.covariance()):
+                assert_close(row, expected)
+
+
+def test_extrema_and_histogram() -> None:
+    vectors = [[3.0, 4.0], [0.0, 1.0], [-6.0, 8.0], [0.0, 0.5]]
+    extrema = RunningExtrema().update_many(vectors)
+    assert extrema.minimum == [-6.0, 0.5] and extrema.maximum == [3.0, 8.0]
+
+    histogram = NormHistogram([1.0, 5.0])
+    histogram.update_many(vectors[:2])
+    other = NormHistogram([1.0, 5.0]).update_many(vectors[2:])
+    assert histogram.merge(other).counts == [1, 1, 2]
+    with pytest.raises(ValueError):
+        histogram.merge(NormHistogram([2.0]).update_many(vectors))
+    with pytest.raises(ValueError):
+        NormHistogram([2.0, 1.0])
+
+
+def test_invalid_input() -> None:
+    moments = RunningMoments()
+    moments.update([1.0, 2.0])
+    with pytest.raises(ValueError):
+        moments.update([1.0])
+    with pytest.raises(ValueError):
+        moments.variance(ddof=1)
+    with pytest.raises(TypeError):
+        moments.merge(RunningExtrema())
+    with pytest.raises(ValueError):
+        moments.merge(RunningMoments().update_many([[1.0, 2.0, 3.0]]))
+
+
+def test_accumulate_stream(vectors) -> None:
+    moments, extrema = to_list(
+        process_pipeline(
+            generate_data(vectors),
+            map_stream(lambda vec: [2.0 * value for value in vec]),
+            accumulate_stream(RunningMoments(), RunningExtrema()),
+        )
+    )[0]
+    assert moments.count == extrema.count == len(vectors)
+    assert_close(moments.mean, [2.0 * m for m in two_pass(vectors)[0]])
+
+    partials = [RunningMoments().update_many(vectors[i::4]) for i in range(4)]
+    (merged,) = to_list(reduce_stream(lambda a, b: a.merge(b))(generate_data(partials)))
+    assert_close(merged.mean, two_pass(vectors)[0])
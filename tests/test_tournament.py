@@ -0,0 +1,78 @@
+from typing import List, Optional
+
+import pytest
+from project.Yatzy.player import ConservativeBot, Player, RiskyBot
+from project.Yatzy.scoring import Category
+from project.Yatzy.tournament import (
+    CONFIDENCE_Z,
+    batch_seed,
+    corrected_z,
+    run_tournament,
+)
+
+
+class FirstCategoryBot(Player):
+    """Rerolls everything and scores in the first free category."""
+
+    def choose_dice_to_keep(self, dice_values: List[int], roll_count: int):
+        return [False] * 5
+
+    def choose_category(
+        self, dice_values: List[int], available_categories: List[Category]
+    ) -> Optional[Category]:
+        return available_categories[0]
+
+
+class TestTournament:
+    def test_batch_seed(self):
+        assert batch_seed(1, 2) == batch_seed(1, 2)
+        assert batch_seed(1, 2) != batch_seed(1, 3)
+        assert batch_seed(1, 2) != batch_seed(2, 2)
+
+    def test_result(self):
+        players = [ConservativeBot("Safe"), RiskyBot("Risky")]
+        result = run_tournament(
+            players, 60, workers=1, batch_games=20, early_stop=False
+        )
+
+        assert result.games == 60
+        assert not result.stopped_early
+        assert result.stats.players[0].wins + result.stats.players[1].wins == 60
+        assert sum(result.distribution(0).values()) == pytest.approx(1.0)
+        low, high = result.win_interval(0)
+        assert 0.0 <= low < result.stats.players[0].win_rate < high <= 1.0
+        low, high = result.score_interval(1)
+        assert low < result.stats.players[1].mean < high
+        assert set(result.summary()["Safe"]) >= {"win_rate", "win_interval"}
+
+    def test_workers_give_same_result(self):
+        players = [ConservativeBot("Safe"), RiskyBot("Risky")]
+        serial = run_tournament(players, 40, workers=1, batch_games=10, seed=3)
+        parallel = run_tournament(players, 40, workers=2, batch_games=10, seed=3)
+
+        assert parallel.summary() == serial.summary()
+
+    def test_early_stop(self):
+        players = [ConservativeBot("Safe"), FirstCategoryBot("Naive")]
+        result = run_tournament(players, 10_000, workers=1, batch_games=10)
+
+        assert result.stopped_early
+        assert result.separated(corrected_z(CONFIDENCE_Z, 1000))
+        assert result.games < 10_000
+        assert result.stats.players[0].win_rate > 0.9
+
+    def test_corrected_z(self):
+        assert corrected_z(CONFIDENCE_Z, 1) == pytest.approx(CONFIDENCE_Z)
+        # 0.05 / 10 two-sided
+        assert corrected_z(CONFIDENCE_Z, 10) == pytest.approx(2.807, abs=1e-3)
+        assert corrected_z(CONFIDENCE_Z, 100) > corrected_z(CONFIDENCE_Z, 10)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            run_tournament([], 10, workers=1)
+        with pytest.raises(ValueError):
+            run_tournament([RiskyBot("Risky")], 10, workers=1, batch_games=0)
+        with pytest.raises(ValueError):
+            run_tournament([RiskyBot("Risky")], 10, workers=0)
+        with pytest.raises(ValueError):
+            run_tournament([RiskyBot("Risky")], -1, workers=1)
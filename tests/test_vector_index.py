@@ -0,0 +1,70 @@
+import random
+import pytest
+from project.dense import Matrix, Vector
+from project.vector_index import EXACT, LSH, VectorIndex
+from project.vectors import cosine_similarities
+
+
+@pytest.fixture
+def vectors():
+    rng = random.Random(7)
+    return [[rng.gauss(0.0, 1.0) for _ in range(8)] for _ in range(200)]
+
+
+def brute_force(query, vectors, k):
+    cosines = cosine_similarities([query], vectors)[0]
+    return sorted(range(len(vectors)), key=lambda j: -cosines[j])[:k]
+
+
+def test_exact_search(vectors) -> None:
+    index = VectorIndex(8)
+    ids = index.add_many(vectors)
+    assert ids == list(range(len(vectors)))
+    query = vectors[3]
+    result = index.search(query, 5)
+    assert [vector_id for vector_id, _ in result] == brute_force(query, vectors, 5)
+    assert result[0] == (3, pytest.approx(1.0))
+    assert index.search_batch([query, vectors[4]], 5, use_numpy=False)[0] == [
+        (vector_id, pytest.approx(cosine)) for vector_id, cosine in result
+    ]
+
+
+def test_add_and_remove(vectors) -> None:
+    for mode in (EXACT, LSH):
+        index = VectorIndex(8, mode=mode, seed=1)
+        index.add_many(Matrix(vectors[:10]))
+        new_id = index.add(Vector(vectors[10]))
+        assert new_id == 10 and len(index) == 11
+        index.remove(3)
+        assert 3 not in index and len(index) == 10
+        assert all(vector_id != 3 for vector_id, _ in index.search(vectors[3], 10))
+        assert index.search_batch([vectors[10]], 1)[0][0][0] == 10
+        with pytest.raises(KeyError):
+            index.remove(3)
+
+
+def test_lsh_recall(vectors) -> None:
+    """Near duplicates are found, and more probes never lower recall"""
+    rng = random.Random(3)
+    queries = [
+        [value + rng.gauss(0.0, 0.05) for value in vectors[i]] for i in range(20)
+    ]
+    recalls = []
+    for probes in (0, 2):
+        index = VectorIndex(8, mode=LSH, tables=4, bits=6, probes=probes, seed=5)
+        index.add_many(vectors)
+        found = [index.search(query, 1) for query in queries]
+        recalls.append(sum(bool(r) and r[0][0] == i for i, r in enumerate(found)))
+    assert recalls[0] >= 15
+    assert recalls[1] >= recalls[0]
+
+
+def test_invalid_input() -> None:
+    index = VectorIndex(2)
+    with pytest.raises(ValueError):
+        index.add([1.0, 2.0, 3.0])
+    with pytest.raises(ValueError):
+        index.search([0.0, 0.0], 1)
+    with pytest.raises(ValueError):
+        VectorIndex(2, mode="tree")
+    assert index.search_batch([[1.0, 0.0]], 3) == [[]]
@@ -1,6 +1,20 @@
 import math
 import pytest
-from project.vectors import dot_product, vector_length, vector_angle
+from project.dense import Matrix, Vector
+from project.vectors import (
+    NormCache,
+    axpy,
+    cosine_similarities,
+    cosine_similarity,
+    dot_product,
+    dot_products,
+    top_k_similar,
+    vector_angle,
+    vector_angles,
+    vector_length,
+    vector_add,
+    vector_lengths,
+)
 
 
 def test_dot_product() -> None:
@@ -19,6 +33,15 @@ def test_dot_product_different_length() -> None:
         dot_product(vec1, vec2)
 
 
+def test_unchecked_fast_path() -> None:
+    """Without the length check, map() stops at the shorter vector"""
+    assert dot_product([1.0, 2.0], [3.0, 4.0], check=False) == 11.0
+    assert dot_product([1.0, 2.0], [3.0, 4.0, 5.0], check=False) == 11.0
+    assert vector_angle([1.0, 0.0], [0.0, 1.0], check=False) == pytest.approx(
+        math.pi / 2
+    )
+
+
 def test_vector_length() -> None:
     """Test vector length calculation"""
     assert vector_length([3.0, 4.0]) == 5.0
@@ -37,3 +60,116 @@ def test_vector_angle_zero() -> None:
     vec2 = [0.0, 0.0]
     with pytest.raises(ValueError):
         vector_angle(vec1, vec2)
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def use_numpy(request) -> bool:
+    if request.param:
+        pytest.importorskip("numpy")
+    return request.param
+
+
+def test_dot_products(use_numpy: bool) -> None:
+    """Test all-pairs dot products"""
+    vectors1 = [[1.0, 0.0], [1.0, 2.0]]
+    vectors2 = [[3.0, 4.0], [0.0, 1.0], [1.0, 1.0]]
+    assert dot_products(vectors1, vectors2, use_numpy) == [
+        [3.0, 0.0, 1.0],
+        [11.0, 2.0, 3.0],
+    ]
+    with pytest.raises(ValueError):
+        dot_products(vectors1, [[1.0, 2.0, 3.0]], use_numpy)
+
+
+def test_vector_lengths(use_numpy: bool) -> None:
+    """Test row-wise norms, also for Matrix rows"""
+    assert vector_lengths([[3.0, 4.0], [0.0, 2.0]], use_numpy) == [5.0, 2.0]
+    assert vector_lengths(Matrix([[6.0, 8.0]]), use_numpy) == [10.0]
+    with pytest.raises(ValueError):
+        vector_lengths([[1.0], [1.0, 2.0]], use_numpy)
+
+
+def test_cosines_and_angles(use_numpy: bool) -> None:
+    """Test pairwise cosine and angle matrices"""
+    vectors = [[1.0, 0.0], [0.0, 2.0], [1.0, 1.0]]
+    cosines = cosine_similarities(vectors, vectors, use_numpy)
+    angles = vector_angles(vectors, vectors, use_numpy)
+    for i, vec1 in enumerate(vectors):
+        for j, vec2 in enumerate(vectors):
+            assert angles[i][j] == pytest.approx(vector_angle(vec1, vec2), abs=1e-7)
+            assert cosines[i][j] == pytest.approx(math.cos(angles[i][j]))
+    with pytest.raises(ValueError):
+        cosine_similarities(vectors, [[0.0, 0.0]], use_numpy)
+
+
+def test_top_k_similar(use_numpy: bool) -> None:
+    """Test nearest vectors by cosine"""
+    corpus = [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0], [-1.0, 0.0]]
+    queries = [[2.0, 0.1], [0.0, -1.0]]
+    result = top_k_similar(queries, corpus, 2, use_numpy)
+    assert [[index for index, _ in row] for row in result] == [[0, 2], [0, 3]]
+    assert result[0][0][1] == pytest.approx(2.0 / math.hypot(2.0, 0.1))
+    assert len(top_k_similar(queries, corpus, 10, use_numpy)[0]) == 4
+    assert top_k_similar(queries, corpus, 0, use_numpy) == [[], []]
+
+
+def test_top_k_similar_ties(use_numpy: bool) -> None:
+    """Equal cosines are ranked by corpus index"""
+    corpus = [[1.0, 0.0]] * 40 + [[0.0, 1.0]] + [[2.0, 0.0]] * 40
+    result = top_k_similar([[1.0, 0.0]], corpus, 50, use_numpy)
+    assert [index for index, _ in result[0]] == list(range(40)) + list(range(41, 51))
+
+
+def test_vector_add_and_axpy() -> None:
+    """Test out= and in-place variants"""
+    vec1, vec2 = [1.0, 2.0], [3.0, 4.0]
+    assert vector_add(vec1, vec2) == [4.0, 6.0]
+    assert vector_add(Vector(vec1), vec2) == Vector([4.0, 6.0])
+    out = [0.0, 0.0]
+    assert vector_add(vec1, vec2, out=out) is out and out == [4.0, 6.0]
+    assert axpy(2.0, vec1, vec2) is vec2 and vec2 == [5.0, 8.0]
+    dense = Matrix([[1.0, 2.0], [3.0, 4.0]])
+    assert axpy(-1.0, [1.0, 1.0], dense.column(1)) == Vector([1.0, 3.0])
+    assert dense == [[1.0, 1.0], [3.0, 3.0]]
+    with pytest.raises(ValueError):
+        vector_add(vec1, vec2, out=[0.0])
+
+
+def test_batch_out(use_numpy: bool) -> None:
+    out = [[0.0], [0.0]]
+    rows = list(out)
+    result = dot_products([[1.0, 2.0], [3.0, 4.0]], [[1.0, 1.0]], use_numpy, out=out)
+    assert result is out and out == [[3.0], [7.0]]
+    assert all(a is b for a, b in zip(out, rows))
+    lengths = Vector.zeros(2)
+    assert vector_lengths([[3.0, 4.0], [0.0, 2.0]], use_numpy, out=lengths) is lengths
+    assert lengths == [5.0, 2.0]
+    with pytest.raises(ValueError):
+        dot_products([[1.0, 2.0]], [[1.0, 1.0]], use_numpy, out=out)
+
+
+def test_vector_angle_nearly_parallel() -> None:
+    """Rounding can push the cosine above 1; it is clamped instead of raising"""
+    vec = [0.7837985890347726, 0.30331272607892745, 0.4765969541523558]
+    assert vector_angle(vec, vec) == 0.0
+    assert vector_angle(vec, [-value for value in vec]) == pytest.approx(math.pi)
+    assert cosine_similarity(vec, vec) == 1.0
+
+
+def test_norm_cache() -> None:
+    norms = NormCache(maxsize=2)
+    query = [1.0, 0.0]
+    corpus = [[0.0, 2.0], [3.0, 3.0]]
+    for vec in corpus:
+        vector_angle(query, vec, norms=norms)
+    assert vector_angle(query, corpus[1], norms=norms) == pytest.approx(math.pi / 4)
+    assert norms.misses == 3 and norms.hits == 3
+    assert len(norms) == 2  # the least recently used vector was dropped
+
+    corpus[1][0] = 0.0
+    norms.discard(corpus[1])
+    assert cosine_similarity(query, corpus[1], norms=norms) == 0.0
+    norms.clear()
+    assert len(norms) == 0
+    with pytest.raises(ValueError):
+        vector_angle(query, [0.0, 0.0], norms=norms)